@@ -1,8 +1,8 @@
 """
 Chat API endpoints for AI Doctor consultation
 """
-from fastapi import APIRouter, HTTPException
-from typing import List, Dict, Any
+from fastapi import APIRouter, HTTPException, Request
+from typing import List, Dict, Any, Optional
 from pydantic import BaseModel
 import sys
 from pathlib import Path
@@ -11,6 +11,9 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
 
 from app.services.model_service import ModelService
+from app.services.generation_budget import run_with_budget
+from app.services.admission import Priority, get_admission
+from app.services.rate_limit import get_rate_limiter
 
 router = APIRouter()
 
@@ -23,15 +26,17 @@ class ChatMessage(BaseModel):
 class ChatRequest(BaseModel):
     message: str
     history: List[ChatMessage] = []
+    viewer: Optional[str] = None  # family member asking (rate limiting and fair scheduling)
 
 
 class ChatResponse(BaseModel):
     response: str
     timestamp: str
+    truncated: bool = False
 
 
 @router.post("/chat/consult", response_model=ChatResponse)
-async def chat_consult(request: ChatRequest):
+async def chat_consult(request: ChatRequest, http_request: Request):
     """
     AI Doctor consultation endpoint
 
@@ -39,21 +44,21 @@ async def chat_consult(request: ChatRequest):
 
     Args:
         request: Chat request with message and conversation history
+        http_request: The HTTP request (a client disconnect stops generation)
 
     Returns:
         AI-generated medical consultation response
     """
     from datetime import datetime
 
+    # Per-viewer token bucket (429 with Retry-After)
+    get_rate_limiter("chat").check(request.viewer)
+
     try:
         model_service = ModelService.get_instance()
 
-        # Check if models are loaded
-        if not model_service.is_loaded():
-            raise HTTPException(
-                status_code=503,
-                detail="AI models are not loaded. Please try again later."
-            )
+        # 503 with Retry-After while models are still loading
+        model_service.require_ready()
 
         # Build conversation context
         system_prompt = """You are a Home Health Information Assistant (not a doctor).
@@ -105,7 +110,13 @@ IMPORTANT: Always respond in English unless the user explicitly uses another lan
         })
 
         # Generate response using the model
-        response = model_service._generate_response(conversation)
+        # Interactive lane: admitted ahead of background report ingestion,
+        # taking turns with other family members
+        async with get_admission().slot("chat", Priority.INTERACTIVE, owner=request.viewer):
+            budget = model_service.budget("chat")
+            response = await run_with_budget(
+                budget, model_service._generate_response, conversation, budget, request=http_request
+            )
 
         if not response:
             raise HTTPException(
@@ -115,7 +126,8 @@ IMPORTANT: Always respond in English unless the user explicitly uses another lan
 
         return ChatResponse(
             response=response,
-            timestamp=datetime.utcnow().isoformat()
+            timestamp=datetime.utcnow().isoformat(),
+            truncated=budget.truncated
         )
 
     except HTTPException:
@@ -139,10 +151,11 @@ async def chat_status():
         Status of the AI chat service
     """
     model_service = ModelService.get_instance()
+    ready = model_service.state == "ready"
 
     return {
         "service": "ai-doctor-chat",
-        "status": "available" if model_service.is_loaded() else "unavailable",
-        "models_loaded": model_service.is_loaded(),
+        "status": "available" if ready else "unavailable",
+        "models_loaded": ready,
         "endpoint": "/api/v1/chat/consult"
     }
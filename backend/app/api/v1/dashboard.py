@@ -0,0 +1,37 @@
+"""
+Dashboard API endpoints
+"""
+import sys
+from pathlib import Path
+
+from fastapi import APIRouter, Query
+from fastapi.concurrency import run_in_threadpool
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
+
+from utils.db import dashboard_summary
+from app.models.schemas import DashboardSummary
+
+router = APIRouter()
+
+
+@router.get("/dashboard/summary", response_model=DashboardSummary)
+async def get_dashboard_summary(
+    viewer: str = Query(..., description="Viewer (for permission checking)")
+):
+    """
+    Report counts per urgency, visibility and status, per family member
+    with their newest report, and the processing backlog
+
+    Read from counters the database keeps up to date on every report
+    insert, update and delete, so the cost does not grow with the history
+    and the client no longer aggregates the full report list.
+
+    Args:
+        viewer: The user viewing the dashboard (same visibility rules as the report list)
+
+    Returns:
+        Dashboard summary
+    """
+    return await run_in_threadpool(dashboard_summary, viewer)
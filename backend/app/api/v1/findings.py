@@ -0,0 +1,93 @@
+"""
+Findings API endpoints
+Longitudinal queries over the normalized entities and critical flags of
+report extractions (report_entities / report_flags), answered from
+indexes instead of scanning and decoding every stored extraction.
+"""
+import sys
+from pathlib import Path
+from typing import List, Optional
+
+from fastapi import APIRouter, Query
+from fastapi.concurrency import run_in_threadpool
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
+
+from utils.db import find_findings
+from app.models.schemas import FindingKind, FindingOccurrence, FindingTimelineResponse
+
+router = APIRouter()
+
+
+@router.get("/findings", response_model=List[FindingOccurrence])
+async def list_findings(
+    viewer: str = Query(..., description="Viewer (for permission checking)"),
+    term: str = Query(..., min_length=1, description="Entity or flag name, e.g. 'pneumothorax'"),
+    kind: FindingKind = Query(FindingKind.ENTITY),
+    status: Optional[str] = Query(None, description="Certainty (entities) or status (flags), e.g. 'suspected'"),
+    anatomy: Optional[str] = Query(None, description="Anatomy (entities only)"),
+    owner: Optional[str] = Query(None, description="Only this family member's reports"),
+    prefix: bool = Query(False, description="Match names starting with the term"),
+    limit: int = Query(50, ge=1, le=500),
+    offset: int = Query(0, ge=0)
+):
+    """
+    Reports containing an entity or critical flag, newest first
+
+    E.g. every report where pneumothorax was suspected:
+    /findings?viewer=admin&kind=flag&term=pneumothorax&status=suspected
+
+    Args:
+        viewer: The user querying (same visibility rules as the report list)
+        term: Entity or flag name (case and spacing are normalized)
+        kind: "entity" or "flag"
+        status: Certainty / status filter
+        anatomy: Anatomy filter
+        owner: Family member filter
+        prefix: Prefix match on the name
+        limit: Page size
+        offset: Number of occurrences to skip
+
+    Returns:
+        Matching occurrences with their report's urgency
+    """
+    return await run_in_threadpool(
+        find_findings, viewer, kind.value, term, status=status, anatomy=anatomy,
+        owner=owner, prefix=prefix, limit=limit, offset=offset
+    )
+
+
+@router.get("/timeline/{owner}", response_model=FindingTimelineResponse)
+async def finding_timeline(
+    owner: str,
+    viewer: str = Query(..., description="Viewer (for permission checking)"),
+    term: str = Query(..., min_length=1, description="Finding to follow, e.g. 'nodule'"),
+    prefix: bool = Query(False, description="Match names starting with the term"),
+    limit: int = Query(200, ge=1, le=1000)
+):
+    """
+    One family member's history of a finding, oldest first
+
+    Entity and critical-flag occurrences are merged, so e.g. a nodule's
+    size/certainty over successive scans reads top to bottom.
+
+    Args:
+        owner: Family member whose reports to follow
+        viewer: The user querying (other members only see shared reports)
+        term: Entity or flag name
+        prefix: Prefix match on the name
+        limit: Maximum occurrences of each kind
+
+    Returns:
+        Chronological occurrences
+    """
+    def load():
+        occurrences = []
+        for kind in (FindingKind.ENTITY, FindingKind.FLAG):
+            occurrences += find_findings(viewer, kind.value, term, owner=owner, prefix=prefix,
+                                         limit=limit, newest_first=False)
+        occurrences.sort(key=lambda o: (o["created_at"], o["report_id"]))
+        return occurrences
+
+    return {"owner": owner, "term": term, "occurrences": await run_in_threadpool(load)}
@@ -1,11 +1,28 @@
 """
 Health check and monitoring endpoints
+
+/health/live only says the process is up; /health/ready says it can serve
+AI requests (models loaded, database reachable). Probes and start scripts
+should wait on the latter.
 """
+import sys
+import time
+from pathlib import Path
+
 from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
+
+from utils.db import check_db_health
+from app.core import startup_profile
 from app.services.model_service import ModelService
 
 router = APIRouter()
 
+_started = time.time()
+
 
 @router.get("/health")
 async def health_check():
@@ -16,13 +33,10 @@ async def health_check():
         Health status with actual model and database loading status
     """
     model_service = ModelService.get_instance()
-    models_loaded = model_service.is_loaded()
+    # "warming" models are loaded but not yet serving
+    models_loaded = model_service.state == "ready"
 
     # Check database health
-    import sys
-    from pathlib import Path
-    sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
-    from utils.db import check_db_health
     db_health = check_db_health()
 
     # Overall status: healthy only if both models and DB are healthy
@@ -31,6 +45,7 @@ async def health_check():
     return {
         "status": overall_status,
         "models_loaded": models_loaded,
+        "models_state": model_service.state,
         "database": {
             "status": db_health.get("status", "unknown"),
             "report_count": db_health.get("report_count", 0),
@@ -41,6 +56,50 @@ async def health_check():
     }
 
 
+@router.get("/health/live")
+async def liveness():
+    """
+    Liveness probe: the process is up and serving requests
+
+    Returns:
+        Always 200 with the uptime; does not touch models or the database
+    """
+    return {"status": "alive", "uptime_s": round(time.time() - _started, 1)}
+
+
+@router.get("/health/ready")
+async def readiness():
+    """
+    Readiness probe: models loaded and database healthy
+
+    Returns:
+        200 when ready, 503 while models are loading or if either failed
+    """
+    model_status = ModelService.get_instance().status()
+    db_health = check_db_health()
+    ready = model_status["ready"] and db_health.get("status") == "healthy"
+    return JSONResponse(
+        status_code=200 if ready else 503,
+        content={
+            "status": "ready" if ready else "not_ready",
+            "models": model_status,
+            "database": db_health.get("status", "unknown"),
+        },
+    )
+
+
+@router.get("/health/startup")
+async def startup_health():
+    """
+    Startup phase timings
+
+    Returns:
+        Seconds from app import to each finished phase (app_imported,
+        database_ready, serving, models_ready)
+    """
+    return {"phases": startup_profile.phases()}
+
+
 @router.get("/health/models")
 async def model_health():
     """
@@ -52,13 +111,61 @@ async def model_health():
     model_service = ModelService.get_instance()
 
     return {
-        "status": "ready" if model_service.is_loaded() else "loading",
+        "status": model_service.state,
         "model_id": model_service.model_id,
         "extractor_loaded": model_service._extractor is not None,
-        "synthesizer_loaded": model_service._synthesizer is not None
+        "synthesizer_loaded": model_service._synthesizer is not None,
+        **model_service.status(),
     }
 
 
+@router.get("/health/admission")
+async def admission_health():
+    """
+    Admission control counters
+
+    Returns:
+        In-flight and queued requests, admissions, rejections and average
+        service / queue-wait times per route
+    """
+    from app.services.admission import get_admission
+
+    return get_admission().stats()
+
+
+@router.get("/health/scheduler")
+async def scheduler_health():
+    """
+    Fair-share scheduling metrics per family member
+
+    Returns:
+        Queue depth, admissions and queue waits per owner, plus the token
+        bucket counters of the report and chat rate limiters
+    """
+    from app.services.admission import get_admission
+    from app.services.rate_limit import get_rate_limiter
+
+    return {
+        "owners": get_admission().stats()["owners"],
+        "rate_limits": {
+            name: get_rate_limiter(name).stats() for name in ("report", "chat")
+        },
+    }
+
+
+@router.get("/health/reminders")
+async def reminder_health():
+    """
+    Reminder scheduler status
+
+    Returns:
+        Pending reminders in the heap, next due time and fired count
+    """
+    from app.services.reminder_scheduler import get_reminder_scheduler
+
+    return get_reminder_scheduler().stats()
+
+
 @router.get("/health/cache")
 async def cache_health():
     """
@@ -82,11 +189,6 @@ async def database_health():
     Returns:
         Database health status with actual checks
     """
-    import sys
-    from pathlib import Path
-    sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
-    from utils.db import check_db_health
-
     return check_db_health()
 
 
@@ -96,15 +198,23 @@ async def get_metrics():
     Get system metrics
 
     Returns:
-        System metrics
+        System metrics (GPU figures once the model stack has imported torch)
     """
-    import psutil
-    import torch
-
-    return {
-        "cpu_percent": psutil.cpu_percent(interval=1),
-        "memory_percent": psutil.virtual_memory().percent,
-        "gpu_available": torch.cuda.is_available(),
-        "gpu_count": torch.cuda.device_count() if torch.cuda.is_available() else 0,
-        "gpu_memory_used": torch.cuda.memory_allocated() if torch.cuda.is_available() else 0
-    }
+    metrics = {}
+    try:
+        import psutil
+        # interval=None compares with the previous call instead of blocking
+        metrics["cpu_percent"] = psutil.cpu_percent(interval=None)
+        metrics["memory_percent"] = psutil.virtual_memory().percent
+    except ImportError:
+        pass
+
+    # Importing torch here would cost seconds; only report it if it is loaded
+    torch = sys.modules.get("torch")
+    gpu_available = torch is not None and torch.cuda.is_available()
+    metrics.update({
+        "gpu_available": gpu_available,
+        "gpu_count": torch.cuda.device_count() if gpu_available else 0,
+        "gpu_memory_used": torch.cuda.memory_allocated() if gpu_available else 0
+    })
+    return metrics
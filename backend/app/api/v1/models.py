@@ -1,12 +1,13 @@
 """
 Model inference API endpoints
 """
+import asyncio
+import json
 import time
-from fastapi import APIRouter, UploadFile, File, Form
-from fastapi.responses import JSONResponse
-from PIL import Image
-from io import BytesIO
-import base64
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.concurrency import iterate_in_threadpool
+from fastapi.responses import JSONResponse, StreamingResponse
+from starlette.background import BackgroundTask
 from app.models.schemas import (
     ExtractRequest,
     ExtractResponse,
@@ -15,46 +16,70 @@ from app.models.schemas import (
     GenerateExplanationRequest,
     GenerateExplanationResponse,
     ImageAnalysisRequest,
-    ImageAnalysisResponse
+    ImageAnalysisResponse,
+    BatchImageMode,
+    BatchImageResult,
+    BatchImageAnalysisResponse
 )
-from app.services.model_service import ModelService
+from backend.app.services.triage import triage_risk
+from app.services.model_service import ModelService, ready_model_service
+from app.services.image_preprocess import get_image_preprocessor
+from app.services.uploads import parse_image_form
+from app.services.generation_budget import cancel_on_disconnect, run_with_budget
+from app.services.admission import Priority, get_admission
 
 router = APIRouter()
 
-# Get model service singleton
-model_service = ModelService.get_instance()
+MAX_IMAGE_BYTES = 10 * 1024 * 1024
+MAX_BATCH_IMAGES = 16
+MAX_BATCH_SIZE = 8
+
+# Routes that run a model take `model_service: ModelService = Depends(ready_model_service)`,
+# which answers 503 (with Retry-After) until the background load has finished
 
 
 @router.post("/extract", response_model=ExtractResponse)
-async def extract_structured_data(request: ExtractRequest):
+async def extract_structured_data(
+    request: ExtractRequest,
+    http_request: Request,
+    model_service: ModelService = Depends(ready_model_service)
+):
     """
     Extract structured information from medical report text
 
     Args:
         request: Extraction request with report text
+        http_request: The HTTP request (a client disconnect stops generation)
 
     Returns:
         Extracted structured data
     """
     start_time = time.time()
 
-    try:
-        extracted, raw_output = model_service.extract(request.report_text)
+    # Admission errors (429/503) propagate; model errors are reported in the body
+    async with get_admission().slot("extract", Priority.INTERACTIVE):
+        budget = model_service.budget("extract")
+        try:
+            extracted, raw_output = await run_with_budget(
+                budget, model_service.extract, request.report_text, budget, request=http_request
+            )
 
-        processing_time = (time.time() - start_time) * 1000  # Convert to ms
+            processing_time = (time.time() - start_time) * 1000  # Convert to ms
 
-        return ExtractResponse(
-            extracted=extracted,
-            raw_output=raw_output,
-            processing_time_ms=processing_time
-        )
+            return ExtractResponse(
+                extracted=extracted,
+                raw_output=raw_output,
+                processing_time_ms=processing_time,
+                decoding=model_service.decoding_metadata("extract"),
+                budget=budget.describe()
+            )
 
-    except Exception as e:
-        return ExtractResponse(
-            extracted=None,
-            raw_output=str(e),
-            processing_time_ms=(time.time() - start_time) * 1000
-        )
+        except Exception as e:
+            return ExtractResponse(
+                extracted=None,
+                raw_output=str(e),
+                processing_time_ms=(time.time() - start_time) * 1000
+            )
 
 
 @router.post("/triage", response_model=TriageResponse)
@@ -68,13 +93,6 @@ async def assess_urgency(request: TriageRequest):
     Returns:
         Urgency assessment
     """
-    import sys
-    from pathlib import Path
-
-    # Import triage function
-    sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
-    from backend.app.services.triage import triage_risk
-
     triage = triage_risk(request.extracted)
 
     return TriageResponse(
@@ -84,41 +102,69 @@ async def assess_urgency(request: TriageRequest):
 
 
 @router.post("/patient-view", response_model=GenerateExplanationResponse)
-async def generate_patient_view(request: GenerateExplanationRequest):
+async def generate_patient_view(
+    request: GenerateExplanationRequest,
+    http_request: Request,
+    model_service: ModelService = Depends(ready_model_service)
+):
     """
     Generate patient-friendly explanation
 
     Args:
         request: Generation request with extracted data and triage
+        http_request: The HTTP request (a client disconnect stops generation)
 
     Returns:
         Patient-friendly explanation
     """
-    explanation = model_service.patient_view(
-        request.extracted,
-        request.triage
-    )
+    async with get_admission().slot("synthesize", Priority.INTERACTIVE):
+        budget = model_service.budget("synthesize")
+        explanation = await run_with_budget(
+            budget, model_service.patient_view,
+            request.extracted,
+            request.triage,
+            budget,
+            request=http_request
+        )
 
-    return GenerateExplanationResponse(explanation=explanation)
+    return GenerateExplanationResponse(
+        explanation=explanation,
+        decoding=model_service.decoding_metadata("synthesize"),
+        budget=budget.describe()
+    )
 
 
 @router.post("/family-view", response_model=GenerateExplanationResponse)
-async def generate_family_view(request: GenerateExplanationRequest):
+async def generate_family_view(
+    request: GenerateExplanationRequest,
+    http_request: Request,
+    model_service: ModelService = Depends(ready_model_service)
+):
     """
     Generate family-focused explanation
 
     Args:
         request: Generation request with extracted data and triage
+        http_request: The HTTP request (a client disconnect stops generation)
 
     Returns:
         Family-focused explanation
     """
-    explanation = model_service.family_view(
-        request.extracted,
-        request.triage
-    )
+    async with get_admission().slot("synthesize", Priority.INTERACTIVE):
+        budget = model_service.budget("synthesize")
+        explanation = await run_with_budget(
+            budget, model_service.family_view,
+            request.extracted,
+            request.triage,
+            budget,
+            request=http_request
+        )
 
-    return GenerateExplanationResponse(explanation=explanation)
+    return GenerateExplanationResponse(
+        explanation=explanation,
+        decoding=model_service.decoding_metadata("synthesize"),
+        budget=budget.describe()
+    )
 
 
 @router.get("/status")
@@ -129,23 +175,61 @@ async def get_model_status():
     Returns:
         Model status information
     """
+    model_service = ModelService.get_instance()
+    state = model_service.status()["state"]
     return {
-        "models_loaded": model_service.is_loaded(),
+        "models_loaded": state == "ready",
         "model_id": model_service.model_id,
-        "status": "ready" if model_service.is_loaded() else "loading"
+        "status": "ready" if state == "ready" else "failed" if state == "failed" else "loading"
     }
 
 
-@router.post("/analyze-image", response_model=ImageAnalysisResponse)
-async def analyze_image(
-    image: UploadFile = File(..., description="Medical image file (JPEG, PNG, etc.)"),
-    prompt: str = Form(default="Describe this medical image in detail", description="Analysis prompt"),
-    max_new_tokens: int = Form(default=2000, ge=100, le=4000, description="Maximum tokens in response")
-):
+IMAGE_UPLOAD_OPENAPI = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "multipart/form-data": {
+                "schema": {
+                    "type": "object",
+                    "required": ["image"],
+                    "properties": {
+                        "image": {"type": "string", "format": "binary",
+                                  "description": "Medical image file (JPEG, PNG, etc.)"},
+                        "prompt": {"type": "string", "default": "Describe this medical image in detail",
+                                   "description": "Analysis prompt"},
+                        "max_new_tokens": {"type": "integer", "default": 2000, "minimum": 100,
+                                           "maximum": 4000, "description": "Maximum tokens in response"},
+                    },
+                }
+            }
+        },
+    }
+}
+
+
+def _form_max_new_tokens(fields: dict) -> int:
+    """Validate the max_new_tokens form field (100-4000)"""
+    raw = fields.get("max_new_tokens", "2000")
+    try:
+        value = int(raw)
+    except ValueError:
+        raise HTTPException(status_code=422, detail="max_new_tokens must be an integer")
+    if not 100 <= value <= 4000:
+        raise HTTPException(status_code=422, detail="max_new_tokens must be between 100 and 4000")
+    return value
+
+
+@router.post("/analyze-image", response_model=ImageAnalysisResponse, openapi_extra=IMAGE_UPLOAD_OPENAPI)
+async def analyze_image(request: Request, model_service: ModelService = Depends(ready_model_service)):
     """
     Analyze a medical image using MedGemma
 
-    Args:
+    The multipart body is parsed as it streams in: the 10MB limit and the
+    image header are checked while reading, so oversized or non-image
+    uploads are rejected without being buffered. The image is spooled and
+    decoded in place, never copied into a bytes object.
+
+    Form fields:
         image: Uploaded image file
         prompt: Text prompt for analysis (optional)
         max_new_tokens: Maximum tokens in response (optional)
@@ -155,39 +239,46 @@ async def analyze_image(
     """
     start_time = time.time()
 
-    try:
-        # Read and validate image file
-        contents = await image.read()
+    # Shed before reading the upload when the image route is saturated
+    admission = get_admission()
+    admission.check("image", Priority.INTERACTIVE)
 
-        # Validate file size (max 10MB)
-        if len(contents) > 10 * 1024 * 1024:
-            return JSONResponse(
-                status_code=413,
-                content={"detail": "Image file too large. Maximum size is 10MB."}
-            )
+    form = await parse_image_form(request, image_field="image", max_bytes=MAX_IMAGE_BYTES)
+    upload = form.images[0]
+    prompt = form.fields.get("prompt") or "Describe this medical image in detail"
+    max_new_tokens = _form_max_new_tokens(form.fields)
 
-        # Open image with PIL
+    try:
+        # Decode at reduced size, resize to the model input (cached by content hash)
         try:
-            pil_image = Image.open(BytesIO(contents))
-            # Convert to RGB if necessary
-            if pil_image.mode != "RGB":
-                pil_image = pil_image.convert("RGB")
-        except Exception as e:
+            pil_image = await get_image_preprocessor().preprocess_upload(upload.file.file, upload.digest)
+        except ValueError as e:
             return JSONResponse(
                 status_code=400,
-                content={"detail": f"Invalid image file: {str(e)}"}
+                content={"detail": str(e)}
+            )
+        finally:
+            await upload.file.close()
+
+        # Run image analysis off the event loop; a client disconnect cancels the budget
+        async with admission.slot("image", Priority.INTERACTIVE):
+            budget = model_service.budget("image", max_new_tokens)
+            analysis = await run_with_budget(
+                budget, model_service.analyze_image, pil_image, prompt, max_new_tokens, budget,
+                request=request
             )
-
-        # Run image analysis
-        analysis = model_service.analyze_image(pil_image, prompt)
 
         processing_time = (time.time() - start_time) * 1000  # Convert to ms
 
         return ImageAnalysisResponse(
             analysis=analysis,
-            processing_time_ms=processing_time
+            processing_time_ms=processing_time,
+            truncated=budget.truncated,
+            budget=budget.describe()
         )
 
+    except HTTPException:
+        raise
     except Exception as e:
         processing_time = (time.time() - start_time) * 1000
         return JSONResponse(
@@ -197,3 +288,165 @@ async def analyze_image(
                 "processing_time_ms": processing_time
             }
         )
+
+
+BATCH_UPLOAD_OPENAPI = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "multipart/form-data": {
+                "schema": {
+                    "type": "object",
+                    "required": ["images"],
+                    "properties": {
+                        "images": {"type": "array", "items": {"type": "string", "format": "binary"},
+                                   "maxItems": MAX_BATCH_IMAGES, "description": "Medical image files"},
+                        "mode": {"type": "string", "enum": [m.value for m in BatchImageMode],
+                                 "default": "independent",
+                                 "description": "independent: one result per image; study: one result for all"},
+                        "prompt": {"type": "string", "description": "Shared analysis prompt"},
+                        "prompts": {"type": "string",
+                                    "description": "JSON array with one prompt per image (independent mode)"},
+                        "batch_size": {"type": "integer", "default": 2, "minimum": 1, "maximum": MAX_BATCH_SIZE},
+                        "max_new_tokens": {"type": "integer", "default": 2000, "minimum": 100, "maximum": 4000},
+                        "stream": {"type": "boolean", "default": True,
+                                   "description": "Stream NDJSON results as they finish"},
+                    },
+                }
+            }
+        },
+    }
+}
+
+
+def _form_batch_prompts(fields: dict, count: int):
+    """Shared prompt, or the per-image prompts of the 'prompts' JSON array"""
+    if fields.get("prompts"):
+        try:
+            prompts = json.loads(fields["prompts"])
+        except json.JSONDecodeError:
+            raise HTTPException(status_code=422, detail="prompts must be a JSON array of strings")
+        if not isinstance(prompts, list) or len(prompts) != count or not all(isinstance(p, str) for p in prompts):
+            raise HTTPException(status_code=422, detail=f"prompts must be a JSON array of {count} strings")
+        return prompts
+    return fields.get("prompt") or "Describe this medical image in detail"
+
+
+@router.post("/analyze-images", response_model=BatchImageAnalysisResponse, openapi_extra=BATCH_UPLOAD_OPENAPI)
+async def analyze_images(request: Request, model_service: ModelService = Depends(ready_model_service)):
+    """
+    Analyze several medical images in one request
+
+    Modes:
+        independent: each image is analyzed on its own (shared prompt or one
+                     prompt per image), batch_size images per pipeline call
+        study: all images go into one prompt and produce one analysis
+
+    With stream=true (default) the response is NDJSON, one BatchImageResult
+    per line as soon as its batch finishes, followed by {"done": true}.
+
+    Returns:
+        Streamed results, or BatchImageAnalysisResponse when stream=false
+    """
+    start_time = time.time()
+
+    admission = get_admission()
+    admission.check("image", Priority.INTERACTIVE)
+
+    form = await parse_image_form(
+        request, image_field="images", max_bytes=MAX_IMAGE_BYTES, max_files=MAX_BATCH_IMAGES
+    )
+    try:
+        mode = BatchImageMode(form.fields.get("mode", BatchImageMode.INDEPENDENT.value))
+    except ValueError:
+        raise HTTPException(status_code=422, detail="mode must be 'independent' or 'study'")
+    try:
+        batch_size = int(form.fields.get("batch_size", "2"))
+    except ValueError:
+        raise HTTPException(status_code=422, detail="batch_size must be an integer")
+    if not 1 <= batch_size <= MAX_BATCH_SIZE:
+        raise HTTPException(status_code=422, detail=f"batch_size must be between 1 and {MAX_BATCH_SIZE}")
+    max_new_tokens = _form_max_new_tokens(form.fields)
+    stream = form.fields.get("stream", "true").lower() not in ("false", "0", "no")
+    filenames = [upload.file.filename for upload in form.images]
+
+    prompts = _form_batch_prompts(form.fields, len(form.images))
+    if mode == BatchImageMode.STUDY and not isinstance(prompts, str):
+        raise HTTPException(status_code=422, detail="study mode takes a single shared prompt")
+
+    # Decode all images on the preprocessing pool, then release the spools.
+    # Every decode is awaited before closing (one failing must not close
+    # spools other workers are still reading); then the first error is raised
+    preprocessor = get_image_preprocessor()
+    try:
+        images = await asyncio.gather(*(
+            preprocessor.preprocess_upload(upload.file.file, upload.digest) for upload in form.images
+        ), return_exceptions=True)
+    finally:
+        for upload in form.images:
+            await upload.file.close()
+    error = next((image for image in images if isinstance(image, BaseException)), None)
+    if isinstance(error, ValueError):
+        raise HTTPException(status_code=400, detail=str(error))
+    if error is not None:
+        raise error
+
+    def elapsed_ms() -> float:
+        return (time.time() - start_time) * 1000
+
+    # One budget for the whole request: batches stop starting once it is spent
+    budget = model_service.budget("image", max_new_tokens)
+
+    async def results():
+        if mode == BatchImageMode.STUDY:
+            analysis = await run_with_budget(
+                budget, model_service.analyze_study, images, prompts, max_new_tokens, budget
+            )
+            yield BatchImageResult(
+                index=-1, analysis=analysis, truncated=budget.truncated, processing_time_ms=elapsed_ms()
+            )
+            return
+        batches = model_service.analyze_images(images, prompts, max_new_tokens, batch_size, budget)
+        try:
+            async for index, analysis in iterate_in_threadpool(batches):
+                yield BatchImageResult(
+                    index=index, filename=filenames[index], analysis=analysis,
+                    truncated=budget.truncated, processing_time_ms=elapsed_ms()
+                )
+        except asyncio.CancelledError:
+            budget.cancel()
+            raise
+
+    # The slot is held for the whole batch; a streamed response releases it
+    # in a background task, which also runs when the client disconnects
+    await admission.acquire("image", Priority.INTERACTIVE)
+    held_since = time.monotonic()
+
+    def release():
+        admission.release("image", time.monotonic() - held_since)
+
+    if not stream:
+        try:
+            async with cancel_on_disconnect(request, budget):
+                collected = [result async for result in results()]
+        except Exception as e:
+            return JSONResponse(
+                status_code=500,
+                content={"detail": f"Image analysis failed: {str(e)}", "processing_time_ms": elapsed_ms()}
+            )
+        finally:
+            release()
+        return BatchImageAnalysisResponse(
+            mode=mode, results=collected, processing_time_ms=elapsed_ms(), budget=budget.describe()
+        )
+
+    async def ndjson():
+        try:
+            async for result in results():
+                yield result.model_dump_json() + "\n"
+        except Exception as e:
+            error = BatchImageResult(index=-1, error=f"Image analysis failed: {str(e)}", processing_time_ms=elapsed_ms())
+            yield error.model_dump_json() + "\n"
+        yield json.dumps({"done": True, "processing_time_ms": elapsed_ms(), "budget": budget.describe()}) + "\n"
+
+    return StreamingResponse(ndjson(), media_type="application/x-ndjson", background=BackgroundTask(release))
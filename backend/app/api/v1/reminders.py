@@ -0,0 +1,121 @@
+"""
+Reminders API endpoints
+"""
+import sys
+from pathlib import Path
+from typing import List, Optional
+
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
+
+from utils.db import delete_reminder, insert_reminder, list_reminders, update_reminder
+from app.models.schemas import ReminderCreate, ReminderResponse, ReminderStatus, ReminderUpdate
+from app.services.reminder_scheduler import get_reminder_scheduler, to_utc_iso
+
+router = APIRouter()
+
+
+def _reschedule(reminder: dict):
+    """Keep the scheduler in step with a stored reminder"""
+    scheduler = get_reminder_scheduler()
+    if reminder["status"] == ReminderStatus.PENDING.value:
+        scheduler.schedule(reminder["id"], reminder["due_date"])
+    else:
+        scheduler.cancel(reminder["id"])
+
+
+@router.get("/reminders", response_model=List[ReminderResponse])
+async def get_reminders(
+    viewer: str = Query(..., description="Viewer (admin sees every member's reminders)"),
+    status: Optional[ReminderStatus] = Query(None),
+    report_id: Optional[int] = Query(None, description="Only reminders created for this report"),
+    limit: int = Query(50, ge=1, le=500),
+    offset: int = Query(0, ge=0)
+):
+    """
+    List reminders, soonest due first
+
+    Args:
+        viewer: The user whose reminders to list
+        status: Status filter (e.g. "due" for reminders that have fired)
+        report_id: Report filter
+        limit: Page size
+        offset: Number of reminders to skip
+
+    Returns:
+        Reminders
+    """
+    return await run_in_threadpool(
+        list_reminders, viewer, status.value if status else None, report_id, limit, offset
+    )
+
+
+@router.post("/reminders", response_model=ReminderResponse, status_code=201)
+async def create_reminder(reminder: ReminderCreate):
+    """
+    Create a reminder; it fires (status "due") at its due date
+
+    Args:
+        reminder: Owner, title, optional due date, report and notes
+
+    Returns:
+        The stored reminder
+    """
+    stored = await run_in_threadpool(
+        insert_reminder,
+        reminder.owner,
+        reminder.title,
+        to_utc_iso(reminder.due_date) if reminder.due_date else None,
+        reminder.report_id,
+        reminder.notes
+    )
+    _reschedule(stored)
+    return stored
+
+
+@router.patch("/reminders/{reminder_id}", response_model=ReminderResponse)
+async def edit_reminder(reminder_id: int, update: ReminderUpdate):
+    """
+    Update a reminder
+
+    A new due date re-arms it (status "pending"); marking it done or
+    dismissed unschedules it.
+
+    Args:
+        reminder_id: Reminder ID
+        update: Fields to change
+
+    Returns:
+        The updated reminder
+    """
+    fields = update.model_dump(exclude_unset=True)
+    if fields.get("due_date") is not None:
+        fields["due_date"] = to_utc_iso(fields["due_date"])
+    if fields.get("status") is not None:
+        fields["status"] = fields["status"].value
+
+    stored = await run_in_threadpool(update_reminder, reminder_id, **fields)
+    if stored is None:
+        raise HTTPException(status_code=404, detail="Reminder not found")
+    _reschedule(stored)
+    return stored
+
+
+@router.delete("/reminders/{reminder_id}")
+async def remove_reminder(reminder_id: int):
+    """
+    Delete a reminder
+
+    Args:
+        reminder_id: Reminder ID to delete
+
+    Returns:
+        Success message
+    """
+    if not await run_in_threadpool(delete_reminder, reminder_id):
+        raise HTTPException(status_code=404, detail="Reminder not found")
+    get_reminder_scheduler().cancel(reminder_id)
+    return {"message": f"Reminder {reminder_id} deleted successfully"}
@@ -1,91 +1,134 @@
 """
 Reports API endpoints
 """
+import asyncio
+import json
 import sys
+import io
 from pathlib import Path
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Query
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Header, Query, Request, UploadFile, File, Form
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from typing import BinaryIO, List, Optional
 
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
 
-from utils.db import init_db, insert_report, list_reports_for_user, get_report
-from backend.app.services.pii_redact import redact_pii
+from utils.db import (
+    init_db, insert_report, list_reports_for_user, get_report, get_report_version,
+    reindex_report, replace_report_followup, detach_report_reminders, search_reports,
+    SNIPPET_START, SNIPPET_END,
+)
+from utils.highlight import cached_evidence_spans, invalidate_evidence_spans, render_highlight, render_snippet
+from backend.app.services.pii_redact import redact_pii, redact_file
 from backend.app.services.triage import triage_risk
-from app.models.schemas import ReportCreate, ReportResponse
+from app.core.config import settings
+from app.core.middleware import negotiate_encoding
+from app.models.schemas import ReportCreate, ReportResponse, ReportSearchResponse, VisibilityLevel
 from app.services.model_service import ModelService
+from app.services.admission import Priority, get_admission
+from app.services.rate_limit import get_rate_limiter
+from app.services.report_events import get_event_bus
+from app.services.reminder_scheduler import followup_reminder, get_reminder_scheduler
+from app.services.report_json import encode_report_list
+from app.services.report_cache import (
+    detail_etag,
+    etag_matches,
+    get_report_cache,
+    http_date,
+    invalidate_report_responses,
+    json_body,
+    list_etag,
+    not_modified,
+)
 
 router = APIRouter()
 
+# report_text of a report inserted before its (redacted) text is stored
+PROCESSING_PLACEHOLDER = "[PROCESSING]"
+
 
 @router.get("/reports", response_model=List[ReportResponse])
 async def list_reports(
-    viewer: str = Query(..., description="Viewer (for permission checking)")
+    viewer: str = Query(..., description="Viewer (for permission checking)"),
+    include_extracted: bool = Query(
+        True, description="Include the structured extraction of each report (false skips loading it)"
+    ),
+    if_none_match: Optional[str] = Header(None)
 ):
     """
     Get list of reports for a user (optimized single query)
 
+    The ETag is derived from the (id, version) pairs of the listed reports,
+    so an unchanged list is answered with 304, and a changed one is served
+    from the serialized-response cache when another viewer already loaded
+    the same list.
+
     Args:
         viewer: The user viewing the reports (for permission checking)
+        include_extracted: Whether to include the stored extracted data
+        if_none_match: ETag the client already has
 
     Returns:
         List of reports
     """
     import sqlite3
-    from utils.db import DB_PATH
+    from utils.db import DB_PATH, extracted_json_bytes
+
+    # Only read the extraction blob when the client asks for it
+    extracted_col = "extracted_json" if include_extracted else "NULL AS extracted_json"
+
+    if viewer == "admin":
+        where, params = "", ()
+    else:
+        where, params = "WHERE owner = ? OR visibility IN ('SHARED_SUMMARY', 'CAREGIVER')", (viewer,)
 
     try:
         conn = sqlite3.connect(DB_PATH)
         conn.row_factory = sqlite3.Row  # Enable column access by name
         cur = conn.cursor()
 
-        # Single query with permission filtering
-        if viewer == "admin":
-            # Admin sees all reports
-            cur.execute("""
-                SELECT id, owner, visibility, report_text, extracted_json,
-                       patient_view, family_view, urgency, created_at
-                FROM reports
-                ORDER BY id DESC
-                LIMIT 100
-            """)
-        else:
-            # Regular users see their own + shared reports
-            cur.execute("""
-                SELECT id, owner, visibility, report_text, extracted_json,
-                       patient_view, family_view, urgency, created_at
-                FROM reports
-                WHERE owner = ? OR visibility IN ('SHARED_SUMMARY', 'CAREGIVER')
-                ORDER BY id DESC
-                LIMIT 100
-            """, (viewer,))
+        # Versions first: enough to answer 304 or hit the cache without
+        # reading any report text
+        cur.execute(f"""
+            SELECT id, version FROM reports
+            {where}
+            ORDER BY id DESC
+            LIMIT 100
+        """, params)
+        etag = list_etag(((row["id"], row["version"]) for row in cur.fetchall()), include_extracted)
+        if etag_matches(if_none_match, etag):
+            conn.close()
+            return not_modified(etag)
+        cache = get_report_cache()
+        cached = cache.get(f"list:{etag}")
+        if cached is not None:
+            conn.close()
+            return json_body(cached, etag)
+
+        # Single query with permission filtering (admin sees all reports,
+        # regular users see their own + shared reports)
+        cur.execute(f"""
+            SELECT id, owner, visibility, report_text, {extracted_col},
+                   patient_view, family_view, urgency, created_at, status, version
+            FROM reports
+            {where}
+            ORDER BY id DESC
+            LIMIT 100
+        """, params)
 
         rows = cur.fetchall()
         conn.close()
 
-        result = []
-        for row in rows:
-            try:
-                # Parse JSON fields
-                import json
-                extracted = json.loads(row["extracted_json"]) if row["extracted_json"] else None
-
-                result.append(ReportResponse(
-                    id=row["id"],
-                    owner=row["owner"],
-                    visibility=row["visibility"],
-                    urgency=row["urgency"],
-                    status="completed",
-                    created_at=row["created_at"],
-                    report_text=row["report_text"],
-                    extracted=extracted,
-                    patient_view=row["patient_view"],
-                    family_view=row["family_view"]
-                ))
-            except Exception as e:
-                print(f"ERROR creating response for report {row['id']}: {e}")
-
-        return result
+        # Trusted rows: encode straight from the columns (no per-row model,
+        # stored extraction JSON embedded without parsing)
+        body = encode_report_list(rows, extracted_json_bytes)
+
+        # Tag the body with the versions it was built from (rows may have
+        # changed since the first query)
+        etag = list_etag(((row["id"], row["version"]) for row in rows), include_extracted)
+        cache.put(f"list:{etag}", body)
+        return json_body(body, etag)
 
     except Exception as e:
         print(f"ERROR: Error listing reports: {e}")
@@ -94,34 +137,203 @@ async def list_reports(
         return []
 
 
+@router.get("/reports/search", response_model=ReportSearchResponse)
+async def search_report_history(
+    viewer: str = Query(..., description="Viewer (for permission checking)"),
+    q: str = Query(..., min_length=1, max_length=500, description="Words to search for"),
+    match: str = Query("all", pattern="^(all|any)$", description="Require all words or any word"),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0)
+):
+    """
+    Full-text search over report text, findings, impression and the
+    generated views
+
+    Results are ranked by BM25 (impression and findings weigh most) and
+    carry a highlighted snippet; the same visibility rules as the report
+    list apply. Declared before /reports/{report_id}.
+
+    Args:
+        viewer: The user searching (for permission checking)
+        q: Free-text query, e.g. "chest CT nodule" (last word matches as a prefix)
+        match: "all" (every word) or "any"
+        limit: Page size
+        offset: Number of results to skip
+
+    Returns:
+        Total number of matches and one page of results
+    """
+    import sqlite3
+
+    try:
+        total, hits = await run_in_threadpool(search_reports, viewer, q, limit, offset, match == "all")
+    except sqlite3.OperationalError as e:
+        print(f"ERROR: Report search failed: {e}")
+        raise HTTPException(status_code=503, detail="Report search is unavailable")
+
+    for hit in hits:
+        hit["snippet"] = render_snippet(hit["snippet"], SNIPPET_START, SNIPPET_END)
+
+    return {"query": q, "total": total, "limit": limit, "offset": offset, "results": hits}
+
+
+SSE_HEARTBEAT_S = 15.0
+
+
+@router.get("/reports/events")
+async def report_events(
+    request: Request,
+    viewer: str = Query(..., description="Viewer (for permission checking)")
+):
+    """
+    Server-sent events for report processing
+
+    Pushes one `report` event per stage change (queued, redacting,
+    extracting, triage, explaining) and a final `completed` or `failed`
+    event for every report the viewer may see. Clients refetch a single
+    report on completion instead of polling the list. A `resync` event
+    means events were dropped (slow client or reconnect gap) and the list
+    should be reloaded once. Declared before /reports/{report_id}.
+
+    Args:
+        request: Incoming request (Last-Event-ID header for replay)
+        viewer: The user subscribing
+
+    Returns:
+        text/event-stream response
+    """
+    bus = get_event_bus()
+    last_event_id = request.headers.get("last-event-id")
+    sub = bus.subscribe(viewer, int(last_event_id) if last_event_id and last_event_id.isdigit() else None)
+
+    async def stream():
+        try:
+            yield "retry: 3000\n\n"
+            while not await request.is_disconnected():
+                events = await sub.get(timeout_s=SSE_HEARTBEAT_S)
+                if sub.lagged:
+                    sub.lagged = False
+                    yield "event: resync\ndata: {}\n\n"
+                if not events:
+                    yield ": heartbeat\n\n"
+                for event in events:
+                    yield f"id: {event.id}\nevent: report\ndata: {json.dumps(event.to_dict())}\n\n"
+        except asyncio.CancelledError:
+            pass
+        finally:
+            bus.unsubscribe(sub)
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 @router.get("/reports/{report_id}", response_model=ReportResponse)
-async def get_report_detail(report_id: int):
+async def get_report_detail(
+    report_id: int,
+    include_extracted: bool = Query(True, description="Include the structured extraction"),
+    if_none_match: Optional[str] = Header(None),
+    accept_encoding: Optional[str] = Header(None)
+):
     """
     Get detailed report by ID
 
+    Answers If-None-Match with 304 when the report's version is unchanged;
+    otherwise serves the serialized body from cache when possible. Completed
+    reports no longer change, so their body is also cached precompressed
+    and served as is to clients accepting that encoding.
+
     Args:
         report_id: Report ID
+        include_extracted: Whether to load and decode extracted data
+        if_none_match: ETag the client already has
+        accept_encoding: Codings the client accepts
 
     Returns:
         Report details
     """
-    detail = get_report(report_id)
+    current = get_report_version(report_id)
+
+    if not current:
+        raise HTTPException(status_code=404, detail="Report not found")
+
+    version, modified = current
+    etag = detail_etag(report_id, version, include_extracted)
+    last_modified = http_date(modified)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag, last_modified)
+
+    cache = get_report_cache()
+    key = f"detail:{report_id}:{etag}"
+    encoding = negotiate_encoding(accept_encoding)
+    compressed = cache.get_compressed(key, encoding)
+    if compressed is not None:
+        return json_body(compressed, etag, last_modified, encoding=encoding)
+    cached = cache.get(key)
+    if cached is not None:
+        return json_body(cached, etag, last_modified)
+
+    detail = get_report(report_id, include_extracted=include_extracted)
 
     if not detail:
         raise HTTPException(status_code=404, detail="Report not found")
 
-    return ReportResponse(
+    body = ReportResponse(
         id=detail['id'],
         owner=detail['owner'],
         visibility=detail['visibility'],
         urgency=detail['urgency'],
-        status="completed",
+        status=detail['status'],
         created_at=detail['created_at'],
         report_text=detail.get('report_text'),
         extracted=detail.get('extracted'),
         patient_view=detail.get('patient_view'),
         family_view=detail.get('family_view')
-    )
+    ).model_dump_json().encode()
+
+    # Tag with the version actually read
+    etag = detail_etag(report_id, detail['version'], include_extracted)
+    last_modified = http_date(detail['updated_at'])
+    key = f"detail:{report_id}:{etag}"
+    cache.put(key, body)
+    if detail['status'] == "completed":
+        # Max-level brotli/gzip takes tens of ms on large reports: keep it off the loop
+        await run_in_threadpool(cache.precompress, key, body)
+        compressed = cache.get_compressed(key, encoding)
+        if compressed is not None:
+            return json_body(compressed, etag, last_modified, encoding=encoding)
+    return json_body(body, etag, last_modified)
+
+
+@router.get("/reports/{report_id}/highlight")
+async def get_report_highlight(report_id: int):
+    """
+    Get evidence highlight spans for a report
+
+    All evidence strings of the extraction are matched in a single pass over
+    the report text and cached per report.
+
+    Args:
+        report_id: Report ID
+
+    Returns:
+        Merged (start, end) spans and the rendered HTML
+    """
+    detail = get_report(report_id)
+
+    if not detail:
+        raise HTTPException(status_code=404, detail="Report not found")
+
+    text = detail.get('report_text') or ""
+    spans = cached_evidence_spans(report_id, text, detail.get('extracted'))
+
+    return {
+        "report_id": report_id,
+        "spans": spans,
+        "html": render_highlight(text, spans)
+    }
 
 
 @router.post("/reports", response_model=ReportResponse, status_code=202)
@@ -139,32 +351,12 @@ async def create_report(
     Returns:
         Created report (with status="processing")
     """
-    import time
-    from datetime import datetime
-
-    # Create report immediately with processing status
-    import sqlite3
-    from utils.db import DB_PATH
-
-    conn = sqlite3.connect(DB_PATH)
-    cur = conn.cursor()
-
-    now = datetime.utcnow().isoformat()
+    # Per-owner rate limit, then load shedding, before anything is stored
+    # (429/503 with Retry-After)
+    get_rate_limiter("report").check(report_data.owner)
+    get_admission().check("report", Priority.BULK, owner=report_data.owner)
 
-    cur.execute("""
-        INSERT INTO reports(owner, visibility, report_text, urgency, created_at)
-        VALUES (?, ?, ?, ?, ?)
-    """, (
-        report_data.owner,
-        report_data.visibility.value,
-        "[PROCESSING]",  # Placeholder
-        "UNKNOWN",
-        now
-    ))
-
-    report_id = cur.lastrowid
-    conn.commit()
-    conn.close()
+    report_id, now = _insert_processing_report(report_data.owner, report_data.visibility.value)
 
     # Schedule background processing
     background_tasks.add_task(
@@ -186,45 +378,214 @@ async def create_report(
     )
 
 
+@router.post("/reports/upload", response_model=ReportResponse, status_code=202)
+async def upload_report(
+    background_tasks: BackgroundTasks,
+    file: UploadFile = File(..., description="Plain-text report document (e.g. OCR or PDF text export)"),
+    owner: str = Form(..., description="Report owner (alice, bob, etc.)"),
+    visibility: VisibilityLevel = Form(default=VisibilityLevel.SHARED_SUMMARY)
+):
+    """
+    Create a report from an uploaded text document (processed in background)
+
+    The document is redacted chunk by chunk while it is read, so the raw text
+    is never held in memory as a whole and never reaches extraction or SQLite.
+
+    Args:
+        background_tasks: FastAPI background tasks
+        file: Uploaded document
+        owner: Report owner
+        visibility: Report visibility
+
+    Returns:
+        Created report (with status="processing")
+    """
+    get_rate_limiter("report").check(owner)
+    get_admission().check("report", Priority.BULK, owner=owner)
+
+    try:
+        redacted = await run_in_threadpool(_redact_upload, file.file)
+    except ValueError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+
+    if len(redacted.strip()) < 10:
+        raise HTTPException(status_code=422, detail="Uploaded document contains no report text")
+
+    report_id, now = _insert_processing_report(owner, visibility.value, redacted)
+
+    background_tasks.add_task(
+        _process_report_task,
+        report_id,
+        redacted,
+        owner,
+        visibility.value,
+        already_redacted=True
+    )
+
+    return ReportResponse(
+        id=report_id,
+        owner=owner,
+        visibility=visibility.value,
+        urgency="UNKNOWN",
+        status="processing",
+        created_at=now,
+        report_text="[Processing in progress...]"
+    )
+
+
+def _redact_upload(src: BinaryIO) -> str:
+    """
+    Stream-redact an uploaded document
+
+    The upload is decoded and redacted chunk by chunk; the redacted text is
+    collected whole because the pipeline stores it and feeds it to the
+    model, so memory is bounded by MAX_REPORT_UPLOAD_BYTES, not by a spool.
+    """
+    out = io.StringIO()
+    redact_file(src, out, max_bytes=settings.MAX_REPORT_UPLOAD_BYTES)
+    return out.getvalue()
+
+
+def _insert_processing_report(owner: str, visibility: str, report_text: str = PROCESSING_PLACEHOLDER):
+    """
+    Insert the row of a report that is about to be processed
+
+    Args:
+        report_text: Redacted text when already known (uploads), else a
+            placeholder the pipeline replaces once it has redacted the text
+    """
+    import sqlite3
+    from datetime import datetime
+    from utils.db import DB_PATH
+
+    conn = sqlite3.connect(DB_PATH)
+    cur = conn.cursor()
+
+    now = datetime.utcnow().isoformat()
+
+    cur.execute("""
+        INSERT INTO reports(owner, visibility, report_text, urgency, created_at, status)
+        VALUES (?, ?, ?, ?, ?, ?)
+    """, (
+        owner,
+        visibility,
+        report_text,
+        "UNKNOWN",
+        now,
+        "processing"
+    ))
+
+    report_id = cur.lastrowid
+    conn.commit()
+    conn.close()
+    get_event_bus().publish(report_id, owner, visibility, "queued")
+
+    return report_id, now
+
+
+def _set_report_status(report_id: int, status: str):
+    """Update the processing status of a report"""
+    import sqlite3
+    from datetime import datetime
+    from utils.db import DB_PATH
+
+    conn = sqlite3.connect(DB_PATH)
+    conn.execute("""
+        UPDATE reports SET status = ?, version = version + 1, updated_at = ? WHERE id = ?
+    """, (status, datetime.utcnow().isoformat(), report_id))
+    conn.commit()
+    conn.close()
+    invalidate_report_responses(report_id)
+
+
+def _store_redacted_text(report_id: int, redacted: str):
+    """Store the redacted text as soon as it exists, so a failed run can be reprocessed"""
+    import sqlite3
+    from datetime import datetime
+    from utils.db import DB_PATH
+
+    conn = sqlite3.connect(DB_PATH)
+    conn.execute("""
+        UPDATE reports SET report_text = ?, version = version + 1, updated_at = ? WHERE id = ?
+    """, (redacted, datetime.utcnow().isoformat(), report_id))
+    conn.commit()
+    conn.close()
+    invalidate_report_responses(report_id)
+
+
+def _sync_followup_reminder(cur, report_id: int, owner: str, extracted):
+    """Replace the report's recommended follow-up reminder, dated from the report's creation"""
+    from datetime import datetime
+
+    cur.execute("SELECT created_at FROM reports WHERE id = ?", (report_id,))
+    created_at = datetime.fromisoformat(cur.fetchone()[0])
+    title, due_date = followup_reminder(extracted, created_at) or (None, None)
+    return replace_report_followup(cur, report_id, owner, title, due_date)
+
+
 async def _process_report_task(
     report_id: int,
     report_text: str,
     owner: str,
-    visibility: str
+    visibility: str,
+    already_redacted: bool = False,
+    priority: Priority = Priority.BULK
 ):
-    """Background task to process report"""
+    """
+    Background task to process report
+
+    Model calls run in the threadpool so the event loop stays responsive, and
+    only while holding a "report" admission slot; the slot queue is ordered by
+    priority, so interactive requests and urgent reprocessing go first, and
+    round-robin across owners within a priority.
+    """
     import sqlite3
-    import json
-    from utils.db import DB_PATH
+    from datetime import datetime
+    from utils.db import DB_PATH, encode_extracted
 
     print(f"[Background Task] Starting to process report {report_id}...")
+    bus = get_event_bus()
+
+    def stage(name: str):
+        bus.publish(report_id, owner, visibility, name)
 
     try:
         # Step 1: PII redaction
         print(f"[Background Task] Step 1: PII redaction...")
-        redacted = redact_pii(report_text)
+        stage("redacting")
+        redacted = report_text if already_redacted else await run_in_threadpool(redact_pii, report_text)
+        if not already_redacted:
+            _store_redacted_text(report_id, redacted)
 
-        # Step 2: Extract structured data
-        print(f"[Background Task] Step 2: Extracting structured data...")
         model_service = ModelService.get_instance()
-        extracted, _ = model_service.extract(redacted)
-        print(f"[Background Task] Extraction result: {extracted is not None}")
-
-        # Step 3: Risk triage
-        print(f"[Background Task] Step 3: Risk triage...")
-        if extracted:
-            triage = triage_risk(extracted)
-        else:
-            triage = {"urgency": "UNKNOWN", "rationale": "Extraction failed"}
-
-        # Step 4: Generate explanations
-        print(f"[Background Task] Step 4: Generating explanations...")
-        if extracted:
-            patient_view = model_service.patient_view(extracted, triage)
-            family_view = model_service.family_view(extracted, triage)
-        else:
-            patient_view = "⚠️ Unable to generate explanation due to extraction failure."
-            family_view = "⚠️ Unable to generate explanation due to extraction failure."
+        # Reports accepted during startup wait for the background model load
+        if not await model_service.wait_ready():
+            raise RuntimeError("AI models failed to load")
+        # Accepted work is never dropped: wait for a slot without a deadline
+        async with get_admission().slot("report", priority, timeout_s=None, owner=owner):
+            # Step 2: Extract structured data
+            print(f"[Background Task] Step 2: Extracting structured data...")
+            stage("extracting")
+            extracted, _ = await run_in_threadpool(model_service.extract, redacted)
+            print(f"[Background Task] Extraction result: {extracted is not None}")
+
+            # Step 3: Risk triage
+            print(f"[Background Task] Step 3: Risk triage...")
+            stage("triage")
+            if extracted:
+                triage = triage_risk(extracted)
+            else:
+                triage = {"urgency": "UNKNOWN", "rationale": "Extraction failed"}
+
+            # Step 4: Generate explanations
+            print(f"[Background Task] Step 4: Generating explanations...")
+            stage("explaining")
+            if extracted:
+                patient_view = await run_in_threadpool(model_service.patient_view, extracted, triage)
+                family_view = await run_in_threadpool(model_service.family_view, extracted, triage)
+            else:
+                patient_view = "⚠️ Unable to generate explanation due to extraction failure."
+                family_view = "⚠️ Unable to generate explanation due to extraction failure."
 
         # Step 5: Update database
         print(f"[Background Task] Step 5: Updating database...")
@@ -237,19 +598,33 @@ async def _process_report_task(
                 extracted_json = ?,
                 patient_view = ?,
                 family_view = ?,
-                urgency = ?
+                urgency = ?,
+                status = 'completed',
+                version = version + 1,
+                updated_at = ?
             WHERE id = ?
         """, (
             redacted,
-            json.dumps(extracted, ensure_ascii=False) if extracted else None,
+            encode_extracted(extracted),
             patient_view,
             family_view,
             triage["urgency"],
+            datetime.utcnow().isoformat(),
             report_id
         ))
+        reindex_report(cur, report_id)
+        removed_reminders, reminder = _sync_followup_reminder(cur, report_id, owner, extracted)
 
         conn.commit()
         conn.close()
+        scheduler = get_reminder_scheduler()
+        for reminder_id in removed_reminders:
+            scheduler.cancel(reminder_id)
+        if reminder:
+            scheduler.schedule(reminder["id"], reminder["due_date"])
+        invalidate_evidence_spans(report_id)
+        invalidate_report_responses(report_id)
+        bus.publish(report_id, owner, visibility, "completed", status="completed", urgency=triage["urgency"])
 
         print(f"✅ Report {report_id} processed successfully")
 
@@ -267,14 +642,74 @@ async def _process_report_task(
             cur.execute("""
                 UPDATE reports
                 SET patient_view = ?,
-                    family_view = ?
+                    family_view = ?,
+                    status = 'failed',
+                    version = version + 1,
+                    updated_at = ?
                 WHERE id = ?
-            """, (f"⚠️ Processing Error: {str(e)}", f"⚠️ Processing Error: {str(e)}", report_id))
+            """, (f"⚠️ Processing Error: {str(e)}", f"⚠️ Processing Error: {str(e)}",
+                  datetime.utcnow().isoformat(), report_id))
 
             conn.commit()
             conn.close()
+            invalidate_report_responses(report_id)
         except:
             print(f"❌ Failed to update error status for report {report_id}")
+        bus.publish(report_id, owner, visibility, "failed", status="failed")
+
+
+@router.post("/reports/{report_id}/reprocess", response_model=ReportResponse, status_code=202)
+async def reprocess_report(report_id: int, background_tasks: BackgroundTasks):
+    """
+    Run the extraction pipeline again for a stored report
+
+    Reports last triaged EMERGENT are queued ahead of all other work.
+
+    Args:
+        report_id: Report ID
+        background_tasks: FastAPI background tasks
+
+    Returns:
+        The report (with status="processing")
+    """
+    detail = get_report(report_id, include_extracted=False)
+
+    if not detail:
+        raise HTTPException(status_code=404, detail="Report not found")
+    if detail['status'] == "processing":
+        raise HTTPException(status_code=409, detail="Report is still being processed")
+    if detail['report_text'] == PROCESSING_PLACEHOLDER:
+        # Failed before its text was stored: there is nothing to reprocess
+        raise HTTPException(status_code=409, detail="Report text was never stored; upload the report again")
+
+    priority = Priority.URGENT if detail['urgency'] == "EMERGENT" else Priority.BULK
+    if priority != Priority.URGENT:
+        get_rate_limiter("report").check(detail['owner'])
+    get_admission().check("report", priority, owner=detail['owner'])
+
+    _set_report_status(report_id, "processing")
+    get_event_bus().publish(report_id, detail['owner'], detail['visibility'], "queued")
+
+    # The stored text was redacted on ingestion
+    background_tasks.add_task(
+        _process_report_task,
+        report_id,
+        detail['report_text'],
+        detail['owner'],
+        detail['visibility'],
+        already_redacted=True,
+        priority=priority
+    )
+
+    return ReportResponse(
+        id=report_id,
+        owner=detail['owner'],
+        visibility=detail['visibility'],
+        urgency=detail['urgency'],
+        status="processing",
+        created_at=detail['created_at'],
+        report_text=detail['report_text']
+    )
 
 
 @router.delete("/reports/{report_id}")
@@ -300,7 +735,14 @@ async def delete_report(report_id: int):
         conn.close()
         raise HTTPException(status_code=404, detail="Report not found")
 
+    # Its pending follow-up reminders must not fire for a report that is gone
+    removed_reminders = detach_report_reminders(cur, report_id)
     conn.commit()
     conn.close()
+    scheduler = get_reminder_scheduler()
+    for reminder_id in removed_reminders:
+        scheduler.cancel(reminder_id)
+    invalidate_evidence_spans(report_id)
+    invalidate_report_responses(report_id)
 
     return {"message": f"Report {report_id} deleted successfully"}
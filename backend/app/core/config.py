@@ -3,6 +3,7 @@ Application configuration
 """
 from pydantic_settings import BaseSettings
 from functools import lru_cache
+from typing import Dict, Optional
 
 
 class Settings(BaseSettings):
@@ -20,6 +21,86 @@ class Settings(BaseSettings):
 
     # Model
     MODEL_ID: str = "medgemma-1.5-4b-it"
+    # Start loading models in the background at startup (else on first use)
+    MODEL_PRELOAD: bool = True
+    # Warmup after loading: dummy prompts through every stage before the
+    # service reports ready (round 1 pays one-time costs, later rounds
+    # show steady-state latency; see /api/v1/health/models)
+    MODEL_WARMUP: bool = True
+    MODEL_WARMUP_ROUNDS: int = 2
+    MODEL_WARMUP_MAX_NEW_TOKENS: int = 32
+    # torch.compile the text decoders; compiled graphs are cached on disk
+    # (default ~/.cache/family-health-copilot/torchinductor)
+    MODEL_COMPILE: bool = False
+    MODEL_COMPILE_MODE: str = "default"
+    MODEL_COMPILE_CACHE_DIR: Optional[str] = None
+
+    # Decoding profile per pipeline stage: "greedy", "seeded[:<seed>]" or "sample"
+    DECODING_EXTRACT: str = "greedy"
+    DECODING_SYNTHESIZE: str = "seeded:1234"
+    DECODING_CHAT: str = "seeded:1234"
+    DECODING_IMAGE: str = "greedy"
+    RESPONSE_CACHE_SIZE: int = 256
+    # Serialized report read responses (ETag-keyed)
+    REPORT_RESPONSE_CACHE_SIZE: int = 512
+
+    # Response compression: bodies below the threshold are sent as is;
+    # precompressed copies of completed report details use the slower levels
+    COMPRESSION_MIN_SIZE: int = 1024
+    # Bodies (or stream chunks) this large are compressed in the threadpool
+    COMPRESSION_THREADPOOL_MIN_SIZE: int = 16 * 1024
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 5
+    PRECOMPRESS_GZIP_LEVEL: int = 9
+    PRECOMPRESS_BROTLI_QUALITY: int = 11
+
+    # Generation budgets per stage: token cap and wall-clock deadline (seconds)
+    EXTRACT_MAX_NEW_TOKENS: int = 900
+    EXTRACT_TIMEOUT_S: float = 180.0
+    SYNTHESIZE_MAX_NEW_TOKENS: int = 500
+    SYNTHESIZE_TIMEOUT_S: float = 120.0
+    CHAT_MAX_NEW_TOKENS: int = 1024
+    CHAT_TIMEOUT_S: float = 120.0
+    IMAGE_MAX_NEW_TOKENS: int = 2000
+    IMAGE_TIMEOUT_S: float = 240.0
+
+    # Admission control in front of the model: global and per-route concurrency,
+    # bounded wait queue (global and per route) and maximum queue wait
+    ADMISSION_MAX_CONCURRENT: int = 2
+    ADMISSION_MAX_QUEUE: int = 32
+    ADMISSION_ROUTE_QUEUE: int = 16
+    # Queued work one owner may have when new work is accepted (checked at
+    # request time only; accepted work is never shed)
+    ADMISSION_OWNER_QUEUE: int = 8
+    ADMISSION_QUEUE_TIMEOUT_S: float = 30.0
+    ADMISSION_ROUTE_LIMITS: Dict[str, int] = {
+        "extract": 1,
+        "synthesize": 1,
+        "chat": 2,
+        "image": 1,
+        "report": 1,
+    }
+
+    # Per-owner token buckets (requests per minute, burst size)
+    REPORT_RATE_PER_MIN: float = 6.0
+    REPORT_RATE_BURST: int = 3
+    CHAT_RATE_PER_MIN: float = 20.0
+    CHAT_RATE_BURST: int = 5
+
+    # Reminder scheduler: longest sleep between heap checks (seconds)
+    REMINDER_SCHEDULER_ENABLED: bool = True
+    REMINDER_MAX_SLEEP_S: float = 60.0
+
+    # Extraction schema version (None = schemas/radiology_schema.json)
+    SCHEMA_VERSION: Optional[str] = None
+
+    # Image preprocessing (MedGemma's vision encoder takes 896x896 inputs)
+    IMAGE_INPUT_SIZE: int = 896
+    IMAGE_CACHE_SIZE: int = 32
+    IMAGE_PREPROCESS_WORKERS: int = 2
+
+    # Uploads
+    MAX_REPORT_UPLOAD_BYTES: int = 50 * 1024 * 1024
 
     # CORS
     FRONTEND_URL: str = "http://localhost:3002"
@@ -0,0 +1,204 @@
+"""
+HTTP middleware
+Negotiated response compression (brotli when the package is installed,
+otherwise gzip) for text payloads above a size threshold.
+"""
+import zlib
+from typing import Optional
+
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+
+try:
+    import brotli
+except ImportError:  # optional dependency
+    brotli = None
+
+# Supported codings in order of preference
+ENCODINGS = ("br", "gzip") if brotli is not None else ("gzip",)
+
+COMPRESSIBLE_TYPES = {
+    "application/json",
+    "application/x-ndjson",
+    "application/javascript",
+    "image/svg+xml",
+}
+
+
+def negotiate_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """
+    Pick a content coding from an Accept-Encoding header
+
+    Args:
+        accept_encoding: Header value, e.g. "gzip, deflate, br;q=0.9"
+
+    Returns:
+        "br", "gzip" or None (send uncompressed)
+    """
+    if not accept_encoding:
+        return None
+    weights = {}
+    for item in accept_encoding.split(","):
+        coding, _, params = item.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        weights[coding.strip().lower()] = q
+
+    best, best_q = None, 0.0
+    for coding in ENCODINGS:
+        q = weights.get(coding, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = coding, q
+    return best
+
+
+def compress(body: bytes, encoding: str, level: Optional[int] = None) -> bytes:
+    """
+    Compress a whole body
+
+    Args:
+        body: Uncompressed bytes
+        encoding: "br" or "gzip"
+        level: Brotli quality / gzip level (defaults from settings)
+    """
+    if encoding == "br":
+        quality = settings.COMPRESSION_BROTLI_QUALITY if level is None else level
+        return brotli.compress(body, quality=quality)
+    level = settings.COMPRESSION_GZIP_LEVEL if level is None else level
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)  # 31 = gzip container
+    return compressor.compress(body) + compressor.flush()
+
+
+def is_compressible(content_type: Optional[str]) -> bool:
+    if not content_type:
+        return False
+    media_type = content_type.split(";", 1)[0].strip().lower()
+    if media_type == "text/event-stream":
+        return False  # SSE must reach the client event by event
+    return media_type.startswith("text/") or media_type.endswith("+json") or media_type in COMPRESSIBLE_TYPES
+
+
+def add_vary(headers: MutableHeaders):
+    vary = headers.get("Vary")
+    if not vary:
+        headers["Vary"] = "Accept-Encoding"
+    elif "accept-encoding" not in vary.lower():
+        headers["Vary"] = f"{vary}, Accept-Encoding"
+
+
+def weaken_etag(headers: MutableHeaders):
+    """A strong ETag names the identity bytes; the compressed variant gets the weak form"""
+    etag = headers.get("ETag")
+    if etag and not etag.startswith("W/"):
+        headers["ETag"] = f"W/{etag}"
+
+
+class _StreamCompressor:
+    """Incremental compressor that flushes after every chunk"""
+
+    def __init__(self, encoding: str):
+        self.encoding = encoding
+        if encoding == "br":
+            self._c = brotli.Compressor(quality=settings.COMPRESSION_BROTLI_QUALITY)
+        else:
+            self._c = zlib.compressobj(settings.COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, 31)
+
+    def feed(self, chunk: bytes, final: bool) -> bytes:
+        if self.encoding == "br":
+            data = self._c.process(chunk)
+            return data + (self._c.finish() if final else self._c.flush())
+        data = self._c.compress(chunk)
+        return data + self._c.flush(zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH)
+
+
+class CompressionMiddleware:
+    """
+    Compress responses the client accepts in compressed form
+
+    Responses are left alone when they are small, not text, already
+    encoded (e.g. a precompressed report detail), an SSE stream, or marked
+    Cache-Control: no-transform. Streaming bodies are compressed chunk by
+    chunk with a flush after each, so progress stays visible. Large bodies
+    and chunks are compressed in the threadpool, off the event loop.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: Optional[int] = None):
+        self.app = app
+        self.minimum_size = settings.COMPRESSION_MIN_SIZE if minimum_size is None else minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding"))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        async def run(fn, *args):
+            # Small payloads compress faster than a threadpool hop
+            if len(args[0]) >= settings.COMPRESSION_THREADPOOL_MIN_SIZE:
+                return await run_in_threadpool(fn, *args)
+            return fn(*args)
+
+        start: Optional[Message] = None
+        stream: Optional[_StreamCompressor] = None
+        passthrough = False
+
+        async def send_compressed(message: Message):
+            nonlocal start, stream, passthrough
+            if message["type"] == "http.response.start":
+                start = message   # held until the first body chunk shows the size
+                return
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if stream is not None:
+                await send({"type": "http.response.body", "body": await run(stream.feed, body, not more_body),
+                            "more_body": more_body})
+                return
+
+            headers = MutableHeaders(raw=start["headers"])
+            compressible = (
+                start["status"] not in (204, 304)
+                and "content-encoding" not in headers
+                and "no-transform" not in headers.get("cache-control", "").lower()
+                and is_compressible(headers.get("content-type"))
+            )
+            if not compressible or (not more_body and len(body) < self.minimum_size):
+                passthrough = True
+                if compressible:
+                    add_vary(headers)
+                await send(start)
+                await send(message)
+                return
+
+            headers["Content-Encoding"] = encoding
+            add_vary(headers)
+            weaken_etag(headers)
+            if not more_body:
+                data = await run(compress, body, encoding)
+                headers["Content-Length"] = str(len(data))
+                await send(start)
+                await send({"type": "http.response.body", "body": data})
+                return
+
+            if "content-length" in headers:
+                del headers["Content-Length"]
+            stream = _StreamCompressor(encoding)
+            await send(start)
+            await send({"type": "http.response.body", "body": await run(stream.feed, body, False),
+                        "more_body": True})
+
+        await self.app(scope, receive, send_compressed)
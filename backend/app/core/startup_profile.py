@@ -0,0 +1,91 @@
+"""
+Startup profiling
+
+Phase timings: main.py and the lifespan hook mark each startup phase
+(app imported, database ready, serving, models ready) relative to the
+moment main.py started importing; see GET /api/v1/health/startup.
+
+Import time per module: run
+
+    cd backend && python -m app.core.startup_profile [--top 25]
+
+which imports app.main in a fresh interpreter under `-X importtime` and
+prints the slowest modules and top-level packages. For the live server,
+set PYTHONPROFILEIMPORTTIME=1 to get the raw per-module report on stderr.
+"""
+import argparse
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+_t0 = time.perf_counter()
+_phases: Dict[str, float] = {}
+
+
+def mark(phase: str):
+    """Record that a startup phase finished (first mark wins)"""
+    _phases.setdefault(phase, round(time.perf_counter() - _t0, 3))
+
+
+def phases() -> Dict[str, float]:
+    """Seconds since main.py started importing, per finished phase"""
+    return dict(_phases)
+
+
+def parse_importtime(stderr: str) -> List[Tuple[str, int, int]]:
+    """
+    Parse `-X importtime` output
+
+    Returns:
+        (module, self us, cumulative us) per imported module; the name
+        keeps its indentation, which gives the nesting depth
+    """
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        rows.append((name.rstrip()[1:], int(self_us), int(cumulative_us)))
+    return rows
+
+
+def profile_imports(target: str = "app.main") -> List[Tuple[str, int, int]]:
+    """Import `target` in a fresh interpreter and return its import times"""
+    backend_dir = Path(__file__).parent.parent.parent
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {target}"],
+        cwd=str(backend_dir), capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        print(result.stderr[-2000:], file=sys.stderr)
+        raise SystemExit(f"importing {target} failed")
+    return parse_importtime(result.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import time per module for the API process")
+    parser.add_argument("--target", default="app.main", help="Module to import (default: app.main)")
+    parser.add_argument("--top", type=int, default=25, help="Rows per table")
+    args = parser.parse_args()
+
+    rows = profile_imports(args.target)
+    # Top-level imports (no leading indentation) add up to the total
+    total_us = sum(cum for name, _, cum in rows if not name.startswith(" "))
+    by_package: Dict[str, int] = defaultdict(int)
+    for name, self_us, _ in rows:
+        by_package[name.strip().split(".")[0]] += self_us
+
+    print(f"Importing {args.target}: {total_us / 1000:.0f} ms, {len(rows)} modules\n")
+    print(f"{'self ms':>9} {'cumul ms':>9}  module")
+    for name, self_us, cum_us in sorted(rows, key=lambda r: r[1], reverse=True)[:args.top]:
+        print(f"{self_us / 1000:>9.1f} {cum_us / 1000:>9.1f}  {name.strip()}")
+    print(f"\n{'self ms':>9}  package")
+    for package, self_us in sorted(by_package.items(), key=lambda kv: kv[1], reverse=True)[:args.top]:
+        print(f"{self_us / 1000:>9.1f}  {package}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,6 @@
 """
 Family Health Copilot API
-FastAPI backend with pre-loaded AI models
+FastAPI backend; AI models load in the background after startup
 """
 import sys
 from pathlib import Path
@@ -9,13 +9,19 @@ from pathlib import Path
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
+from app.core import startup_profile
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 
-from app.api.v1 import reports, models, health, chat
+from app.api.v1 import reports, models, health, chat, findings, dashboard, reminders
 from app.core.config import settings
+from app.core.middleware import CompressionMiddleware
 from app.services.model_service import ModelService
+from utils.db import check_db_health
+
+startup_profile.mark("app_imported")
 
 
 @asynccontextmanager
@@ -25,7 +31,7 @@ async def lifespan(app: FastAPI):
     print("🚀 Starting Family Health Copilot API...")
 
     # Initialize database with actual status checking
-    from utils.db import init_db, check_db_health
+    from utils.db import init_db
     print("🔧 Initializing database...")
     db_status = init_db()
 
@@ -33,19 +39,29 @@ async def lifespan(app: FastAPI):
         print(f"✅ Database initialized: {db_status.get('tables_created', 0)} tables ready")
     else:
         print(f"⚠️ Database initialization warning: {db_status.get('error', 'Unknown error')}")
+    startup_profile.mark("database_ready")
 
-    # Load models
-    print("🔄 Pre-loading AI models...")
-    ModelService.get_instance()
-    print("✅ Models loaded successfully!")
+    # Load models in the background: /health answers right away and
+    # /api/v1/health/ready turns 200 once they are loaded and warmed up
+    if settings.MODEL_PRELOAD:
+        print("🔄 Loading AI models in the background...")
+        ModelService.get_instance().start_loading()
+
+    if settings.REMINDER_SCHEDULER_ENABLED:
+        from app.services.reminder_scheduler import get_reminder_scheduler
+        await get_reminder_scheduler().start()
 
     print(f"🌐 API running at http://{settings.API_HOST}:{settings.API_PORT}")
     print(f"📚 Documentation at http://{settings.API_HOST}:{settings.API_PORT}/docs")
+    startup_profile.mark("serving")
+    print(f"⏱️ Startup phases (s): {startup_profile.phases()}")
 
     yield
 
     # Shutdown
     print("👋 Shutting down...")
+    if settings.REMINDER_SCHEDULER_ENABLED:
+        await get_reminder_scheduler().stop()
 
 
 # Create FastAPI app
@@ -74,11 +90,17 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress large JSON/markdown responses (gzip, or brotli when installed)
+app.add_middleware(CompressionMiddleware)
+
 # Include routers
 app.include_router(reports.router, prefix="/api/v1", tags=["reports"])
 app.include_router(models.router, prefix="/api/v1/models", tags=["models"])
 app.include_router(health.router, prefix="/api/v1", tags=["health"])
 app.include_router(chat.router, prefix="/api/v1", tags=["chat"])
+app.include_router(findings.router, prefix="/api/v1", tags=["findings"])
+app.include_router(dashboard.router, prefix="/api/v1", tags=["dashboard"])
+app.include_router(reminders.router, prefix="/api/v1", tags=["reminders"])
 
 
 @app.get("/")
@@ -97,10 +119,10 @@ async def root():
 async def health_check():
     """Health check endpoint - returns actual model and database status"""
     model_service = ModelService.get_instance()
-    models_loaded = model_service.is_loaded()
+    # "warming" models are loaded but not yet serving
+    models_loaded = model_service.state == "ready"
 
     # Check database health
-    from db import check_db_health
     db_health = check_db_health()
 
     # Overall status: healthy only if both models and DB are healthy
@@ -109,6 +131,7 @@ async def health_check():
     return {
         "status": overall_status,
         "models_loaded": models_loaded,
+        "models_state": model_service.state,
         "database": {
             "status": db_health.get("status", "unknown"),
             "report_count": db_health.get("report_count", 0),
@@ -1,9 +1,9 @@
 """
 Pydantic schemas for request/response validation
 """
-from pydantic import BaseModel, Field
-from typing import Optional, Dict, Any
-from datetime import datetime
+from pydantic import BaseModel, Field, field_validator
+from typing import Optional, Dict, Any, List, Union
+from datetime import date, datetime
 from enum import Enum
 
 
@@ -47,6 +47,132 @@ class ReportResponse(BaseModel):
         from_attributes = True
 
 
+class ReportSearchHit(BaseModel):
+    """Schema for one full-text search result"""
+    id: int
+    owner: str
+    visibility: str
+    urgency: str
+    status: str
+    created_at: str
+    score: float = Field(..., description="Relevance (higher is better)")
+    snippet: str = Field(..., description="Matching excerpt, HTML-escaped, matches wrapped in <mark>")
+
+
+class ReportSearchResponse(BaseModel):
+    """Schema for a page of full-text search results"""
+    query: str
+    total: int
+    limit: int
+    offset: int
+    results: List[ReportSearchHit]
+
+
+class FindingKind(str, Enum):
+    """What a finding occurrence refers to"""
+    ENTITY = "entity"
+    FLAG = "flag"
+
+
+class FindingOccurrence(BaseModel):
+    """Schema for one entity or critical flag of a report"""
+    report_id: int
+    owner: str
+    created_at: str
+    kind: FindingKind
+    name: str
+    status: Optional[str] = Field(None, description="Certainty (entities) or status (critical flags)")
+    anatomy: Optional[str] = None
+    severity: Optional[str] = None
+    temporal: Optional[str] = None
+    evidence: Optional[str] = None
+    urgency: str
+    visibility: str
+
+
+class FindingTimelineResponse(BaseModel):
+    """Schema for a member's timeline of one finding"""
+    owner: str
+    term: str
+    occurrences: List[FindingOccurrence]
+
+
+class DashboardLatestReport(BaseModel):
+    """Schema for a member's newest report"""
+    report_id: int
+    created_at: str
+    urgency: str
+    status: str
+
+
+class DashboardMember(BaseModel):
+    """Schema for one family member's dashboard counts"""
+    owner: str
+    total: int
+    by_urgency: Dict[str, int]
+    processing: int
+    failed: int
+    latest: Optional[DashboardLatestReport] = None
+
+
+class DashboardSummary(BaseModel):
+    """Schema for the dashboard summary"""
+    viewer: str
+    total: int
+    by_urgency: Dict[str, int]
+    by_visibility: Dict[str, int]
+    by_status: Dict[str, int]
+    members: List[DashboardMember]
+    backlog: Dict[str, int] = Field(..., description="Reports still processing or failed")
+
+
+class ReminderStatus(str, Enum):
+    """Reminder lifecycle"""
+    PENDING = "pending"
+    DUE = "due"
+    DONE = "done"
+    DISMISSED = "dismissed"
+
+
+class ReminderCreate(BaseModel):
+    """Schema for creating a reminder"""
+    owner: str = Field(..., min_length=1)
+    title: str = Field(..., min_length=1, max_length=500)
+    due_date: Optional[Union[datetime, date]] = Field(None, description="When to fire (naive times are UTC)")
+    report_id: Optional[int] = None
+    notes: Optional[str] = None
+
+
+class ReminderUpdate(BaseModel):
+    """Schema for updating a reminder (only given fields change)"""
+    title: Optional[str] = Field(None, min_length=1, max_length=500)
+    due_date: Optional[Union[datetime, date]] = None
+    status: Optional[ReminderStatus] = None
+    notes: Optional[str] = None
+
+    @field_validator("title", "status")
+    @classmethod
+    def not_null(cls, value):
+        # Omit the field to leave it unchanged; these columns cannot be cleared
+        if value is None:
+            raise ValueError("may be omitted but not null")
+        return value
+
+
+class ReminderResponse(BaseModel):
+    """Schema for reminder response"""
+    id: int
+    owner: str
+    title: str
+    due_date: Optional[str] = None
+    status: ReminderStatus
+    created_at: str
+    report_id: Optional[int] = None
+    notes: Optional[str] = None
+    source: str = "manual"
+    fired_at: Optional[str] = None
+
+
 class ExtractRequest(BaseModel):
     """Schema for extraction request"""
     report_text: str = Field(..., min_length=10)
@@ -57,6 +183,8 @@ class ExtractResponse(BaseModel):
     extracted: Optional[Dict[str, Any]] = None
     raw_output: Optional[str] = None
     processing_time_ms: Optional[float] = None
+    decoding: Optional[Dict[str, Any]] = None
+    budget: Optional[Dict[str, Any]] = None
 
 
 class TriageRequest(BaseModel):
@@ -79,6 +207,8 @@ class GenerateExplanationRequest(BaseModel):
 class GenerateExplanationResponse(BaseModel):
     """Schema for explanation response"""
     explanation: str
+    decoding: Optional[Dict[str, Any]] = None
+    budget: Optional[Dict[str, Any]] = None
 
 
 class ImageAnalysisRequest(BaseModel):
@@ -99,3 +229,29 @@ class ImageAnalysisResponse(BaseModel):
     """Schema for image analysis response"""
     analysis: str = Field(..., description="Image analysis result")
     processing_time_ms: float = Field(..., description="Processing time in milliseconds")
+    truncated: bool = Field(default=False, description="Generation stopped by the deadline or a cancel")
+    budget: Optional[Dict[str, Any]] = None
+
+
+class BatchImageMode(str, Enum):
+    """How a batch of images is analyzed"""
+    INDEPENDENT = "independent"
+    STUDY = "study"
+
+
+class BatchImageResult(BaseModel):
+    """Schema for one result of a batch image analysis"""
+    index: int = Field(..., description="Position of the image in the upload (-1 for a whole study)")
+    filename: Optional[str] = None
+    analysis: Optional[str] = None
+    error: Optional[str] = None
+    truncated: bool = False
+    processing_time_ms: float = Field(..., description="Time since the request started, in milliseconds")
+
+
+class BatchImageAnalysisResponse(BaseModel):
+    """Schema for batch image analysis response"""
+    mode: BatchImageMode
+    results: List[BatchImageResult]
+    processing_time_ms: float
+    budget: Optional[Dict[str, Any]] = None
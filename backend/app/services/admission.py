@@ -0,0 +1,352 @@
+"""
+Admission Control
+Bounds how much work can pile onto the single ModelService instance: a
+global concurrency limit, per-route limits and a bounded, prioritized wait
+queue. Requests that cannot be admitted are shed early with 429/503 and a
+Retry-After estimate instead of waiting until the client times out.
+
+Within a priority level the queue is served round-robin across owners
+(family members), so one member flooding a route cannot starve the others.
+"""
+import asyncio
+import itertools
+import math
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import Dict, List, Optional
+
+from fastapi import HTTPException
+
+from app.core.config import settings
+
+
+class Priority(IntEnum):
+    """Lower value is admitted first"""
+    URGENT = 0        # reprocessing of EMERGENT-triage reports
+    INTERACTIVE = 1   # chat and direct model calls, a user is waiting
+    BULK = 2          # background report ingestion
+
+
+class AdmissionRejected(HTTPException):
+    """Raised when a request is shed; carries a Retry-After header"""
+
+    def __init__(self, status_code: int, detail: str, retry_after: int):
+        super().__init__(
+            status_code=status_code,
+            detail=detail,
+            headers={"Retry-After": str(retry_after)},
+        )
+        self.retry_after = retry_after
+
+
+@dataclass(order=True)
+class _Waiter:
+    priority: int
+    round: int        # owner's round-robin turn; interleaves owners within a priority
+    seq: int
+    route: str = field(compare=False)
+    owner: str = field(compare=False)
+    future: asyncio.Future = field(compare=False, repr=False)
+    enqueued: float = field(compare=False, default_factory=time.monotonic)
+
+
+@dataclass
+class _RouteStats:
+    limit: int
+    max_queue: int
+    in_flight: int = 0
+    queued: int = 0
+    admitted: int = 0
+    rejected: int = 0
+    timed_out: int = 0
+    # Exponentially weighted service and queue-wait times (seconds)
+    avg_service_s: float = 0.0
+    avg_wait_s: float = 0.0
+
+
+@dataclass
+class _OwnerStats:
+    queued: int = 0
+    admitted: int = 0
+    timed_out: int = 0
+    avg_wait_s: float = 0.0
+    max_wait_s: float = 0.0
+
+
+class AdmissionController:
+    """
+    Priority admission in front of the model routes.
+
+    A waiter is granted a slot when both the global and its route's
+    in-flight counts are below their limits; among grantable waiters the
+    lowest (priority, owner round, arrival) goes first. A new waiter gets
+    the round after its owner's last still-queued waiter (or the current
+    round if it has none), so owners take turns instead of being served in
+    arrival order, and waiters that time out give their rounds back. The wait
+    queue is bounded globally and per route, and each wait is bounded by
+    queue_timeout_s.
+
+    Usage:
+        async with admission.slot("chat", Priority.INTERACTIVE, owner="alice"):
+            ...  # model call
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int,
+        max_queue: int,
+        queue_timeout_s: Optional[float],
+        route_limits: Dict[str, int],
+        route_queue: int,
+        owner_queue: Optional[int] = None,
+        max_owners: int = 1024,
+    ):
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.queue_timeout_s = queue_timeout_s
+        self.route_queue = route_queue
+        self.owner_queue = owner_queue
+        self.routes: Dict[str, _RouteStats] = {
+            name: _RouteStats(limit=limit, max_queue=route_queue) for name, limit in route_limits.items()
+        }
+        self.max_owners = max_owners
+        # Least recently seen first; idle owners beyond max_owners are evicted
+        self.owners: "OrderedDict[str, _OwnerStats]" = OrderedDict()
+        self.in_flight = 0
+        self._round = 0   # round of the most recently admitted waiter
+        self._waiters: List[_Waiter] = []
+        self._seq = itertools.count()
+
+    def _route(self, route: str) -> _RouteStats:
+        stats = self.routes.get(route)
+        if stats is None:
+            stats = self.routes[route] = _RouteStats(limit=self.max_concurrent, max_queue=self.route_queue)
+        return stats
+
+    def _grantable(self, route: str) -> bool:
+        return self.in_flight < self.max_concurrent and self._route(route).in_flight < self._route(route).limit
+
+    def retry_after(self, route: str) -> int:
+        """Seconds until a new request on this route would likely be admitted"""
+        stats = self._route(route)
+        service_s = stats.avg_service_s or 1.0
+        ahead = len(self._waiters) + 1
+        return max(1, math.ceil(service_s * ahead / max(1, min(self.max_concurrent, stats.limit))))
+
+    def saturated(self, route: str, priority: Priority = Priority.BULK) -> bool:
+        """True when a new request on this route would be rejected right now"""
+        stats = self._route(route)
+        if self._grantable(route) or priority == Priority.URGENT:
+            return False
+        return len(self._waiters) >= self.max_queue or stats.queued >= stats.max_queue
+
+    def check(self, route: str, priority: Priority = Priority.BULK, owner: Optional[str] = None):
+        """
+        Raise AdmissionRejected if new work should be shed (for work that is
+        queued later with timeout_s=None)
+
+        Besides the global and route bounds, an owner who already has
+        owner_queue requests queued gets 429, so one member's backlog cannot
+        fill the shared queue. This is the only place the owner bound
+        applies: once accepted, work is never shed.
+        """
+        if self.saturated(route, priority):
+            self._route(route).rejected += 1
+            self._reject(route)
+        owner_stats = self.owners.get(owner or "anonymous")
+        if (self.owner_queue is not None and priority > Priority.URGENT
+                and owner_stats is not None and owner_stats.queued >= self.owner_queue):
+            self._route(route).rejected += 1
+            raise AdmissionRejected(429, f"Too many pending requests for '{owner}'", self.retry_after(route))
+
+    def _reject(self, route: str):
+        stats = self._route(route)
+        if stats.queued >= stats.max_queue:
+            # This route alone is over its share: the client should slow down
+            raise AdmissionRejected(429, f"Too many pending '{route}' requests", self.retry_after(route))
+        raise AdmissionRejected(503, "Model service is at capacity", self.retry_after(route))
+
+    def _owner(self, owner: str) -> _OwnerStats:
+        stats = self.owners.get(owner)
+        if stats is None:
+            stats = self.owners[owner] = _OwnerStats()
+            if len(self.owners) > self.max_owners:
+                self._evict_idle_owner()
+        else:
+            self.owners.move_to_end(owner)
+        return stats
+
+    def _evict_idle_owner(self):
+        # Owners are client-supplied keys: drop the least recently seen one
+        # with nothing queued (its round is re-derived if it comes back)
+        for name, stats in self.owners.items():
+            if stats.queued == 0:
+                del self.owners[name]
+                return
+
+    async def acquire(self, route: str, priority: Priority = Priority.INTERACTIVE,
+                      timeout_s: Optional[float] = -1, owner: Optional[str] = None) -> float:
+        """
+        Wait for a slot
+
+        Args:
+            route: Route name (key of the per-route limits)
+            priority: Admission priority
+            timeout_s: Maximum queue wait; -1 = controller default, None = wait
+                indefinitely (accepted work: never rejected for queue length)
+            owner: Family member the work belongs to (fair-share key)
+
+        Returns:
+            Time spent queued, in seconds
+        """
+        stats = self._route(route)
+        owner_stats = self._owner(owner or "anonymous")
+        if timeout_s == -1:
+            timeout_s = self.queue_timeout_s
+
+        # Waiters still queued are blocked by their route limit (release()
+        # dispatches every grantable one), so a free slot can be taken directly
+        if self._grantable(route):
+            self._grant(stats)
+            owner_stats.admitted += 1
+            return 0.0
+
+        # URGENT work is rare and is never shed for queue length, nor is work
+        # waiting without a deadline: it was accepted after check() (e.g. a
+        # report answered 202) and must not be dropped now
+        if (priority > Priority.URGENT and timeout_s is not None
+                and (len(self._waiters) >= self.max_queue or stats.queued >= stats.max_queue)):
+            stats.rejected += 1
+            self._reject(route)
+
+        turn = self._next_round(owner or "anonymous")
+        waiter = _Waiter(
+            int(priority), turn, next(self._seq), route, owner or "anonymous",
+            asyncio.get_running_loop().create_future(),
+        )
+        self._waiters.append(waiter)
+        stats.queued += 1
+        owner_stats.queued += 1
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter.future), timeout_s)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            if waiter.future.done() and not waiter.future.cancelled():
+                # Granted in the same instant: hand the slot back
+                self.release(route, 0.0)
+            else:
+                waiter.future.cancel()
+                self._waiters.remove(waiter)
+                stats.queued -= 1
+                owner_stats.queued -= 1
+            if isinstance(e, asyncio.CancelledError):
+                raise
+            stats.timed_out += 1
+            owner_stats.timed_out += 1
+            raise AdmissionRejected(503, f"Timed out waiting for a '{route}' slot", self.retry_after(route))
+
+        wait_s = time.monotonic() - waiter.enqueued
+        stats.avg_wait_s = 0.8 * stats.avg_wait_s + 0.2 * wait_s if stats.avg_wait_s else wait_s
+        owner_stats.avg_wait_s = 0.8 * owner_stats.avg_wait_s + 0.2 * wait_s if owner_stats.avg_wait_s else wait_s
+        owner_stats.max_wait_s = max(owner_stats.max_wait_s, wait_s)
+        return wait_s
+
+    def _next_round(self, owner: str) -> int:
+        # Derived from the queue rather than stored per owner, so a waiter
+        # that leaves without a slot does not push its owner's later work back
+        queued = [w.round for w in self._waiters if w.owner == owner]
+        return max(self._round, max(queued) + 1) if queued else self._round
+
+    def _grant(self, stats: _RouteStats):
+        self.in_flight += 1
+        stats.in_flight += 1
+        stats.admitted += 1
+
+    def release(self, route: str, service_s: float):
+        """Return a slot and admit the best grantable waiters"""
+        stats = self._route(route)
+        self.in_flight -= 1
+        stats.in_flight -= 1
+        if service_s:
+            stats.avg_service_s = 0.8 * stats.avg_service_s + 0.2 * service_s if stats.avg_service_s else service_s
+        self._dispatch()
+
+    def _dispatch(self):
+        # The queue is small (bounded), a sorted scan is cheaper than a heap per route
+        for waiter in sorted(self._waiters):
+            if self.in_flight >= self.max_concurrent:
+                break
+            if not self._grantable(waiter.route):
+                continue
+            self._waiters.remove(waiter)
+            stats = self._route(waiter.route)
+            stats.queued -= 1
+            owner_stats = self._owner(waiter.owner)
+            owner_stats.queued -= 1
+            owner_stats.admitted += 1
+            self._round = max(self._round, waiter.round)
+            self._grant(stats)
+            waiter.future.set_result(None)
+
+    @asynccontextmanager
+    async def slot(self, route: str, priority: Priority = Priority.INTERACTIVE,
+                   timeout_s: Optional[float] = -1, owner: Optional[str] = None):
+        """Hold a slot for the duration of the block"""
+        await self.acquire(route, priority, timeout_s, owner)
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            self.release(route, time.monotonic() - started)
+
+    def stats(self) -> dict:
+        """Counters for monitoring"""
+        return {
+            "max_concurrent": self.max_concurrent,
+            "in_flight": self.in_flight,
+            "queued": len(self._waiters),
+            "max_queue": self.max_queue,
+            "routes": {
+                name: {
+                    "limit": s.limit,
+                    "in_flight": s.in_flight,
+                    "queued": s.queued,
+                    "admitted": s.admitted,
+                    "rejected": s.rejected,
+                    "timed_out": s.timed_out,
+                    "avg_service_ms": round(s.avg_service_s * 1000, 1),
+                    "avg_wait_ms": round(s.avg_wait_s * 1000, 1),
+                }
+                for name, s in self.routes.items()
+            },
+            "owners": {
+                name: {
+                    "queued": s.queued,
+                    "admitted": s.admitted,
+                    "timed_out": s.timed_out,
+                    "avg_wait_ms": round(s.avg_wait_s * 1000, 1),
+                    "max_wait_ms": round(s.max_wait_s * 1000, 1),
+                }
+                for name, s in self.owners.items()
+            },
+        }
+
+
+_admission: Optional[AdmissionController] = None
+
+
+def get_admission() -> AdmissionController:
+    """Shared controller (one per process, like the model it protects)"""
+    global _admission
+    if _admission is None:
+        _admission = AdmissionController(
+            max_concurrent=settings.ADMISSION_MAX_CONCURRENT,
+            max_queue=settings.ADMISSION_MAX_QUEUE,
+            queue_timeout_s=settings.ADMISSION_QUEUE_TIMEOUT_S,
+            route_limits=settings.ADMISSION_ROUTE_LIMITS,
+            route_queue=settings.ADMISSION_ROUTE_QUEUE,
+            owner_queue=settings.ADMISSION_OWNER_QUEUE,
+        )
+    return _admission
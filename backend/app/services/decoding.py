@@ -0,0 +1,146 @@
+"""
+Decoding Profiles
+Per-stage decoding configuration (greedy / seeded / sampled) and the cache
+keys that make deterministic outputs safe to memoize
+"""
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, asdict
+from typing import Any, Dict, Optional
+
+
+@dataclass(frozen=True)
+class DecodingProfile:
+    """
+    How a pipeline stage decodes
+
+    Modes:
+        greedy: argmax decoding, fully reproducible
+        seeded: sampling from a generator of its own per call, seeded with
+                `seed` (see SeededSampler), reproducible for identical inputs
+                on the same hardware even while other generations run
+        sample: unseeded sampling (legacy behaviour), not cacheable
+    """
+    mode: str = "greedy"
+    temperature: float = 0.2
+    top_p: float = 0.9
+    seed: int = 1234
+
+    @property
+    def deterministic(self) -> bool:
+        return self.mode in ("greedy", "seeded")
+
+    def generate_kwargs(self) -> Dict[str, Any]:
+        """Keyword arguments for model.generate (call once per generation)"""
+        if self.mode == "greedy":
+            return {"do_sample": False}
+        if self.mode == "seeded":
+            from transformers import LogitsProcessorList
+            # Argmax over scores where only the sampled token survives
+            return {
+                "do_sample": False,
+                "logits_processor": LogitsProcessorList(
+                    [SeededSampler(self.temperature, self.top_p, self.seed)]
+                ),
+            }
+        return {"do_sample": True, "temperature": self.temperature, "top_p": self.top_p}
+
+    def describe(self) -> Dict[str, Any]:
+        """Metadata recorded with results"""
+        info = {"mode": self.mode}
+        if self.mode != "greedy":
+            info.update(temperature=self.temperature, top_p=self.top_p)
+        if self.mode == "seeded":
+            info["seed"] = self.seed
+        return info
+
+
+class SeededSampler:
+    """
+    Logits processor that samples the next token itself
+
+    Temperature and top-p sampling drawn from a torch.Generator owned by one
+    generation, so concurrent generations (or anything else using torch's
+    global RNG) cannot shift its draws. Returns scores that are -inf except
+    at the sampled token, for generate() to pick with argmax.
+    """
+
+    def __init__(self, temperature: float, top_p: float, seed: int):
+        self.temperature = temperature
+        self.top_p = top_p
+        self.seed = seed
+        self._generator = None
+
+    def __call__(self, input_ids, scores):
+        import torch
+
+        if self._generator is None:
+            self._generator = torch.Generator(device=scores.device).manual_seed(self.seed)
+        logits = scores.float() / max(self.temperature, 1e-5)
+        sorted_logits, sorted_ids = torch.sort(logits, descending=True, dim=-1)
+        cumulative = sorted_logits.softmax(dim=-1).cumsum(dim=-1)
+        # Drop tokens past top_p, always keeping the most likely one
+        drop = cumulative > self.top_p
+        drop[..., 1:] = drop[..., :-1].clone()
+        drop[..., 0] = False
+        sorted_logits = sorted_logits.masked_fill(drop, float("-inf"))
+        choice = torch.multinomial(sorted_logits.softmax(dim=-1), 1, generator=self._generator)
+        token = sorted_ids.gather(-1, choice)
+        return torch.full_like(scores, float("-inf")).scatter(-1, token, 0.0)
+
+
+def parse_profile(spec: str, temperature: float = 0.2, top_p: float = 0.9) -> DecodingProfile:
+    """
+    Parse a profile spec from settings: "greedy", "sample" or "seeded[:<seed>]"
+    """
+    mode, _, arg = spec.strip().lower().partition(":")
+    if mode not in ("greedy", "seeded", "sample"):
+        raise ValueError(f"Unknown decoding mode: {spec!r}")
+    seed = int(arg) if mode == "seeded" and arg else 1234
+    return DecodingProfile(mode=mode, temperature=temperature, top_p=top_p, seed=seed)
+
+
+def response_cache_key(stage: str, model_id: str, profile: DecodingProfile,
+                       max_new_tokens: int, *inputs: Any) -> str:
+    """
+    Stable key for a generation: identical stage, model, decoding profile,
+    token budget and inputs give the identical key
+    """
+    payload = json.dumps(
+        [stage, model_id, asdict(profile), max_new_tokens, list(inputs)],
+        sort_keys=True, ensure_ascii=False, default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """Thread-safe LRU of generation results for deterministic profiles"""
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._data: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+            return None
+
+    def put(self, key: str, value: Any):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"entries": len(self._data), "hits": self.hits, "misses": self.misses}
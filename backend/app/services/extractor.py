@@ -1,15 +1,28 @@
 import json
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
 import torch
-from jsonschema import validate, ValidationError
 from transformers import AutoTokenizer, AutoModelForCausalLM
 
-from utils.json_utils import extract_json_block, loads_json
+from utils.json_utils import extract_json_block, extract_json_prefix, loads_json, repair_json
+from utils.highlight import EvidenceMatcher
+from backend.app.services.schema_validator import CompiledSchema, compile_schema
+from backend.app.services.decoding import DecodingProfile
+from backend.app.services.generation_budget import GenerationBudget
+
+# Token cap of a full extraction, and of the repair stage, which only emits
+# the corrected top-level keys
+EXTRACT_MAX_NEW_TOKENS = 900
+REPAIR_MAX_NEW_TOKENS = 200
 
 class MedGemmaExtractor:
-    def __init__(self, model_id_or_path: str, schema: Dict[str, Any]):
+    def __init__(self, model_id_or_path: str, schema: Dict[str, Any],
+                 validator: Optional[CompiledSchema] = None,
+                 decoding: Optional[DecodingProfile] = None):
         self.schema = schema
+        self.decoding = decoding or DecodingProfile(mode="sample", temperature=0.2)
+        self.validator = validator or compile_schema(schema)
+        self.last_errors: List[str] = []
         self.tokenizer = AutoTokenizer.from_pretrained(model_id_or_path, use_fast=True)
         # Use AutoModelForCausalLM (Gemma3 is supported)
         device = "cuda" if torch.cuda.is_available() else "cpu"
@@ -45,7 +58,34 @@ Radiology report:
 >>>
 """.strip()
 
-    def _generate(self, prompt: str) -> str:
+    def _repair_prompt(self, report_text: str, data: Dict[str, Any], errors: List[str]) -> str:
+        # Ask only for the broken top-level keys, not for the whole document again
+        props = self.schema.get("properties", {})
+        required = ", ".join(
+            f'{k} ({props.get(k, {}).get("type", "any")})' for k in self.schema.get("required", [])
+        )
+        error_lines = "\n".join(f"- {e}" for e in errors[:10])
+        return f"""
+You fix radiology extraction JSON that failed schema validation.
+
+Validation errors:
+{error_lines}
+
+Required top-level keys: {required}
+
+Return ONLY a JSON object containing the corrected or missing top-level keys.
+Do not repeat keys that are already valid. Use only information from the report.
+
+Current JSON keys: {", ".join(sorted(data.keys())) or "(none)"}
+
+Radiology report:
+<<<
+{report_text}
+>>>
+""".strip()
+
+    def _generate(self, prompt: str, max_new_tokens: Optional[int] = None,
+                  completion_only: bool = False, budget: Optional[GenerationBudget] = None) -> str:
         # Apply chat template for Gemma3
         messages = [{"role": "user", "content": prompt}]
         formatted_prompt = self.tokenizer.apply_chat_template(
@@ -54,63 +94,169 @@ Radiology report:
         inputs = self.tokenizer(formatted_prompt, return_tensors="pt")
         inputs = {k: v.to(self.model.device) for k, v in inputs.items()}
 
+        extra = {}
+        if budget is not None:
+            max_new_tokens = budget.cap(max_new_tokens)
+            extra["stopping_criteria"] = budget.stopping_criteria()
+        elif max_new_tokens is None:
+            max_new_tokens = EXTRACT_MAX_NEW_TOKENS
+
         with torch.no_grad():
             out = self.model.generate(
                 **inputs,
-                max_new_tokens=900,
-                do_sample=True,
-                temperature=0.2,
-                top_p=0.9,
+                max_new_tokens=max_new_tokens,
+                **self.decoding.generate_kwargs(),
+                **extra,
             )
-        return self.tokenizer.decode(out[0], skip_special_tokens=True)
+        tokens = out[0]
+        if completion_only:
+            tokens = tokens[inputs["input_ids"].shape[1]:]
+        return self.tokenizer.decode(tokens, skip_special_tokens=True)
 
     def _validate_and_fix_evidence(self, extracted: Dict[str, Any], report_text: str) -> Dict[str, Any]:
-        # evidence must appear in report_text; otherwise mark uncertain / remove evidence
-        def in_report(ev: str) -> bool:
-            return bool(ev) and (ev in report_text)
+        # evidence must appear in report_text; otherwise mark uncertain / remove evidence.
+        # All evidence strings are located in one multi-pattern scan and the
+        # offsets are kept ("evidence_span") so highlighting needs no search later.
+        entities = extracted.get("entities", [])
+        flags = extracted.get("critical_flags", [])
+        matcher = EvidenceMatcher(
+            item.get("evidence", "") for item in (*entities, *flags)
+        )
+        offsets = matcher.first_occurrences(report_text)
 
-        for e in extracted.get("entities", []):
-            ev = e.get("evidence", "")
-            if not in_report(ev):
+        for e in entities:
+            span = offsets.get(e.get("evidence", ""))
+            if span is None:
                 # keep safe: downgrade certainty if evidence missing
                 e["certainty"] = "uncertain"
                 e["evidence"] = ""
+            e["evidence_span"] = list(span) if span else None
 
-        for f in extracted.get("critical_flags", []):
-            ev = f.get("evidence", "")
-            if not in_report(ev):
+        for f in flags:
+            span = offsets.get(f.get("evidence", ""))
+            if span is None:
                 f["status"] = "uncertain"
                 f["evidence"] = ""
+            f["evidence_span"] = list(span) if span else None
 
         return extracted
 
-    def extract(self, report_text: str) -> Tuple[Optional[Dict[str, Any]], str]:
+    def _fill_required(self, data: Dict[str, Any], repairs: List[str]):
+        # Missing required keys the model put under "sections" (the prompt
+        # asks for sections.findings / sections.impression) are lifted up.
+        # Nothing is invented: keys still missing fail validation, so the
+        # model repair runs (or the extraction fails)
+        sections = data.get("sections") if isinstance(data.get("sections"), dict) else {}
+        for key in self.schema.get("required", []):
+            if key not in data and key in sections:
+                data[key] = sections[key]
+                repairs.append(f"{key} copied from sections")
+
+    def _parse_and_validate(self, block: str, repairs: List[str]) -> Tuple[Optional[Dict[str, Any]], List[str]]:
+        """
+        Parse a JSON block with deterministic repairs, then validate it
+
+        Returns: (data_or_none, validation_errors)
+        """
+        try:
+            data = loads_json(block)
+        except json.JSONDecodeError:
+            try:
+                data = loads_json(repair_json(block))
+                repairs.append("json syntax repaired")
+            except json.JSONDecodeError as e:
+                return None, [f"Invalid JSON: {e}"]
+
+        if not isinstance(data, dict):
+            return None, ["Top-level JSON value is not an object"]
+
+        self._fill_required(data, repairs)
+        # validate schema (precompiled validator, all errors in one pass)
+        return data, [e.message for e in self.validator.errors(data)]
+
+    def _repair_with_model(
+        self, report_text: str, data: Dict[str, Any], errors: List[str], repairs: List[str],
+        budget: Optional[GenerationBudget] = None
+    ) -> Tuple[Dict[str, Any], List[str]]:
+        """Short repair generation: ask for a patch of the failing keys and merge it"""
+        raw = self._generate(
+            self._repair_prompt(report_text, data, errors),
+            max_new_tokens=REPAIR_MAX_NEW_TOKENS,
+            completion_only=True,
+            budget=budget,
+        )
+        block = extract_json_block(raw) or extract_json_prefix(raw)
+        if not block:
+            return data, errors
+        try:
+            patch = loads_json(repair_json(block))
+        except json.JSONDecodeError:
+            return data, errors
+        if not isinstance(patch, dict):
+            return data, errors
+
+        patched = {**data, **patch}
+        patched_errors = [e.message for e in self.validator.errors(patched)]
+        if patched_errors:
+            return data, patched_errors
+        repairs.append("schema errors repaired by model: " + ", ".join(sorted(patch.keys())))
+        return patched, []
+
+    def extract(self, report_text: str,
+                budget: Optional[GenerationBudget] = None) -> Tuple[Optional[Dict[str, Any]], str]:
         """
         Returns: (json_or_none, raw_model_text)
-        Includes one retry if schema validation fails.
+
+        On failure the output is repaired instead of regenerated: first with
+        deterministic fixes (syntax, required keys found under "sections"),
+        then with a short model call that returns only the corrected keys. A full regeneration
+        only happens when the output contains no usable JSON at all.
+
+        All generate calls share one budget; once it is exhausted no further
+        repair or regeneration is attempted.
         """
         prompt = self._prompt(report_text)
+        raw = ""
 
         for attempt in (1, 2):
-            raw = self._generate(prompt)
-            block = extract_json_block(raw)
+            if attempt > 1 and budget is not None and budget.exhausted:
+                break
+            raw = self._generate(prompt, budget=budget)
+            block = extract_json_block(raw) or extract_json_prefix(raw)
             if not block:
+                self.last_errors = ["No JSON object in model output"]
                 continue
 
-            try:
-                data = loads_json(block)
-                # validate schema
-                validate(instance=data, schema=self.schema)
-                data = self._validate_and_fix_evidence(data, report_text)
-                # update quality_checks
-                qc = data.get("quality_checks", {})
-                qc["json_valid"] = True
-                qc.setdefault("missing_sections", [])
-                qc.setdefault("notes", "")
-                data["quality_checks"] = qc
-                return data, raw
-            except (json.JSONDecodeError, ValidationError):
-                # retry once
+            repairs: List[str] = []
+            data, errors = self._parse_and_validate(block, repairs)
+            if data is None:
+                # unparseable even after repair: regenerate once
+                self.last_errors = errors
                 continue
 
+            if errors and not (budget is not None and budget.exhausted):
+                data, errors = self._repair_with_model(report_text, data, errors, repairs, budget)
+            if errors:
+                self.last_errors = errors
+                break
+
+            self.last_errors = []
+            data = self._validate_and_fix_evidence(data, report_text)
+            # update quality_checks
+            qc = data.get("quality_checks", {})
+            if not isinstance(qc, dict):
+                qc = {}
+            # Output that needed syntax repair (e.g. cut off and closed early)
+            # was not valid JSON as generated, even if it validates now
+            qc["json_valid"] = "json syntax repaired" not in repairs
+            qc.setdefault("missing_sections", [])
+            qc.setdefault("notes", "")
+            if repairs:
+                qc["repairs"] = repairs
+            qc["decoding"] = self.decoding.describe()
+            if budget is not None and budget.truncated:
+                qc["notes"] = (qc["notes"] + " " if qc["notes"] else "") + f"Generation truncated ({budget.stop_reason})."
+            data["quality_checks"] = qc
+            return data, raw
+
         return None, raw
@@ -0,0 +1,142 @@
+"""
+Generation Budgets
+Token and wall-clock limits per pipeline stage and request, enforced inside
+the generation loop through stopping criteria
+"""
+import asyncio
+import threading
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Optional
+
+from fastapi import Request
+from fastapi.concurrency import run_in_threadpool
+
+# How often a waiting request checks whether its client went away
+DISCONNECT_POLL_S = 0.5
+
+
+@dataclass
+class GenerationBudget:
+    """
+    Budget of one request: a token cap, an optional deadline (seconds from
+    creation) and a cancellation flag that the generation loop polls
+    """
+    max_new_tokens: int
+    timeout_s: Optional[float] = None
+    started: float = field(default_factory=time.monotonic)
+    stop_reason: Optional[str] = None
+    _cancelled: threading.Event = field(default_factory=threading.Event, repr=False)
+
+    @property
+    def truncated(self) -> bool:
+        """True when generation was cut short by the deadline or a cancel"""
+        return self.stop_reason is not None
+
+    @property
+    def exhausted(self) -> bool:
+        """True when no further generation should be started"""
+        return self.truncated or self.remaining_s() == 0
+
+    def remaining_s(self) -> Optional[float]:
+        """Seconds left before the deadline (None = no deadline)"""
+        if self.timeout_s is None:
+            return None
+        return max(0.0, self.timeout_s - (time.monotonic() - self.started))
+
+    def cap(self, max_new_tokens: Optional[int] = None) -> int:
+        """Token cap for one generate call, never above the request budget"""
+        if max_new_tokens is None:
+            return self.max_new_tokens
+        return min(max_new_tokens, self.max_new_tokens)
+
+    def cancel(self):
+        """Stop generation at the next token"""
+        self._cancelled.set()
+
+    def should_stop(self) -> bool:
+        """Polled once per generated token"""
+        if self._cancelled.is_set():
+            self.stop_reason = self.stop_reason or "cancelled"
+            return True
+        if self.timeout_s is not None and time.monotonic() - self.started >= self.timeout_s:
+            self.stop_reason = self.stop_reason or "deadline"
+            return True
+        return False
+
+    def stopping_criteria(self):
+        """transformers StoppingCriteriaList enforcing this budget"""
+        from transformers import StoppingCriteriaList
+        return StoppingCriteriaList([_budget_criteria_class()(self)])
+
+    def describe(self) -> Dict[str, Any]:
+        """Metadata recorded with results"""
+        return {
+            "max_new_tokens": self.max_new_tokens,
+            "timeout_s": self.timeout_s,
+            "elapsed_s": round(time.monotonic() - self.started, 3),
+            "truncated": self.truncated,
+            "stop_reason": self.stop_reason,
+        }
+
+
+_criteria_class = None
+
+
+def _budget_criteria_class():
+    # Built lazily so importing this module does not import transformers
+    global _criteria_class
+    if _criteria_class is None:
+        from transformers import StoppingCriteria
+
+        class BudgetStoppingCriteria(StoppingCriteria):
+            def __init__(self, budget: GenerationBudget):
+                self.budget = budget
+
+            def __call__(self, input_ids, scores, **kwargs) -> bool:
+                return self.budget.should_stop()
+
+        _criteria_class = BudgetStoppingCriteria
+    return _criteria_class
+
+
+async def _cancel_when_disconnected(request: Request, budget: GenerationBudget):
+    while not budget.truncated:
+        if await request.is_disconnected():
+            print(f"🔌 Client disconnected from {request.url.path}, cancelling generation")
+            budget.cancel()
+            return
+        await asyncio.sleep(DISCONNECT_POLL_S)
+
+
+@asynccontextmanager
+async def cancel_on_disconnect(request: Optional[Request], budget: GenerationBudget):
+    """
+    Cancel the budget if the client disconnects while the block runs
+
+    Starlette does not cancel non-streaming handlers when the client goes
+    away, so the request's receive channel is polled instead.
+    """
+    watcher = asyncio.create_task(_cancel_when_disconnected(request, budget)) if request is not None else None
+    try:
+        yield
+    finally:
+        if watcher is not None:
+            watcher.cancel()
+
+
+async def run_with_budget(budget: GenerationBudget, fn: Callable, *args,
+                          request: Optional[Request] = None, **kwargs):
+    """
+    Run a blocking generation in the threadpool; the budget is cancelled
+    (the worker thread stops at the next token instead of running to the
+    end) if the awaiting task is cancelled or, given `request`, its client
+    disconnects
+    """
+    try:
+        async with cancel_on_disconnect(request, budget):
+            return await run_in_threadpool(fn, *args, **kwargs)
+    except asyncio.CancelledError:
+        budget.cancel()
+        raise
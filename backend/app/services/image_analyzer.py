@@ -7,7 +7,10 @@ from transformers import pipeline
 from PIL import Image
 from io import BytesIO
 import base64
-from typing import Union
+from typing import Iterator, List, Optional, Sequence, Tuple, Union
+
+from backend.app.services.decoding import DecodingProfile
+from backend.app.services.generation_budget import GenerationBudget
 
 
 class MedGemmaImageAnalyzer:
@@ -16,13 +19,15 @@ class MedGemmaImageAnalyzer:
     Supports image upload and analysis with text prompts
     """
 
-    def __init__(self, model_id_or_path: str):
+    def __init__(self, model_id_or_path: str, decoding: Optional[DecodingProfile] = None):
         """
         Initialize the image analyzer
 
         Args:
             model_id_or_path: Path to the MedGemma model
+            decoding: Decoding profile (greedy by default)
         """
+        self.decoding = decoding or DecodingProfile(mode="greedy")
         self.device = "cuda" if torch.cuda.is_available() else "cpu"
         self.model_path = model_id_or_path
         self._pipe = None
@@ -46,7 +51,8 @@ class MedGemmaImageAnalyzer:
         self,
         image: Image.Image,
         prompt: str = "Describe this medical image in detail",
-        max_new_tokens: int = 2000
+        max_new_tokens: int = 2000,
+        budget: Optional[GenerationBudget] = None
     ) -> str:
         """
         Analyze a medical image with a text prompt
@@ -55,6 +61,7 @@ class MedGemmaImageAnalyzer:
             image: PIL Image object
             prompt: Text prompt for analysis
             max_new_tokens: Maximum tokens in response
+            budget: Optional token/deadline budget enforced while generating
 
         Returns:
             Analysis result text
@@ -75,12 +82,111 @@ class MedGemmaImageAnalyzer:
 
         # Run inference
         try:
-            output = self._pipe(text=messages, max_new_tokens=max_new_tokens)
+            output = self._pipe(
+                text=messages,
+                **self._generation_args(max_new_tokens, budget),
+            )
             result = output[0]["generated_text"][-1]["content"]
             return result
         except Exception as e:
             raise RuntimeError(f"Image analysis failed: {str(e)}")
 
+    def _generation_args(self, max_new_tokens: int, budget: Optional[GenerationBudget]) -> dict:
+        """Pipeline arguments for the decoding profile and budget"""
+        generate_kwargs = self.decoding.generate_kwargs()
+        if budget is not None:
+            max_new_tokens = budget.cap(max_new_tokens)
+            generate_kwargs["stopping_criteria"] = budget.stopping_criteria()
+        return {"max_new_tokens": max_new_tokens, "generate_kwargs": generate_kwargs}
+
+    @staticmethod
+    def _messages(images: Sequence[Image.Image], prompt: str) -> list:
+        """Chat messages for one prompt over one or more images"""
+        content = [{"type": "image", "image": image} for image in images]
+        content.append({"type": "text", "text": prompt})
+        return [{"role": "user", "content": content}]
+
+    def analyze_batch(
+        self,
+        images: Sequence[Image.Image],
+        prompts: Union[str, Sequence[str]],
+        max_new_tokens: int = 2000,
+        batch_size: int = 2,
+        budget: Optional[GenerationBudget] = None
+    ) -> Iterator[Tuple[int, str]]:
+        """
+        Analyze independent images, batch_size at a time
+
+        Args:
+            images: PIL Image objects
+            prompts: One shared prompt or one prompt per image
+            max_new_tokens: Maximum tokens per response
+            batch_size: Images per pipeline call
+            budget: Optional budget shared by all batches
+
+        Yields:
+            (index, analysis) as each batch finishes
+        """
+        if not self._pipe:
+            raise RuntimeError("Image analyzer not loaded")
+
+        if isinstance(prompts, str):
+            prompts = [prompts] * len(images)
+        if len(prompts) != len(images):
+            raise ValueError("Need one prompt per image")
+
+        for start in range(0, len(images), batch_size):
+            if budget is not None and budget.exhausted:
+                raise RuntimeError(f"Generation budget exhausted ({budget.stop_reason or 'deadline'})")
+            batch = [
+                self._messages([image], prompt)
+                for image, prompt in zip(images[start:start + batch_size], prompts[start:start + batch_size])
+            ]
+            try:
+                outputs = self._pipe(
+                    text=batch,
+                    batch_size=len(batch),
+                    **self._generation_args(max_new_tokens, budget),
+                )
+            except Exception as e:
+                raise RuntimeError(f"Image analysis failed: {str(e)}")
+
+            for offset, output in enumerate(outputs):
+                # Batched calls return one list of generations per input
+                generation = output[0] if isinstance(output, list) else output
+                yield start + offset, generation["generated_text"][-1]["content"]
+
+    def analyze_study(
+        self,
+        images: Sequence[Image.Image],
+        prompt: str = "Describe these images of one imaging study",
+        max_new_tokens: int = 2000,
+        budget: Optional[GenerationBudget] = None
+    ) -> str:
+        """
+        Analyze several images of one study together with a shared prompt
+
+        Args:
+            images: PIL Image objects (e.g. images from several series)
+            prompt: Shared text prompt
+            max_new_tokens: Maximum tokens in response
+            budget: Optional token/deadline budget
+
+        Returns:
+            One analysis covering all images
+        """
+        if not self._pipe:
+            raise RuntimeError("Image analyzer not loaded")
+
+        try:
+            output = self._pipe(
+                text=self._messages(images, prompt),
+                **self._generation_args(max_new_tokens, budget),
+            )
+            return output[0]["generated_text"][-1]["content"]
+        except Exception as e:
+            raise RuntimeError(f"Image analysis failed: {str(e)}")
+
     def is_loaded(self) -> bool:
         """Check if pipeline is loaded"""
         return self._pipe is not None
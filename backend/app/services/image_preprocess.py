@@ -0,0 +1,116 @@
+"""
+Image Preprocessing Service
+Decodes uploads at reduced size, resizes them to the model's native input
+resolution and caches the result by content hash. Decoding runs on a small
+worker pool so large uploads do not block the event loop.
+"""
+import asyncio
+import hashlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from io import BytesIO
+from typing import BinaryIO, Callable, Optional
+
+from PIL import Image
+
+from app.core.config import settings
+
+
+class ImagePreprocessor:
+    """
+    Downscaling decoder with an LRU cache of preprocessed images
+    """
+
+    def __init__(self, target_size: int = 896, cache_size: int = 32, workers: int = 2):
+        self.target_size = target_size
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[str, Image.Image]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="image-preprocess")
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def content_hash(data: bytes) -> str:
+        """Cache key of an upload"""
+        return hashlib.sha256(data).hexdigest()
+
+    def _decode(self, source: BinaryIO) -> Image.Image:
+        size = (self.target_size, self.target_size)
+        try:
+            image = Image.open(source)
+            # JPEG: let libjpeg decode straight at a reduced scale (>= target)
+            image.draft("RGB", size)
+            image = image.convert("RGB")
+        except Exception as e:
+            raise ValueError(f"Invalid image file: {e}")
+
+        if image.size != size:
+            # The processor squashes to a square input anyway; do it once here
+            image = image.resize(size, Image.BILINEAR, reducing_gap=2.0)
+        return image
+
+    def preprocess_bytes(self, data: bytes, digest: Optional[str] = None) -> Image.Image:
+        """
+        Decode and resize an image, served from cache when seen before
+
+        Raises:
+            ValueError: if the data is not a decodable image
+        """
+        key = digest or self.content_hash(data)
+        return self._cached(key, lambda: self._decode(BytesIO(data)))
+
+    def preprocess_file(self, fileobj: BinaryIO, digest: str) -> Image.Image:
+        """
+        Same as preprocess_bytes for a (spooled) file object, read in place
+        without copying it into memory; digest is the content hash
+        """
+        def load():
+            fileobj.seek(0)
+            return self._decode(fileobj)
+        return self._cached(digest, load)
+
+    def _cached(self, key: str, load: Callable[[], Image.Image]) -> Image.Image:
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return cached
+            self.misses += 1
+
+        image = load()
+
+        with self._lock:
+            self._cache[key] = image
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return image
+
+    async def preprocess(self, data: bytes, digest: Optional[str] = None) -> Image.Image:
+        """preprocess_bytes on the worker pool"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._pool, self.preprocess_bytes, data, digest)
+
+    async def preprocess_upload(self, fileobj: BinaryIO, digest: str) -> Image.Image:
+        """preprocess_file on the worker pool"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._pool, self.preprocess_file, fileobj, digest)
+
+    def stats(self) -> dict:
+        """Cache counters"""
+        with self._lock:
+            return {"entries": len(self._cache), "hits": self.hits, "misses": self.misses}
+
+
+@lru_cache()
+def get_image_preprocessor() -> ImagePreprocessor:
+    """Get the shared preprocessor instance"""
+    return ImagePreprocessor(
+        target_size=settings.IMAGE_INPUT_SIZE,
+        cache_size=settings.IMAGE_CACHE_SIZE,
+        workers=settings.IMAGE_PREPROCESS_WORKERS,
+    )
@@ -1,24 +1,48 @@
 """
 Model Service - Singleton pattern for managing AI models
-Pre-loads models on startup and serves requests
+Loads models in a background thread at startup (the API serves health
+checks meanwhile) and serves requests once they are ready
 """
 import sys
 import os
+import copy
+import threading
+import time
+import traceback
 from pathlib import Path
+from typing import Optional
+
+from fastapi import HTTPException
+from fastapi.concurrency import run_in_threadpool
 
 # Add parent directory to path to import existing services
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
-from backend.app.services.extractor import MedGemmaExtractor
-from backend.app.services.synthesizer import MedGemmaSynthesizer
-from backend.app.services.image_analyzer import MedGemmaImageAnalyzer
-import json
+from backend.app.services.decoding import ResponseCache, parse_profile, response_cache_key
+from backend.app.services.generation_budget import GenerationBudget
+from app.core import startup_profile
+from app.core.config import settings
+
+
+class ModelsNotReady(HTTPException):
+    """503 while models are loading (or failed to load); carries Retry-After"""
+
+    def __init__(self, state: str, retry_after: int = 10):
+        detail = ("AI models failed to load" if state == "failed"
+                  else "AI models are still loading. Please try again shortly.")
+        super().__init__(status_code=503, detail=detail, headers={"Retry-After": str(retry_after)})
+        self.state = state
 
 
 class ModelService:
     """
     Singleton service managing AI models.
-    Models are loaded once at startup and reused for all requests.
+    Creating the instance is cheap; models (and torch/transformers) are
+    loaded once by load(), normally in the background thread started by
+    start_loading(), and reused for all requests.
+
+    States: "not_loaded" -> "loading" -> "warming" -> "ready" | "failed"
+    (warming: dummy prompts run through every stage, see model_warmup)
     """
 
     _instance = None
@@ -34,9 +58,27 @@ class ModelService:
         self._synthesizer = None
         self._image_analyzer = None
         self._schema = None
-
-        # Load models immediately
-        self._load_models()
+        self._validator = None
+
+        # Decoding profile per stage; deterministic stages are memoized
+        self.decoding = {
+            "extract": parse_profile(settings.DECODING_EXTRACT, temperature=0.2),
+            "synthesize": parse_profile(settings.DECODING_SYNTHESIZE, temperature=0.3),
+            "chat": parse_profile(settings.DECODING_CHAT, temperature=0.3),
+            "image": parse_profile(settings.DECODING_IMAGE, temperature=0.3),
+        }
+        self._response_cache = ResponseCache(settings.RESPONSE_CACHE_SIZE)
+
+        self.state = "not_loaded"
+        self.load_error: Optional[str] = None
+        self.load_time_s: Optional[float] = None
+        self.warmup: Optional[dict] = None
+        self.compiled = 0
+        self._load_lock = threading.Lock()      # held for the whole load
+        self._loader_lock = threading.Lock()    # only guards starting the loader thread
+        self._ready = threading.Event()
+        self._settled = threading.Event()       # set once ready or failed
+        self._loader: Optional[threading.Thread] = None
 
     @classmethod
     def get_instance(cls):
@@ -45,29 +87,185 @@ class ModelService:
             cls._instance = cls()
         return cls._instance
 
+    def load(self) -> bool:
+        """
+        Load the models (idempotent; concurrent callers wait for one load)
+
+        Returns:
+            True if the models are ready
+        """
+        with self._load_lock:
+            if self.state in ("ready", "failed"):
+                return self.state == "ready"
+            self.state = "loading"
+            start = time.perf_counter()
+            try:
+                self._load_models()
+            except Exception as e:
+                self.state = "failed"
+                self.load_error = str(e)
+                print(f"❌ Model loading failed: {e}")
+                traceback.print_exc()
+                self._settled.set()
+                return False
+            self.load_time_s = time.perf_counter() - start
+            try:
+                if settings.MODEL_WARMUP:
+                    self._warm_up()
+            finally:
+                # Warmup never fails loading: waiters must always be released
+                self.state = "ready"
+                self._ready.set()
+                self._settled.set()
+            startup_profile.mark("models_ready")
+            print(f"✅ Models loaded in {self.load_time_s:.1f}s")
+            return True
+
+    def start_loading(self) -> threading.Thread:
+        """Load the models in a background thread (once); never blocks on the load"""
+        with self._loader_lock:
+            if self._loader is None:
+                self._loader = threading.Thread(target=self.load, name="model-loader", daemon=True)
+                self._loader.start()
+            return self._loader
+
+    async def wait_ready(self, timeout_s: Optional[float] = None) -> bool:
+        """
+        Wait (without blocking the event loop) until the models are loaded
+
+        Returns:
+            True if ready, False if loading failed or the timeout expired
+        """
+        if self._ready.is_set():
+            return True
+        self.start_loading()
+        await run_in_threadpool(self._settled.wait, timeout_s)
+        return self._ready.is_set()
+
+    def status(self) -> dict:
+        """Loading state, for readiness checks"""
+        return {
+            "state": self.state,
+            "ready": self.state == "ready",
+            "load_time_s": round(self.load_time_s, 3) if self.load_time_s is not None else None,
+            "error": self.load_error,
+            "compiled_decoders": self.compiled,
+            "warmup": self.warmup,
+        }
+
+    def _warm_up(self):
+        """Run dummy prompts through every stage before reporting ready"""
+        self.state = "warming"
+        print("  🔥 Warming up models...")
+        start = time.perf_counter()
+        try:
+            from backend.app.services.model_warmup import warmup
+
+            self.warmup = warmup(self, settings.MODEL_WARMUP_ROUNDS, settings.MODEL_WARMUP_MAX_NEW_TOKENS)
+        except Exception as e:
+            # Per-stage errors are caught by warmup(); this is anything around them
+            self.warmup = {"time_s": round(time.perf_counter() - start, 3), "rounds": [], "error": str(e)}
+            print(f"  ⚠️ Warmup failed, serving without it: {e}")
+            traceback.print_exc()
+            return
+        print(f"  🔥 Warmup done in {self.warmup['time_s']:.1f}s: {self.warmup['rounds']}")
+
     def _load_models(self):
-        """Load AI models (called during startup)"""
+        """Load AI models (torch/transformers are first imported here)"""
+        if settings.MODEL_COMPILE:
+            from backend.app.services.model_warmup import configure_compile_cache
+            configure_compile_cache()   # before torch is imported
+
+        from backend.app.services.extractor import MedGemmaExtractor
+        from backend.app.services.synthesizer import MedGemmaSynthesizer
+        from backend.app.services.image_analyzer import MedGemmaImageAnalyzer
+
         print(f"  📦 Loading extractor: {self.model_id}")
         self._schema = self._load_schema()
-        self._extractor = MedGemmaExtractor(self.model_id, self._schema)
+        self._extractor = MedGemmaExtractor(
+            self.model_id, self._schema,
+            validator=self._validator,
+            decoding=self.decoding["extract"],
+        )
 
         print(f"  📦 Loading synthesizer: {self.model_id}")
-        self._synthesizer = MedGemmaSynthesizer(self.model_id)
+        self._synthesizer = MedGemmaSynthesizer(self.model_id, decoding=self.decoding["synthesize"])
 
         print(f"  📦 Loading image analyzer: {self.model_id}")
-        self._image_analyzer = MedGemmaImageAnalyzer(self.model_id)
+        self._image_analyzer = MedGemmaImageAnalyzer(self.model_id, decoding=self.decoding["image"])
+
+        if settings.MODEL_COMPILE:
+            from backend.app.services.model_warmup import compile_decoders
+            self.compiled = compile_decoders(
+                [self._extractor.model, self._synthesizer.model], settings.MODEL_COMPILE_MODE
+            )
+            print(f"  ⚙️ Compiled {self.compiled} decoders (mode={settings.MODEL_COMPILE_MODE}); "
+                  "first generations compile or load cached graphs")
 
     def _load_schema(self):
-        """Load the radiology schema"""
-        # Go up from backend/app/services/ to project root, then into schemas/
-        project_root = Path(__file__).parent.parent.parent.parent
-        schema_path = project_root / "schemas" / "radiology_schema.json"
+        """Load the radiology schema and compile its validator once"""
+        from backend.app.services.schema_validator import compile_schema, load_schema
 
-        if not schema_path.exists():
-            raise FileNotFoundError(f"Schema file not found: {schema_path}")
+        # schemas/radiology_schema.json, or radiology_schema.v<N>.json when pinned
+        schema = load_schema("radiology_schema", settings.SCHEMA_VERSION)
+        self._validator = compile_schema(schema)
+        return schema
 
-        with open(schema_path, "r") as f:
-            return json.load(f)
+    def decoding_metadata(self, stage: str) -> dict:
+        """Decoding profile of a stage, as recorded in result metadata"""
+        return self.decoding[stage].describe()
+
+    def budget(self, stage: str, max_new_tokens: int = None, timeout_s: float = None) -> GenerationBudget:
+        """
+        Create the generation budget of one request
+
+        Args:
+            stage: "extract", "synthesize", "chat" or "image"
+            max_new_tokens: Request override of the stage's token cap
+            timeout_s: Request override of the stage's deadline
+
+        Returns:
+            A fresh budget; its deadline starts now
+        """
+        default_tokens, default_timeout = {
+            "extract": (settings.EXTRACT_MAX_NEW_TOKENS, settings.EXTRACT_TIMEOUT_S),
+            "synthesize": (settings.SYNTHESIZE_MAX_NEW_TOKENS, settings.SYNTHESIZE_TIMEOUT_S),
+            "chat": (settings.CHAT_MAX_NEW_TOKENS, settings.CHAT_TIMEOUT_S),
+            "image": (settings.IMAGE_MAX_NEW_TOKENS, settings.IMAGE_TIMEOUT_S),
+        }[stage]
+        return GenerationBudget(
+            max_new_tokens=max_new_tokens or default_tokens,
+            timeout_s=timeout_s or default_timeout,
+        )
+
+    def cache_stats(self) -> dict:
+        """Response cache counters"""
+        return self._response_cache.stats()
+
+    def _memoized(self, stage: str, max_new_tokens: int, inputs: tuple, generate, cacheable=None):
+        """
+        Run generate(), memoizing the result when the stage decodes deterministically
+
+        Args:
+            stage: Pipeline stage name (key of self.decoding)
+            max_new_tokens: Token budget (part of the cache key)
+            inputs: Values that fully determine the prompt
+            generate: Zero-argument callable producing the result
+            cacheable: Optional predicate deciding whether a result may be cached
+        """
+        profile = self.decoding[stage]
+        if not profile.deterministic:
+            return generate()
+
+        key = response_cache_key(stage, self.model_id, profile, max_new_tokens, *inputs)
+        cached = self._response_cache.get(key)
+        if cached is not None:
+            return copy.deepcopy(cached)
+
+        result = generate()
+        if cacheable is None or cacheable(result):
+            self._response_cache.put(key, copy.deepcopy(result))
+        return result
 
     def is_loaded(self) -> bool:
         """Check if models are loaded"""
@@ -77,12 +275,20 @@ class ModelService:
             self._image_analyzer is not None
         )
 
-    def extract(self, report_text: str):
+    def require_ready(self):
+        """Raise ModelsNotReady (503) unless the models are loaded"""
+        if self.state != "ready":
+            if self.state == "not_loaded":
+                self.start_loading()
+            raise ModelsNotReady(self.state)
+
+    def extract(self, report_text: str, budget: GenerationBudget = None):
         """
         Extract structured information from report text
 
         Args:
             report_text: The medical report text (already redacted)
+            budget: Generation budget (stage default when omitted)
 
         Returns:
             Tuple of (extracted_dict, raw_output)
@@ -90,15 +296,21 @@ class ModelService:
         if not self._extractor:
             raise RuntimeError("Extractor model not loaded")
 
-        return self._extractor.extract(report_text)
+        budget = budget or self.budget("extract")
+        return self._memoized(
+            "extract", budget.max_new_tokens, (report_text,),
+            lambda: self._extractor.extract(report_text, budget=budget),
+            cacheable=lambda result: result[0] is not None and not budget.truncated,
+        )
 
-    def patient_view(self, extracted: dict, triage: dict) -> str:
+    def patient_view(self, extracted: dict, triage: dict, budget: GenerationBudget = None) -> str:
         """
         Generate patient-friendly explanation
 
         Args:
             extracted: Structured extracted data
             triage: Triage assessment with urgency and rationale
+            budget: Generation budget (stage default when omitted)
 
         Returns:
             Patient-friendly explanation text
@@ -106,15 +318,21 @@ class ModelService:
         if not self._synthesizer:
             raise RuntimeError("Synthesizer model not loaded")
 
-        return self._synthesizer.patient_view(extracted, triage)
+        budget = budget or self.budget("synthesize")
+        return self._memoized(
+            "synthesize", budget.max_new_tokens, ("patient_view", extracted, triage),
+            lambda: self._synthesizer.patient_view(extracted, triage, budget=budget),
+            cacheable=lambda result: not budget.truncated,
+        )
 
-    def family_view(self, extracted: dict, triage: dict) -> str:
+    def family_view(self, extracted: dict, triage: dict, budget: GenerationBudget = None) -> str:
         """
         Generate family-focused explanation
 
         Args:
             extracted: Structured extracted data
             triage: Triage assessment with urgency and rationale
+            budget: Generation budget (stage default when omitted)
 
         Returns:
             Family-focused explanation text
@@ -122,15 +340,23 @@ class ModelService:
         if not self._synthesizer:
             raise RuntimeError("Synthesizer model not loaded")
 
-        return self._synthesizer.family_view(extracted, triage)
+        budget = budget or self.budget("synthesize")
+        return self._memoized(
+            "synthesize", budget.max_new_tokens, ("family_view", extracted, triage),
+            lambda: self._synthesizer.family_view(extracted, triage, budget=budget),
+            cacheable=lambda result: not budget.truncated,
+        )
 
-    def analyze_image(self, image: "Image.Image", prompt: str = "Describe this medical image in detail") -> str:
+    def analyze_image(self, image: "Image.Image", prompt: str = "Describe this medical image in detail",
+                      max_new_tokens: int = None, budget: GenerationBudget = None) -> str:
         """
         Analyze a medical image
 
         Args:
             image: PIL Image object
             prompt: Text prompt for analysis
+            max_new_tokens: Maximum tokens in response (stage default when omitted)
+            budget: Generation budget (created from max_new_tokens when omitted)
 
         Returns:
             Analysis result text
@@ -138,18 +364,57 @@ class ModelService:
         if not self._image_analyzer:
             raise RuntimeError("Image analyzer model not loaded")
 
-        return self._image_analyzer.analyze(image, prompt)
+        budget = budget or self.budget("image", max_new_tokens)
+        return self._image_analyzer.analyze(image, prompt, budget.max_new_tokens, budget=budget)
+
+    def analyze_images(self, images: list, prompts, max_new_tokens: int = None, batch_size: int = 2,
+                       budget: GenerationBudget = None):
+        """
+        Analyze independent images in batches
+
+        Args:
+            images: PIL Image objects
+            prompts: Shared prompt or one prompt per image
+            max_new_tokens: Maximum tokens per response
+            batch_size: Images per pipeline call
+            budget: Generation budget shared by all batches
+
+        Yields:
+            (index, analysis) as each batch finishes
+        """
+        if not self._image_analyzer:
+            raise RuntimeError("Image analyzer model not loaded")
+
+        budget = budget or self.budget("image", max_new_tokens)
+        yield from self._image_analyzer.analyze_batch(
+            images, prompts, budget.max_new_tokens, batch_size, budget=budget
+        )
+
+    def analyze_study(self, images: list, prompt: str, max_new_tokens: int = None,
+                      budget: GenerationBudget = None) -> str:
+        """
+        Analyze several images of one study with a shared prompt
+
+        Returns:
+            One analysis covering all images
+        """
+        if not self._image_analyzer:
+            raise RuntimeError("Image analyzer model not loaded")
+
+        budget = budget or self.budget("image", max_new_tokens)
+        return self._image_analyzer.analyze_study(images, prompt, budget.max_new_tokens, budget=budget)
 
     def get_image_analyzer(self):
         """Get the image analyzer instance"""
         return self._image_analyzer
 
-    def _generate_response(self, conversation: list) -> str:
+    def _generate_response(self, conversation: list, budget: GenerationBudget = None) -> str:
         """
         Generate a chat response for AI Doctor consultation
 
         Args:
             conversation: List of message dictionaries with 'role' and 'content'
+            budget: Generation budget (stage default when omitted)
 
         Returns:
             Generated response text
@@ -180,7 +445,14 @@ class ModelService:
                 full_prompt = user_messages[-1] if user_messages else ""
 
             # Use the synthesizer's _gen method which handles tokenization properly
-            response = self._synthesizer._gen(full_prompt, max_new_tokens=1024)
+            budget = budget or self.budget("chat")
+            response = self._memoized(
+                "chat", budget.max_new_tokens, (full_prompt,),
+                lambda: self._synthesizer._gen(
+                    full_prompt, decoding=self.decoding["chat"], budget=budget
+                ),
+                cacheable=lambda result: not budget.truncated,
+            )
 
             # Clean up the response - remove the prompt part if present
             if full_prompt.strip() in response:
@@ -198,3 +470,10 @@ class ModelService:
             import traceback
             traceback.print_exc()
             raise RuntimeError(f"Failed to generate response: {str(e)}")
+
+
+def ready_model_service() -> ModelService:
+    """FastAPI dependency: the model service, or 503 while models load"""
+    service = ModelService.get_instance()
+    service.require_ready()
+    return service
@@ -0,0 +1,130 @@
+"""
+Per-owner Rate Limiting
+Token buckets keyed by family member, so a single owner cannot flood the
+report pipeline or chat. Rejections are 429 with a Retry-After that says
+exactly when the next token is available.
+"""
+import math
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+
+from app.core.config import settings
+from app.services.admission import AdmissionRejected
+
+
+class TokenBucket:
+    """
+    Classic token bucket: `rate` tokens per second, at most `capacity` banked
+    """
+
+    __slots__ = ("rate", "capacity", "tokens", "updated")
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def take(self, n: float = 1.0) -> float:
+        """
+        Take n tokens if available
+
+        Returns:
+            0.0 on success, otherwise seconds until n tokens will be available
+        """
+        self._refill(time.monotonic())
+        if self.tokens >= n:
+            self.tokens -= n
+            return 0.0
+        return (n - self.tokens) / self.rate if self.rate > 0 else math.inf
+
+    def available(self) -> float:
+        """Tokens currently banked"""
+        self._refill(time.monotonic())
+        return self.tokens
+
+
+class OwnerRateLimiter:
+    """
+    One token bucket per owner, with counters
+
+    Usage:
+        limiter = OwnerRateLimiter("report", rate_per_min=6, burst=3)
+        limiter.check("alice")  # raises AdmissionRejected(429) when over the limit
+    """
+
+    def __init__(self, name: str, rate_per_min: float, burst: int, max_owners: int = 1024):
+        self.name = name
+        self.rate = rate_per_min / 60.0
+        self.burst = burst
+        self.max_owners = max_owners
+        self._buckets: "OrderedDict[str, TokenBucket]" = OrderedDict()
+        self._allowed: Dict[str, int] = {}
+        self._limited: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def _bucket(self, owner: str) -> TokenBucket:
+        bucket = self._buckets.get(owner)
+        if bucket is None:
+            bucket = self._buckets[owner] = TokenBucket(self.rate, self.burst)
+            if len(self._buckets) > self.max_owners:
+                # The least recently seen owner has long refilled to a full
+                # bucket; its counters go with it
+                evicted, _ = self._buckets.popitem(last=False)
+                self._allowed.pop(evicted, None)
+                self._limited.pop(evicted, None)
+        else:
+            self._buckets.move_to_end(owner)
+        return bucket
+
+    def check(self, owner: Optional[str]):
+        """Consume one token for owner or raise AdmissionRejected(429)"""
+        owner = owner or "anonymous"
+        with self._lock:
+            wait_s = self._bucket(owner).take()
+            if wait_s:
+                self._limited[owner] = self._limited.get(owner, 0) + 1
+            else:
+                self._allowed[owner] = self._allowed.get(owner, 0) + 1
+        if wait_s:
+            raise AdmissionRejected(
+                429, f"Rate limit exceeded for '{owner}' on {self.name}", max(1, math.ceil(wait_s))
+            )
+
+    def stats(self) -> dict:
+        """Counters per owner"""
+        with self._lock:
+            owners = set(self._allowed) | set(self._limited)
+            return {
+                "rate_per_min": round(self.rate * 60, 3),
+                "burst": self.burst,
+                "owners": {
+                    owner: {
+                        "allowed": self._allowed.get(owner, 0),
+                        "rate_limited": self._limited.get(owner, 0),
+                        "tokens": round(self._buckets[owner].available(), 2) if owner in self._buckets else self.burst,
+                    }
+                    for owner in sorted(owners)
+                },
+            }
+
+
+_limiters: Dict[str, OwnerRateLimiter] = {}
+
+
+def get_rate_limiter(name: str) -> OwnerRateLimiter:
+    """Shared limiter for "report" or "chat" (limits come from settings)"""
+    limiter = _limiters.get(name)
+    if limiter is None:
+        rate, burst = {
+            "report": (settings.REPORT_RATE_PER_MIN, settings.REPORT_RATE_BURST),
+            "chat": (settings.CHAT_RATE_PER_MIN, settings.CHAT_RATE_BURST),
+        }[name]
+        limiter = _limiters[name] = OwnerRateLimiter(name, rate, burst)
+    return limiter
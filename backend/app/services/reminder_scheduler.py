@@ -0,0 +1,272 @@
+"""
+Reminder Scheduler
+In-process scheduler that fires reminders when they fall due. Pending
+reminders sit in a min-heap keyed on due time, loaded once at startup from
+an indexed query, so the next due reminder is always at the top and the
+table is never polled. Rescheduling and cancelling are O(log n): the new
+entry is pushed and the old one is left in the heap as stale (lazy
+deletion), to be skipped when it reaches the top.
+
+Also derives follow-up reminders from the recommendation of an extraction
+("Follow-up CT in 6-12 months").
+"""
+import asyncio
+import heapq
+import itertools
+import re
+import threading
+import time
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+from fastapi.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from utils.db import fire_reminders, pending_reminder_dues
+
+# "6 months", "6-12 months", "3 to 6 weeks", "1 year"
+_INTERVAL = re.compile(r"(\d+)\s*(?:(?:-|–|to)\s*\d+\s*)?(day|week|month|year)s?\b", re.IGNORECASE)
+_UNIT_DAYS = {"day": 1, "week": 7, "month": 30, "year": 365}
+_FOLLOWUP_WORDS = ("follow", "repeat", "recommend", "reassess", "surveillance")
+
+
+def to_utc_iso(value: Union[datetime, date]) -> str:
+    """Timestamp in the form stored in the database (naive ISO, UTC); dates are midnight"""
+    if not isinstance(value, datetime):
+        value = datetime(value.year, value.month, value.day)
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value.isoformat()
+
+
+def due_timestamp(due_date: Optional[str]) -> Optional[float]:
+    """Epoch seconds of a stored due_date (naive values are UTC)"""
+    if not due_date:
+        return None
+    try:
+        due = datetime.fromisoformat(due_date.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if due.tzinfo is None:
+        due = due.replace(tzinfo=timezone.utc)
+    return due.timestamp()
+
+
+def followup_reminder(extracted: Optional[Dict[str, Any]], reference: datetime) -> Optional[Tuple[str, str]]:
+    """
+    Follow-up reminder suggested by an extraction
+
+    Uses the "recommendation" field (or sections.recommendation), else an
+    impression that mentions a follow-up; the earliest end of an interval
+    ("6-12 months" -> 6 months) is counted from the reference date.
+
+    Returns:
+        (title, due_date) or None if no dated follow-up is recommended
+    """
+    if not extracted:
+        return None
+    sections = extracted.get("sections") if isinstance(extracted.get("sections"), dict) else {}
+    candidates = [extracted.get("recommendation"), sections.get("recommendation")]
+    impression = extracted.get("impression") or sections.get("impression")
+    if isinstance(impression, str) and any(w in impression.lower() for w in _FOLLOWUP_WORDS):
+        candidates.append(impression)
+
+    for text in candidates:
+        if not isinstance(text, str):
+            continue
+        match = _INTERVAL.search(text)
+        if match:
+            days = int(match.group(1)) * _UNIT_DAYS[match.group(2).lower()]
+            title = f"Follow-up: {' '.join(text.split())[:200]}"
+            return title, to_utc_iso(reference + timedelta(days=days))
+    return None
+
+
+class ReminderScheduler:
+    """
+    Min-heap of (due time, reminder id, generation)
+
+    A reminder's live generation is kept in `_live`; heap entries with any
+    other generation are stale and dropped when popped.
+
+    Usage:
+        scheduler = get_reminder_scheduler()
+        await scheduler.start()          # lifespan startup
+        scheduler.schedule(reminder_id, due_date)
+        scheduler.cancel(reminder_id)
+        await scheduler.stop()
+    """
+
+    def __init__(self, max_sleep_s: float = 60.0, retry_s: float = 30.0):
+        self.max_sleep_s = max_sleep_s   # re-check at least this often (clock changes)
+        self.retry_s = retry_s
+        self._heap: List[Tuple[float, int, int]] = []
+        self._live: Dict[int, Tuple[int, float]] = {}   # id -> (generation, due)
+        self._generation = itertools.count()
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self.on_fire: List[Callable[[Dict[str, Any]], Any]] = []
+        self.fired = 0
+        self.stale_skipped = 0
+        self.compactions = 0
+
+    def load(self) -> int:
+        """
+        Replace the heap with every pending reminder (one indexed query)
+
+        Returns:
+            Number of reminders scheduled
+        """
+        entries = []
+        live = {}
+        for reminder_id, due_date in pending_reminder_dues():
+            due = due_timestamp(due_date)
+            if due is None:
+                continue
+            generation = next(self._generation)
+            live[reminder_id] = (generation, due)
+            entries.append((due, reminder_id, generation))
+        heapq.heapify(entries)   # O(n), cheaper than n pushes
+        with self._lock:
+            self._heap, self._live = entries, live
+        self._wake_up()
+        return len(entries)
+
+    def schedule(self, reminder_id: int, due_date: Optional[str]):
+        """(Re)schedule a reminder; no due date cancels it. Safe from any thread."""
+        due = due_timestamp(due_date)
+        if due is None:
+            self.cancel(reminder_id)
+            return
+        with self._lock:
+            generation = next(self._generation)
+            self._live[reminder_id] = (generation, due)
+            heapq.heappush(self._heap, (due, reminder_id, generation))
+            self._maybe_compact()   # rescheduling leaves the old entry stale
+            earliest = self._heap[0][1] == reminder_id
+        if earliest:
+            self._wake_up()
+
+    def cancel(self, reminder_id: int):
+        """Unschedule a reminder (its heap entry becomes stale)"""
+        with self._lock:
+            if self._live.pop(reminder_id, None) is not None:
+                self._maybe_compact()
+
+    def _maybe_compact(self):
+        # Bound memory when most entries are stale: rebuild from live ones
+        if len(self._heap) > 2 * len(self._live) + 1024:
+            self._heap = [(due, rid, gen) for rid, (gen, due) in self._live.items()]
+            heapq.heapify(self._heap)
+            self.compactions += 1
+
+    def _pop_due(self, now: float) -> Tuple[List[int], Optional[float]]:
+        """Pop every reminder due by `now`; also returns the next due time"""
+        due_ids = []
+        with self._lock:
+            while self._heap:
+                due, reminder_id, generation = self._heap[0]
+                live = self._live.get(reminder_id)
+                if live is None or live[0] != generation:
+                    heapq.heappop(self._heap)
+                    self.stale_skipped += 1
+                    continue
+                if due > now:
+                    return due_ids, due
+                heapq.heappop(self._heap)
+                del self._live[reminder_id]
+                due_ids.append(reminder_id)
+        return due_ids, None
+
+    def _wake_up(self):
+        if self._loop is None or self._wake is None or self._loop.is_closed():
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is self._loop:
+            self._wake.set()
+        else:
+            self._loop.call_soon_threadsafe(self._wake.set)
+
+    async def start(self):
+        """Load pending reminders and start firing them"""
+        self._loop = asyncio.get_running_loop()
+        self._wake = asyncio.Event()
+        count = await run_in_threadpool(self.load)
+        self._task = asyncio.create_task(self._run())
+        print(f"⏰ Reminder scheduler started ({count} pending)")
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        while True:
+            # Clear before looking at the heap, so a schedule() racing with
+            # this pass still wakes the wait below
+            self._wake.clear()
+            due_ids, next_due = self._pop_due(time.time())
+            if due_ids:
+                await self._fire(due_ids)
+                continue
+            timeout = self.max_sleep_s if next_due is None else min(max(next_due - time.time(), 0), self.max_sleep_s)
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _fire(self, reminder_ids: List[int]):
+        try:
+            fired = await run_in_threadpool(fire_reminders, reminder_ids)
+        except Exception as e:
+            print(f"❌ Failed to fire reminders {reminder_ids}: {e}")
+            retry = datetime.utcnow() + timedelta(seconds=self.retry_s)
+            for reminder_id in reminder_ids:
+                self.schedule(reminder_id, to_utc_iso(retry))
+            return
+
+        for reminder in fired:
+            self.fired += 1
+            print(f"⏰ Reminder {reminder['id']} due for {reminder['owner']}: {reminder['title']}")
+            for callback in self.on_fire:
+                try:
+                    callback(reminder)
+                except Exception as e:
+                    print(f"❌ Reminder callback failed: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            while self._heap and self._live.get(self._heap[0][1], (None,))[0] != self._heap[0][2]:
+                heapq.heappop(self._heap)
+                self.stale_skipped += 1
+            next_due = self._heap[0][0] if self._heap else None
+            pending = len(self._live)
+            heap_size = len(self._heap)
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "pending": pending,
+            "heap_entries": heap_size,
+            "next_due": datetime.fromtimestamp(next_due, timezone.utc).isoformat() if next_due else None,
+            "fired": self.fired,
+            "stale_skipped": self.stale_skipped,
+            "compactions": self.compactions,
+        }
+
+
+_scheduler: Optional[ReminderScheduler] = None
+
+
+def get_reminder_scheduler() -> ReminderScheduler:
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = ReminderScheduler(max_sleep_s=settings.REMINDER_MAX_SLEEP_S)
+    return _scheduler
@@ -0,0 +1,123 @@
+"""
+Report Response Cache
+Conditional GET support for report reads: strong ETags derived from the
+per-report `version` column, 304 answers to If-None-Match, and an LRU of
+already serialized response bodies keyed by ETag. Completed reports also
+keep precompressed copies of their detail body, so popular reports are not
+recompressed on every read.
+
+Because an ETag changes whenever any report it covers changes, a stale
+body can never be served; explicit invalidation on UPDATE/DELETE only
+frees the memory early.
+"""
+import hashlib
+from email.utils import format_datetime
+from datetime import datetime, timezone
+from typing import Iterable, Optional, Tuple
+
+from fastapi import Response
+
+from app.core.config import settings
+from app.core.middleware import ENCODINGS, add_vary, compress, weaken_etag
+from app.services.decoding import ResponseCache
+
+# Revalidate on every use; the 304 path is cheap
+CACHE_CONTROL = "private, no-cache"
+
+
+def detail_etag(report_id: int, version: int, include_extracted: bool) -> str:
+    return f'"r{report_id}-v{version}{"-x" if include_extracted else ""}"'
+
+
+def list_etag(rows: Iterable[Tuple[int, int]], include_extracted: bool) -> str:
+    """ETag of a report list from its (id, version) pairs, in order"""
+    digest = hashlib.sha1(b"x" if include_extracted else b"-")
+    for report_id, version in rows:
+        digest.update(f"{report_id}.{version},".encode())
+    return f'"l{digest.hexdigest()[:32]}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match check (weak comparison, as RFC 9110 requires for it)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    tags = {tag.strip() for tag in if_none_match.split(",")}
+    tags = {tag[2:] if tag.startswith("W/") else tag for tag in tags}
+    return etag in tags
+
+
+def http_date(timestamp: Optional[str]) -> Optional[str]:
+    """ISO timestamp (as stored, UTC) to an HTTP-date for Last-Modified"""
+    if not timestamp:
+        return None
+    try:
+        return format_datetime(datetime.fromisoformat(timestamp).replace(tzinfo=timezone.utc), usegmt=True)
+    except ValueError:
+        return None
+
+
+def cache_headers(etag: str, last_modified: Optional[str] = None) -> dict:
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    if last_modified:
+        headers["Last-Modified"] = last_modified
+    return headers
+
+
+def not_modified(etag: str, last_modified: Optional[str] = None) -> Response:
+    return Response(status_code=304, headers=cache_headers(etag, last_modified))
+
+
+def json_body(body: bytes, etag: str, last_modified: Optional[str] = None,
+              encoding: Optional[str] = None) -> Response:
+    """JSON response; with `encoding`, the body is already compressed with it"""
+    response = Response(content=body, media_type="application/json", headers=cache_headers(etag, last_modified))
+    if encoding:
+        response.headers["Content-Encoding"] = encoding
+        add_vary(response.headers)
+        weaken_etag(response.headers)
+    return response
+
+
+class ReportResponseCache(ResponseCache):
+    """
+    ResponseCache of serialized report bodies, keyed "detail:<id>:<etag>"
+    or "list:<etag>"; compressed copies add an ":<encoding>" suffix
+    """
+
+    def precompress(self, key: str, body: bytes):
+        """Store "<key>:<encoding>" copies of a body for every supported coding"""
+        if len(body) < settings.COMPRESSION_MIN_SIZE:
+            return
+        levels = {"br": settings.PRECOMPRESS_BROTLI_QUALITY, "gzip": settings.PRECOMPRESS_GZIP_LEVEL}
+        for encoding in ENCODINGS:
+            self.put(f"{key}:{encoding}", compress(body, encoding, levels[encoding]))
+
+    def get_compressed(self, key: str, encoding: Optional[str]) -> Optional[bytes]:
+        """Precompressed copy of a cached body, if one was stored"""
+        if encoding is None:
+            return None
+        return self.get(f"{key}:{encoding}")
+
+    def invalidate_report(self, report_id: int):
+        """Drop the report's detail bodies and every list body"""
+        prefix = f"detail:{report_id}:"
+        with self._lock:
+            for key in [k for k in self._data if k.startswith(prefix) or k.startswith("list:")]:
+                del self._data[key]
+
+
+_report_cache: Optional[ReportResponseCache] = None
+
+
+def get_report_cache() -> ReportResponseCache:
+    global _report_cache
+    if _report_cache is None:
+        _report_cache = ReportResponseCache(settings.REPORT_RESPONSE_CACHE_SIZE)
+    return _report_cache
+
+
+def invalidate_report_responses(report_id: int):
+    """Call after any UPDATE or DELETE of a report row"""
+    get_report_cache().invalidate_report(report_id)
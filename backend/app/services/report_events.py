@@ -0,0 +1,164 @@
+"""
+Report Event Bus
+Fans out report processing events (stage changes, completion, failure) to
+subscribed viewers, so clients are pushed updates instead of polling the
+report list. Each subscriber has a bounded buffer: a slow client loses its
+oldest events and is told to resync rather than holding memory.
+"""
+import asyncio
+import itertools
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, List, Optional, Set
+
+# Visibility levels other family members may see (see list_reports)
+SHARED_VISIBILITY = ("SHARED_SUMMARY", "CAREGIVER")
+
+
+@dataclass
+class ReportEvent:
+    """One processing event; `id` is a process-wide increasing sequence"""
+    id: int
+    report_id: int
+    owner: str
+    visibility: str
+    stage: str
+    status: str
+    urgency: Optional[str] = None
+    timestamp: float = field(default_factory=time.time)
+
+    def visible_to(self, viewer: str) -> bool:
+        return viewer == "admin" or viewer == self.owner or self.visibility in SHARED_VISIBILITY
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "report_id": self.report_id,
+            "owner": self.owner,
+            "stage": self.stage,
+            "status": self.status,
+            "urgency": self.urgency,
+            "timestamp": self.timestamp,
+        }
+
+
+class Subscription:
+    """A viewer's bounded event buffer"""
+
+    def __init__(self, viewer: str, max_buffer: int):
+        self.viewer = viewer
+        self.max_buffer = max_buffer
+        self.lagged = False   # events were dropped; the client must resync
+        self._buffer: Deque[ReportEvent] = deque()
+        self._ready = asyncio.Event()
+
+    def _push(self, event: ReportEvent):
+        if len(self._buffer) >= self.max_buffer:
+            self._buffer.popleft()
+            self.lagged = True
+        self._buffer.append(event)
+        self._ready.set()
+
+    async def get(self, timeout_s: Optional[float] = None) -> List[ReportEvent]:
+        """
+        Wait for events
+
+        Returns:
+            Buffered events in order (empty list on timeout)
+        """
+        if not self._buffer:
+            self._ready.clear()
+            try:
+                await asyncio.wait_for(self._ready.wait(), timeout_s)
+            except asyncio.TimeoutError:
+                return []
+        events = list(self._buffer)
+        self._buffer.clear()
+        return events
+
+
+class ReportEventBus:
+    """
+    In-process pub/sub for report events
+
+    Usage:
+        sub = bus.subscribe("alice")
+        try:
+            events = await sub.get(timeout_s=15)
+        finally:
+            bus.unsubscribe(sub)
+    """
+
+    def __init__(self, max_buffer: int = 64, history: int = 256):
+        self.max_buffer = max_buffer
+        self._subscribers: Set[Subscription] = set()
+        self._history: Deque[ReportEvent] = deque(maxlen=history)
+        self._seq = itertools.count(1)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock = threading.Lock()
+        self.published = 0
+        self.dropped = 0
+
+    def subscribe(self, viewer: str, last_event_id: Optional[int] = None) -> Subscription:
+        """
+        Register a subscriber; with last_event_id, missed events still in
+        the history are replayed (a reconnecting EventSource sends it)
+        """
+        self._loop = asyncio.get_running_loop()
+        sub = Subscription(viewer, self.max_buffer)
+        if last_event_id is not None:
+            with self._lock:
+                missed = [e for e in self._history if e.id > last_event_id and e.visible_to(viewer)]
+            if self._history and self._history[0].id > last_event_id + 1:
+                sub.lagged = True   # part of the gap is no longer in the history
+            for event in missed:
+                sub._push(event)
+        self._subscribers.add(sub)
+        return sub
+
+    def unsubscribe(self, sub: Subscription):
+        self._subscribers.discard(sub)
+
+    def publish(self, report_id: int, owner: str, visibility: str, stage: str,
+                status: str = "processing", urgency: Optional[str] = None) -> ReportEvent:
+        """Publish an event; safe to call from worker threads"""
+        with self._lock:
+            event = ReportEvent(next(self._seq), report_id, owner, visibility, stage, status, urgency)
+            self._history.append(event)
+            self.published += 1
+
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is not None and running is self._loop:
+            self._deliver(event)
+        elif self._loop is not None and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._deliver, event)
+        return event
+
+    def _deliver(self, event: ReportEvent):
+        for sub in list(self._subscribers):
+            if event.visible_to(sub.viewer):
+                if len(sub._buffer) >= sub.max_buffer:
+                    self.dropped += 1
+                sub._push(event)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "subscribers": len(self._subscribers),
+            "published": self.published,
+            "dropped": self.dropped,
+        }
+
+
+_bus: Optional[ReportEventBus] = None
+
+
+def get_event_bus() -> ReportEventBus:
+    """Shared bus (one per process)"""
+    global _bus
+    if _bus is None:
+        _bus = ReportEventBus()
+    return _bus
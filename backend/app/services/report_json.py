@@ -0,0 +1,71 @@
+"""
+Report JSON Encoding
+Serializes report rows straight from SQLite into response bytes. Rows are
+trusted (the pipeline wrote them), so no per-row Pydantic model is built,
+and the stored extracted_json is spliced into the body as raw JSON instead
+of being parsed and re-serialized.
+
+Uses orjson when installed and falls back to the standard library.
+"""
+import json
+from typing import Any, Dict, Iterable, List, Mapping, Optional
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+# ReportResponse fields read from the reports table, in response order;
+# "extracted" is appended raw
+REPORT_FIELDS = (
+    "id", "owner", "visibility", "urgency", "status", "created_at",
+    "report_text", "patient_view", "family_view",
+)
+
+
+def dumps(obj: Any) -> bytes:
+    """Serialize to compact JSON bytes"""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def report_fields(row: Mapping[str, Any]) -> Dict[str, Any]:
+    """The scalar ReportResponse fields of a row"""
+    fields = {name: row[name] for name in REPORT_FIELDS}
+    # NULL urgency would fail ReportResponse validation; report it as unknown
+    if fields["urgency"] is None:
+        fields["urgency"] = "UNKNOWN"
+    return fields
+
+
+def encode_report(fields: Dict[str, Any], extracted_raw: Optional[bytes]) -> bytes:
+    """
+    One ReportResponse JSON object
+
+    Args:
+        fields: Scalar fields (see report_fields)
+        extracted_raw: Stored extraction JSON bytes, or None
+    """
+    head = dumps(fields)
+    return b"".join((head[:-1], b',"extracted":', extracted_raw or b"null", b"}"))
+
+
+def encode_report_list(rows: Iterable[Mapping[str, Any]], extracted_bytes) -> bytes:
+    """
+    JSON array of reports
+
+    Args:
+        rows: Report rows (sqlite3.Row) including an "extracted_json" column
+        extracted_bytes: Column value -> raw JSON bytes (utils.db.extracted_json_bytes)
+    """
+    parts: List[bytes] = []
+    for row in rows:
+        try:
+            extracted_raw = extracted_bytes(row["extracted_json"])
+        except Exception as e:
+            # Unreadable blob (e.g. zstd without the package): keep the report
+            print(f"ERROR decoding extracted data of report {row['id']}: {e}")
+            extracted_raw = None
+        parts.append(encode_report(report_fields(row), extracted_raw))
+    return b"[" + b",".join(parts) + b"]"
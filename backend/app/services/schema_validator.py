@@ -0,0 +1,88 @@
+"""
+Schema Validator Service
+Compiles JSON Schemas once into cached validators (one per schema version)
+instead of rebuilding the validator class on every jsonschema.validate call
+"""
+import json
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from jsonschema import ValidationError
+from jsonschema.validators import validator_for
+
+
+SCHEMA_DIR = Path(__file__).parent.parent.parent.parent / "schemas"
+
+
+class CompiledSchema:
+    """
+    A schema checked once and bound to a reusable validator instance
+    """
+
+    def __init__(self, schema: Dict[str, Any]):
+        cls = validator_for(schema)
+        cls.check_schema(schema)
+        self.schema = schema
+        self.version = str(schema.get("version", "1"))
+        self._validator = cls(schema)
+
+    def is_valid(self, instance: Any) -> bool:
+        """Fast boolean check (stops at the first error)"""
+        return self._validator.is_valid(instance)
+
+    def errors(self, instance: Any) -> List[ValidationError]:
+        """
+        Collect every validation error in one pass
+
+        Returns:
+            Errors ordered by instance path, empty when valid
+        """
+        return sorted(self._validator.iter_errors(instance), key=lambda e: list(map(str, e.path)))
+
+    def validate(self, instance: Any):
+        """Raise the first ValidationError (drop-in for jsonschema.validate)"""
+        for error in self.errors(instance):
+            raise error
+
+
+_compiled: Dict[str, CompiledSchema] = {}
+
+
+def compile_schema(schema: Dict[str, Any]) -> CompiledSchema:
+    """
+    Compile a schema, reusing the cached validator for its version
+
+    A schema whose content differs from the cached one of the same version
+    replaces it.
+    """
+    version = str(schema.get("version", "1"))
+    cached = _compiled.get(version)
+    if cached is None or cached.schema != schema:
+        cached = CompiledSchema(schema)
+        _compiled[version] = cached
+    return cached
+
+
+def schema_path(name: str = "radiology_schema", version: Optional[str] = None) -> Path:
+    """
+    Resolve a schema file; versioned schemas live next to the current one
+    as `<name>.v<version>.json`
+    """
+    if version:
+        return SCHEMA_DIR / f"{name}.v{version}.json"
+    return SCHEMA_DIR / f"{name}.json"
+
+
+def load_schema(name: str = "radiology_schema", version: Optional[str] = None) -> Dict[str, Any]:
+    """Load a schema file from the schemas/ directory"""
+    path = schema_path(name, version)
+    if not path.exists():
+        raise FileNotFoundError(f"Schema file not found: {path}")
+
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def get_validator(version: str) -> Optional[CompiledSchema]:
+    """Get an already compiled validator by schema version"""
+    return _compiled.get(str(version))
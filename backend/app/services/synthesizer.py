@@ -1,9 +1,13 @@
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 import torch
 from transformers import AutoTokenizer, AutoModelForCausalLM
 
+from backend.app.services.decoding import DecodingProfile
+from backend.app.services.generation_budget import GenerationBudget
+
 class MedGemmaSynthesizer:
-    def __init__(self, model_id_or_path: str):
+    def __init__(self, model_id_or_path: str, decoding: Optional[DecodingProfile] = None):
+        self.decoding = decoding or DecodingProfile(mode="sample", temperature=0.3)
         self.tokenizer = AutoTokenizer.from_pretrained(model_id_or_path, use_fast=True)
         # Use AutoModelForCausalLM (Gemma3 is supported)
         self.model = AutoModelForCausalLM.from_pretrained(
@@ -12,7 +16,16 @@ class MedGemmaSynthesizer:
             device_map="auto"
         )
 
-    def _gen(self, prompt: str, max_new_tokens: int = 500) -> str:
+    def _gen(self, prompt: str, max_new_tokens: Optional[int] = None,
+             decoding: Optional[DecodingProfile] = None,
+             budget: Optional[GenerationBudget] = None) -> str:
+        decoding = decoding or self.decoding
+        extra = {}
+        if budget is not None:
+            max_new_tokens = budget.cap(max_new_tokens)
+            extra["stopping_criteria"] = budget.stopping_criteria()
+        elif max_new_tokens is None:
+            max_new_tokens = 500
         # Apply chat template for Gemma3
         messages = [{"role": "user", "content": prompt}]
         formatted_prompt = self.tokenizer.apply_chat_template(
@@ -24,13 +37,13 @@ class MedGemmaSynthesizer:
             out = self.model.generate(
                 **inputs,
                 max_new_tokens=max_new_tokens,
-                do_sample=True,
-                temperature=0.3,
-                top_p=0.9,
+                **decoding.generate_kwargs(),
+                **extra,
             )
         return self.tokenizer.decode(out[0], skip_special_tokens=True)
 
-    def patient_view(self, extracted: Dict[str, Any], triage: Dict[str, str]) -> str:
+    def patient_view(self, extracted: Dict[str, Any], triage: Dict[str, str],
+                     budget: Optional[GenerationBudget] = None) -> str:
         # Map urgency to icons for visual clarity
         urgency_map = {
             "ROUTINE": "💚 ROUTINE - No immediate action needed",
@@ -78,9 +91,10 @@ Given extracted radiology findings JSON and urgency, write a patient-friendly ex
 Extracted JSON:
 {extracted}
 """.strip()
-        return self._gen(prompt)
+        return self._gen(prompt, budget=budget)
 
-    def family_view(self, extracted: Dict[str, Any], triage: Dict[str, str]) -> str:
+    def family_view(self, extracted: Dict[str, Any], triage: Dict[str, str],
+                    budget: Optional[GenerationBudget] = None) -> str:
         # Map urgency to icons for visual clarity
         urgency_map = {
             "ROUTINE": "💚 ROUTINE - No immediate action needed",
@@ -128,4 +142,4 @@ Write a caregiver-oriented summary with CLEAR VISUAL SECTIONS using this EXACT f
 Extracted JSON:
 {extracted}
 """.strip()
-        return self._gen(prompt)
+        return self._gen(prompt, budget=budget)
@@ -0,0 +1,183 @@
+"""
+Streaming Upload Handling
+Parses multipart image uploads incrementally: the size limit is enforced and
+the image header is validated while the body is being read, file data is
+spooled (memory, then disk) instead of being copied into bytes objects, and
+the content hash is computed on the fly.
+"""
+import hashlib
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from fastapi import HTTPException, Request
+from starlette.datastructures import UploadFile
+from starlette.formparsers import MultiPartException, MultiPartParser
+
+
+# Leading bytes of the image formats PIL can decode for the analyzer
+IMAGE_SIGNATURES = (
+    (b"\xff\xd8\xff", "jpeg"),
+    (b"\x89PNG\r\n\x1a\n", "png"),
+    (b"GIF87a", "gif"),
+    (b"GIF89a", "gif"),
+    (b"BM", "bmp"),
+    (b"II*\x00", "tiff"),
+    (b"MM\x00*", "tiff"),
+)
+HEADER_BYTES = 12
+
+# Allowance for multipart boundaries, part headers and small form fields
+FORM_OVERHEAD_BYTES = 64 * 1024
+
+
+def sniff_image_format(header: bytes) -> Optional[str]:
+    """Identify an image format from its first bytes"""
+    for signature, fmt in IMAGE_SIGNATURES:
+        if header.startswith(signature):
+            return fmt
+    if header[:4] == b"RIFF" and header[8:12] == b"WEBP":
+        return "webp"
+    return None
+
+
+class UploadRejected(MultiPartException):
+    """Raised from inside the parser to stop reading the request body"""
+
+    def __init__(self, status_code: int, detail: str):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+@dataclass
+class ImageUpload:
+    """A validated, spooled image upload"""
+    file: UploadFile
+    digest: str
+    size: int
+    format: str
+
+
+@dataclass
+class ParsedImageForm:
+    """Result of parse_image_form"""
+    images: List[ImageUpload]
+    fields: Dict[str, str] = field(default_factory=dict)
+
+
+class _ImageUploadParser(MultiPartParser):
+    """MultiPartParser that validates file parts while they stream in"""
+
+    def __init__(self, headers, stream, *, image_field: str, max_bytes: int, max_files: int):
+        super().__init__(headers, stream, max_files=max_files, max_fields=50)
+        self.image_field = image_field
+        self.max_bytes = max_bytes
+        self._stats: Dict[int, dict] = {}
+
+    def _part_stats(self) -> dict:
+        # Keyed by the part's spooled UploadFile, which ends up in the form
+        return self._stats.setdefault(
+            id(self._current_part.file),
+            {"size": 0, "header": b"", "format": None, "hash": hashlib.sha256()},
+        )
+
+    def stats_for(self, upload: UploadFile) -> dict:
+        return self._stats[id(upload)]
+
+    def _check_header(self, stats: dict):
+        stats["format"] = sniff_image_format(stats["header"])
+        if stats["format"] is None:
+            raise UploadRejected(415, "Unsupported or invalid image file (unrecognized header)")
+
+    def on_part_data(self, data: bytes, start: int, end: int) -> None:
+        part = self._current_part
+        if part.file is not None:
+            if part.field_name != self.image_field:
+                raise UploadRejected(400, f"Unexpected file field '{part.field_name}'")
+            stats = self._part_stats()
+            chunk = data[start:end]
+            stats["size"] += len(chunk)
+            if stats["size"] > self.max_bytes:
+                raise UploadRejected(
+                    413, f"Image file too large. Maximum size is {self.max_bytes // (1024 * 1024)}MB."
+                )
+            if stats["format"] is None:
+                stats["header"] += chunk[:HEADER_BYTES]
+                if len(stats["header"]) >= HEADER_BYTES:
+                    self._check_header(stats)
+            stats["hash"].update(chunk)
+        super().on_part_data(data, start, end)
+
+    def on_part_end(self) -> None:
+        part = self._current_part
+        if part.file is not None and part.field_name == self.image_field:
+            stats = self._part_stats()
+            if stats["format"] is None:
+                # Small file that ended before HEADER_BYTES
+                self._check_header(stats)
+        super().on_part_end()
+
+
+async def parse_image_form(
+    request: Request,
+    image_field: str = "image",
+    max_bytes: int = 10 * 1024 * 1024,
+    max_files: int = 1,
+) -> ParsedImageForm:
+    """
+    Stream-parse a multipart image upload
+
+    Args:
+        request: Incoming request (multipart/form-data)
+        image_field: Name of the file field(s)
+        max_bytes: Per-image size limit
+        max_files: Maximum number of images
+
+    Returns:
+        Validated images (spooled, hashed) and the plain form fields
+
+    Raises:
+        HTTPException: 413 / 415 / 400 as soon as the stream violates a limit
+    """
+    content_type = request.headers.get("content-type", "")
+    if not content_type.startswith("multipart/form-data"):
+        raise HTTPException(status_code=415, detail="Expected multipart/form-data")
+
+    # Reject before reading anything when the declared length is already too big
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit():
+        if int(content_length) > max_bytes * max_files + FORM_OVERHEAD_BYTES:
+            raise HTTPException(
+                status_code=413,
+                detail=f"Image file too large. Maximum size is {max_bytes // (1024 * 1024)}MB."
+            )
+
+    parser = _ImageUploadParser(
+        request.headers, request.stream(),
+        image_field=image_field, max_bytes=max_bytes, max_files=max_files,
+    )
+    try:
+        form = await parser.parse()
+    except UploadRejected as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
+    except MultiPartException as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    images = []
+    fields = {}
+    for name, value in form.multi_items():
+        if isinstance(value, UploadFile):
+            stats = parser.stats_for(value)
+            images.append(ImageUpload(
+                file=value,
+                digest=stats["hash"].hexdigest(),
+                size=stats["size"],
+                format=stats["format"],
+            ))
+        else:
+            fields[name] = value
+
+    if not images:
+        raise HTTPException(status_code=422, detail=f"Missing '{image_field}' file field")
+
+    return ParsedImageForm(images=images, fields=fields)
@@ -0,0 +1,125 @@
+"""
+PII redaction throughput benchmark
+
+Compares the legacy three-pass `re.sub` redaction with the single-pass
+PIIRedactor on multi-megabyte synthetic lab reports, then checks that the
+streaming path (redact_file) matches whole-text redaction and stays linear on
+pathological inputs such as one long run of space-separated digits.
+
+Usage:
+    cd backend && python -m benchmarks.bench_pii_redact [--mb 4] [--repeat 3]
+"""
+import argparse
+import io
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services.pii_redact import PIIRedactor, DEFAULT_DETECTORS, EXTENDED_DETECTORS, redact_file, redact_pii
+
+# Legacy patterns, kept here only as the baseline to compare against
+LEGACY_PHONE = re.compile(r"\b(\+?\d[\d\s\-]{7,}\d)\b")
+LEGACY_IDLIKE = re.compile(r"\b\d{15,18}\b")
+LEGACY_EMAIL = re.compile(r"\b[\w\.-]+@[\w\.-]+\.\w+\b")
+
+
+def legacy_redact(text: str) -> str:
+    text = LEGACY_EMAIL.sub("[REDACTED_EMAIL]", text)
+    text = LEGACY_PHONE.sub("[REDACTED_PHONE]", text)
+    text = LEGACY_IDLIKE.sub("[REDACTED_ID]", text)
+    return text
+
+
+def make_report(size_bytes: int, seed: int = 0) -> str:
+    """Build a synthetic report mixing prose, numeric lab tables and PII"""
+    rng = random.Random(seed)
+    prose = (
+        "FINDINGS: The lungs are clear. No pleural effusion or pneumothorax. "
+        "Heart size is normal. IMPRESSION: No acute cardiopulmonary process.\n"
+    )
+    parts = []
+    size = 0
+    while size < size_bytes:
+        kind = rng.random()
+        if kind < 0.5:
+            chunk = prose
+        elif kind < 0.8:
+            row = " ".join(str(rng.randint(0, 999)) for _ in range(12))
+            chunk = f"LAB {row} x\n"
+        elif kind < 0.9:
+            chunk = f"Contact: +1 555-{rng.randint(100, 999)}-{rng.randint(1000, 9999)}\n"
+        else:
+            chunk = f"Email patient{rng.randint(1, 999)}@example.com ID {rng.randint(10**16, 10**17)}\n"
+        parts.append(chunk)
+        size += len(chunk)
+    return "".join(parts)
+
+
+def bench(fn, text: str, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(text)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def redact_streamed(text: str) -> str:
+    out = io.StringIO()
+    redact_file(io.BytesIO(text.encode("utf-8")), out)
+    return out.getvalue()
+
+
+def check_streaming(size_bytes: int) -> bool:
+    """Streamed and whole-text redaction must agree, in comparable time"""
+    inputs = {
+        "lab report": make_report(size_bytes),
+        "digit run '1 1 1 ...'": "1 " * (size_bytes // 2),
+        "digit run '111...'": "1" * size_bytes,
+    }
+    ok = True
+    for name, text in inputs.items():
+        start = time.perf_counter()
+        whole = redact_pii(text)
+        whole_s = time.perf_counter() - start
+        start = time.perf_counter()
+        streamed = redact_streamed(text)
+        streamed_s = time.perf_counter() - start
+        same = streamed == whole
+        ok = ok and same
+        print(f"  {name:<22} whole {whole_s * 1000:8.1f} ms  streamed {streamed_s * 1000:8.1f} ms  "
+              f"{'✅ identical' if same else '❌ DIFFERENT'}")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mb", type=float, default=4.0, help="Input size in megabytes")
+    parser.add_argument("--repeat", type=int, default=3, help="Repetitions (best time is reported)")
+    args = parser.parse_args()
+
+    text = make_report(int(args.mb * 1024 * 1024))
+    mb = len(text.encode("utf-8")) / (1024 * 1024)
+
+    candidates = {
+        "legacy (3 passes)": legacy_redact,
+        "single-pass default": PIIRedactor(DEFAULT_DETECTORS).redact,
+        "single-pass extended": PIIRedactor(EXTENDED_DETECTORS).redact,
+    }
+
+    print(f"Input: {mb:.2f} MB, best of {args.repeat}")
+    for name, fn in candidates.items():
+        elapsed = bench(fn, text, args.repeat)
+        print(f"  {name:<22} {elapsed * 1000:9.1f} ms  {mb / elapsed:8.1f} MB/s")
+
+    print("Streaming vs whole-text")
+    if not check_streaming(int(args.mb * 1024 * 1024)):
+        raise SystemExit("streamed redaction differs from whole-text redaction")
+
+
+if __name__ == "__main__":
+    main()
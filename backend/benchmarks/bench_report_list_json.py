@@ -0,0 +1,141 @@
+"""
+Report list serialization benchmark
+
+Compares the cost of turning report rows into the /reports response body:
+
+  default   decode extracted_json, build ReportResponse per row, then
+            FastAPI's response path (jsonable_encoder + json.dumps), which is
+            what list_reports did before
+  pydantic  same models, serialized with a TypeAdapter (pydantic-core)
+  raw       app.services.report_json: no models, stored extraction JSON
+            spliced in unparsed, stdlib json
+  orjson    the same raw path with orjson (skipped if not installed)
+
+Rows carry realistic payloads (multi-KB markdown views and a nested
+extraction). Bodies are checked to decode to the same data.
+
+Usage:
+    cd backend && python -m benchmarks.bench_report_list_json [--rows 100 1000 10000] [--repeat 5]
+"""
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import List
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+
+from app.models.schemas import ReportResponse
+from app.services import report_json
+from utils.db import decode_extracted, encode_extracted, extracted_json_bytes
+
+VIEW = (
+    "## What the report says\n\nThe scan shows a **small nodule** (6 mm) in the right upper lobe. "
+    "Most nodules this size are harmless, but a follow-up scan is recommended.\n\n"
+    "### Next steps\n- Book a follow-up CT in 6–12 months\n- Bring this report to your GP\n"
+) * 8
+
+EXTRACTED = {
+    "study": {"modality": "CT", "body_part": "Chest", "indication": "Cough for 3 weeks"},
+    "findings": "There is a 6 mm nodule in the right upper lobe. No pleural effusion.",
+    "impression": "Indeterminate 6 mm right upper lobe nodule.",
+    "entities": [
+        {"entity": f"finding {i}", "anatomy": "right upper lobe", "certainty": "present",
+         "severity": "mild", "temporal": "new", "evidence": "6 mm nodule in the right upper lobe",
+         "evidence_span": [120, 155]}
+        for i in range(6)
+    ],
+    "critical_flags": [{"flag": "pneumothorax", "status": "absent", "evidence": "No pneumothorax",
+                        "evidence_span": [200, 215]}],
+    "quality_checks": {"json_valid": True, "missing_sections": [], "notes": ""},
+}
+
+
+def make_rows(n: int) -> List[dict]:
+    stored = encode_extracted(EXTRACTED)
+    return [
+        {
+            "id": n - i, "owner": ("alice", "bob", "carol")[i % 3], "visibility": "SHARED_SUMMARY",
+            "report_text": "EXAM: CT CHEST\nFINDINGS: There is a 6 mm nodule in the right upper lobe.\n" * 10,
+            "extracted_json": stored, "patient_view": VIEW, "family_view": VIEW,
+            "urgency": "ROUTINE", "created_at": "2024-05-01T10:00:00", "status": "completed", "version": 1,
+        }
+        for i in range(n)
+    ]
+
+
+def models(rows) -> List[ReportResponse]:
+    return [
+        ReportResponse(
+            id=row["id"], owner=row["owner"], visibility=row["visibility"], urgency=row["urgency"],
+            status=row["status"], created_at=row["created_at"], report_text=row["report_text"],
+            extracted=decode_extracted(row["extracted_json"]),
+            patient_view=row["patient_view"], family_view=row["family_view"],
+        )
+        for row in rows
+    ]
+
+
+def default_path(rows) -> bytes:
+    content = jsonable_encoder(models(rows))
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None,
+                      separators=(",", ":")).encode("utf-8")
+
+
+_adapter = TypeAdapter(List[ReportResponse])
+
+
+def pydantic_path(rows) -> bytes:
+    return _adapter.dump_json(models(rows))
+
+
+def raw_path(rows) -> bytes:
+    saved, report_json.orjson = report_json.orjson, None
+    try:
+        return report_json.encode_report_list(rows, extracted_json_bytes)
+    finally:
+        report_json.orjson = saved
+
+
+def orjson_path(rows) -> bytes:
+    return report_json.encode_report_list(rows, extracted_json_bytes)
+
+
+def best_ms(fn, rows, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(rows)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    cases = [("default", default_path), ("pydantic", pydantic_path), ("raw", raw_path)]
+    if report_json.orjson is not None:
+        cases.append(("orjson", orjson_path))
+    else:
+        print("orjson not installed: skipping the orjson case\n")
+
+    print(f"{'rows':>7} " + " ".join(f"{name + ' ms':>13}" for name, _ in cases) + f" {'speedup':>9}")
+    for n in args.rows:
+        rows = make_rows(n)
+        reference = json.loads(default_path(rows))
+        for name, fn in cases[1:]:
+            assert json.loads(fn(rows)) == reference, f"{name} body differs"
+        timings = [best_ms(fn, rows, args.repeat) for _, fn in cases]
+        print(f"{n:>7} " + " ".join(f"{t:>13.2f}" for t in timings) + f" {timings[0] / timings[-1]:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Extraction schema validation microbenchmark
+
+Compares per-call overhead of `jsonschema.validate` (today's path, which
+re-checks the schema and rebuilds the validator on every call) with the
+precompiled validator from app.services.schema_validator.
+
+Usage:
+    cd backend && python -m benchmarks.bench_schema_validation [--iterations 5000]
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from jsonschema import validate
+
+from app.services.schema_validator import compile_schema, load_schema
+
+VALID = {
+    "findings": "Small 4 mm nodule in the right upper lobe. No pleural effusion.",
+    "impression": "Indeterminate pulmonary nodule.",
+    "modality": "CT",
+    "body_part": "Chest",
+    "recommendation": "Follow-up CT in 12 months.",
+    "entities": [
+        {"entity": "nodule", "anatomy": "right upper lobe", "certainty": "present",
+         "severity": "mild", "temporal": "new", "evidence": "Small 4 mm nodule"},
+    ],
+}
+INVALID = {"findings": 42, "modality": ["CT"]}
+
+
+def per_call_us(fn, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=5000)
+    args = parser.parse_args()
+
+    schema = load_schema()
+    compiled = compile_schema(schema)
+
+    def legacy_valid():
+        validate(instance=VALID, schema=schema)
+
+    def legacy_invalid():
+        try:
+            validate(instance=INVALID, schema=schema)
+        except Exception:
+            pass
+
+    cases = [
+        ("jsonschema.validate (valid)", legacy_valid),
+        ("compiled.errors     (valid)", lambda: compiled.errors(VALID)),
+        ("compiled.is_valid   (valid)", lambda: compiled.is_valid(VALID)),
+        ("jsonschema.validate (invalid, first error)", legacy_invalid),
+        ("compiled.errors     (invalid, all errors)", lambda: compiled.errors(INVALID)),
+    ]
+
+    print(f"Schema version {compiled.version}, {args.iterations} iterations")
+    for name, fn in cases:
+        print(f"  {name:<44} {per_call_us(fn, args.iterations):9.1f} us/call")
+
+
+if __name__ == "__main__":
+    main()
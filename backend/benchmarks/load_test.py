@@ -0,0 +1,447 @@
+"""
+End-to-end load test with a fake model backend
+
+Boots the FastAPI app in-process (uvicorn on a loopback port, lifespan
+included) with a stub ModelService whose generation has a configurable
+prefill latency, token rate and number of concurrent "GPU" slots. Virtual
+users then drive a weighted mix of report creation, report listing, chat
+and image analysis at a fixed concurrency.
+
+Reported per operation: throughput, p50/p95/p99/max latency and status
+codes (429/503 from admission control are counted, not treated as
+failures). Event-loop lag is sampled during the whole run, so blocking
+work on the loop shows up even when request latency looks fine.
+
+The stub replaces only the model: routing, admission, budgets, redaction,
+SQLite and background processing are the real code paths. The server runs
+over a real socket because an in-memory ASGI transport would count
+BackgroundTasks into the POST latency.
+
+Usage:
+    cd backend && python -m benchmarks.load_test [--concurrency 16] [--duration 30]
+        [--mix create=1,list=4,chat=2,image=1] [--prefill-ms 50] [--tokens-per-s 200]
+        [--save-baseline NAME] [--compare NAME] [--tolerance 0.2]
+
+Baselines are written to benchmarks/baselines/NAME.json; --compare exits
+with status 1 when a p95 latency or throughput regresses beyond tolerance.
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import math
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter, defaultdict
+from pathlib import Path
+from typing import Dict, List
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import httpx
+import uvicorn
+from PIL import Image
+
+from app.core.config import settings
+from app.services.model_service import ModelService
+
+BASELINE_DIR = Path(__file__).parent / "baselines"
+OWNERS = ["alice", "bob", "carol", "dave"]
+
+SAMPLE_REPORT = """EXAM: CT CHEST WITHOUT CONTRAST
+INDICATION: Cough for 3 weeks. Call 555-123-4567 with questions.
+FINDINGS: There is a 6 mm nodule in the right upper lobe. No pleural effusion.
+No evidence of pneumothorax. Mild emphysematous changes in both upper lobes.
+IMPRESSION: Indeterminate 6 mm right upper lobe nodule. Follow-up CT in 6-12 months."""
+
+FAKE_EXTRACTION = {
+    "study": {"modality": "CT", "body_part": "Chest", "indication": "Cough"},
+    "findings": "There is a 6 mm nodule in the right upper lobe.",
+    "impression": "Indeterminate 6 mm right upper lobe nodule.",
+    "entities": [
+        {"entity": "nodule", "anatomy": "right upper lobe", "certainty": "present",
+         "severity": "mild", "temporal": "new", "evidence": "6 mm nodule in the right upper lobe"},
+    ],
+    "critical_flags": [],
+    "quality_checks": {"json_valid": True, "missing_sections": [], "notes": ""},
+}
+
+
+# ---------------------------------------------------------------------------
+# Fake model backend
+# ---------------------------------------------------------------------------
+
+class FakeGPU:
+    """Simulated accelerator: limited concurrent generations, fixed token rate"""
+
+    def __init__(self, prefill_ms: float, tokens_per_s: float, slots: int):
+        self.prefill_s = prefill_ms / 1000
+        self.tokens_per_s = tokens_per_s
+        self._slots = threading.Semaphore(slots)
+
+    def generate(self, tokens: int, budget=None) -> int:
+        """Block like model.generate(); returns the number of tokens produced"""
+        if budget is not None:
+            tokens = budget.cap(tokens)
+        produced = 0
+        with self._slots:
+            time.sleep(self.prefill_s)
+            step = 8
+            while produced < tokens:
+                if budget is not None and budget.should_stop():
+                    break
+                n = min(step, tokens - produced)
+                time.sleep(n / self.tokens_per_s)
+                produced += n
+        return produced
+
+
+class FakeExtractor:
+    def __init__(self, gpu: FakeGPU, tokens: int):
+        self.gpu, self.tokens = gpu, tokens
+
+    def extract(self, report_text: str, budget=None):
+        self.gpu.generate(self.tokens, budget)
+        data = json.loads(json.dumps(FAKE_EXTRACTION))
+        return data, json.dumps(data)
+
+
+class FakeSynthesizer:
+    def __init__(self, gpu: FakeGPU, tokens: int, chat_tokens: int):
+        self.gpu, self.tokens, self.chat_tokens = gpu, tokens, chat_tokens
+
+    def patient_view(self, extracted, triage, budget=None) -> str:
+        n = self.gpu.generate(self.tokens, budget)
+        return f"Patient summary ({n} tokens)."
+
+    def family_view(self, extracted, triage, budget=None) -> str:
+        n = self.gpu.generate(self.tokens, budget)
+        return f"Family summary ({n} tokens)."
+
+    def _gen(self, prompt: str, max_new_tokens=None, decoding=None, budget=None) -> str:
+        n = self.gpu.generate(max_new_tokens or self.chat_tokens, budget)
+        return f"Chat answer ({n} tokens)."
+
+
+class FakeImageAnalyzer:
+    def __init__(self, gpu: FakeGPU, tokens: int):
+        self.gpu, self.tokens = gpu, tokens
+
+    def analyze(self, image, prompt, max_new_tokens=2000, budget=None) -> str:
+        n = self.gpu.generate(min(self.tokens, max_new_tokens), budget)
+        return f"Image analysis ({n} tokens)."
+
+    def analyze_batch(self, images, prompts, max_new_tokens=2000, batch_size=2, budget=None):
+        for i in range(len(images)):
+            yield i, self.analyze(images[i], prompts, max_new_tokens, budget)
+
+    def analyze_study(self, images, prompt, max_new_tokens=2000, budget=None) -> str:
+        return self.analyze(images, prompt, max_new_tokens, budget)
+
+
+class FakeModelService(ModelService):
+    """ModelService with the real caching/budget logic and fake models"""
+
+    fake_config: dict = {}
+
+    def _load_models(self):
+        cfg = self.fake_config
+        gpu = FakeGPU(cfg["prefill_ms"], cfg["tokens_per_s"], cfg["gpu_slots"])
+        self.model_id = "fake-medgemma"
+        self._extractor = FakeExtractor(gpu, cfg["extract_tokens"])
+        self._synthesizer = FakeSynthesizer(gpu, cfg["synth_tokens"], cfg["chat_tokens"])
+        self._image_analyzer = FakeImageAnalyzer(gpu, cfg["image_tokens"])
+
+
+def install_fake_model(args):
+    """Must run before the app starts (it would otherwise load the real models)"""
+    FakeModelService.fake_config = {
+        "prefill_ms": args.prefill_ms,
+        "tokens_per_s": args.tokens_per_s,
+        "gpu_slots": args.gpu_slots,
+        "extract_tokens": args.extract_tokens,
+        "synth_tokens": args.synth_tokens,
+        "chat_tokens": args.chat_tokens,
+        "image_tokens": args.image_tokens,
+    }
+    ModelService._instance = FakeModelService()
+    ModelService._instance.load()
+
+
+# ---------------------------------------------------------------------------
+# Measurement
+# ---------------------------------------------------------------------------
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    k = math.ceil(q / 100 * len(sorted_values)) - 1
+    return sorted_values[max(0, min(len(sorted_values) - 1, k))]
+
+
+def summarize(values: List[float]) -> Dict[str, float]:
+    values = sorted(values)
+    return {
+        "p50": round(percentile(values, 50), 2),
+        "p95": round(percentile(values, 95), 2),
+        "p99": round(percentile(values, 99), 2),
+        "max": round(values[-1], 2) if values else 0.0,
+    }
+
+
+class LoopLagMonitor:
+    """Samples how late the event loop wakes up from a fixed-interval sleep"""
+
+    def __init__(self, interval_s: float = 0.01):
+        self.interval_s = interval_s
+        self.samples_ms: List[float] = []
+        self._task = None
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval_s
+            await asyncio.sleep(self.interval_s)
+            self.samples_ms.append(max(0.0, (loop.time() - expected) * 1000))
+
+    def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+
+
+class Recorder:
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.statuses: Dict[str, Counter] = defaultdict(Counter)
+
+    def record(self, op: str, status, elapsed_ms: float):
+        self.statuses[op][str(status)] += 1
+        if status in (200, 202):
+            self.latencies[op].append(elapsed_ms)
+
+
+# ---------------------------------------------------------------------------
+# Workload
+# ---------------------------------------------------------------------------
+
+def parse_mix(spec: str) -> Dict[str, float]:
+    mix = {}
+    for part in spec.split(","):
+        name, _, weight = part.partition("=")
+        if name not in OPERATIONS:
+            raise SystemExit(f"Unknown operation '{name}' (choose from {', '.join(OPERATIONS)})")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+def sample_png() -> bytes:
+    buf = io.BytesIO()
+    Image.new("L", (512, 512), color=90).save(buf, format="PNG")
+    return buf.getvalue()
+
+
+async def op_create(client: httpx.AsyncClient, rng: random.Random, ctx: dict):
+    owner = rng.choice(OWNERS)
+    text = f"{SAMPLE_REPORT}\nAccession {rng.getrandbits(48)}"
+    return await client.post("/api/v1/reports", json={"owner": owner, "report_text": text})
+
+
+async def op_list(client: httpx.AsyncClient, rng: random.Random, ctx: dict):
+    return await client.get("/api/v1/reports", params={"viewer": rng.choice(OWNERS)})
+
+
+async def op_chat(client: httpx.AsyncClient, rng: random.Random, ctx: dict):
+    message = f"Is a 6 mm lung nodule dangerous? (question {rng.getrandbits(32)})"
+    return await client.post("/api/v1/chat/consult", json={"message": message, "viewer": rng.choice(OWNERS)})
+
+
+async def op_image(client: httpx.AsyncClient, rng: random.Random, ctx: dict):
+    files = {"image": ("scan.png", ctx["png"], "image/png")}
+    data = {"prompt": f"Describe this image ({rng.getrandbits(32)})", "max_new_tokens": "400"}
+    return await client.post("/api/v1/models/analyze-image", files=files, data=data)
+
+
+OPERATIONS = {"create": op_create, "list": op_list, "chat": op_chat, "image": op_image}
+
+
+async def virtual_user(client, rng, mix, deadline, recorder, ctx):
+    names, weights = list(mix), list(mix.values())
+    while time.monotonic() < deadline:
+        op = rng.choices(names, weights)[0]
+        start = time.perf_counter()
+        try:
+            response = await OPERATIONS[op](client, rng, ctx)
+            status = response.status_code
+        except httpx.HTTPError as e:
+            status = type(e).__name__
+        recorder.record(op, status, (time.perf_counter() - start) * 1000)
+
+
+async def wait_for_drain(client: httpx.AsyncClient, timeout_s: float) -> float:
+    """Wait until background report processing has finished; returns seconds waited"""
+    start = time.monotonic()
+    while time.monotonic() - start < timeout_s:
+        stats = (await client.get("/api/v1/health/admission")).json()
+        if stats["in_flight"] == 0 and stats["queued"] == 0:
+            break
+        await asyncio.sleep(0.1)
+    return time.monotonic() - start
+
+
+async def run(args) -> dict:
+    install_fake_model(args)
+
+    import utils.db
+    utils.db.DB_PATH = str(Path(tempfile.mkdtemp(prefix="fhc-load-")) / "load.db")
+    if not args.keep_rate_limits:
+        # Measure the pipeline, not the per-owner token buckets
+        settings.REPORT_RATE_PER_MIN = settings.CHAT_RATE_PER_MIN = 1e9
+        settings.REPORT_RATE_BURST = settings.CHAT_RATE_BURST = 10 ** 9
+
+    from app.main import app
+
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=args.port, log_level="warning"))
+    serve_task = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.01)
+    port = server.servers[0].sockets[0].getsockname()[1]
+
+    mix = parse_mix(args.mix)
+    recorder = Recorder()
+    monitor = LoopLagMonitor()
+    ctx = {"png": sample_png()}
+    limits = httpx.Limits(max_connections=args.concurrency * 2)
+
+    async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", timeout=args.timeout, limits=limits) as client:
+        monitor.start()
+        started = time.monotonic()
+        deadline = started + args.duration
+        await asyncio.gather(*(
+            virtual_user(client, random.Random(args.seed + i), mix, deadline, recorder, ctx)
+            for i in range(args.concurrency)
+        ))
+        elapsed = time.monotonic() - started
+        drain_s = await wait_for_drain(client, args.drain_timeout)
+        await monitor.stop()
+        admission = (await client.get("/api/v1/health/admission")).json()
+
+    server.should_exit = True
+    await serve_task
+
+    ops = {}
+    for op in mix:
+        ok = recorder.latencies[op]
+        ops[op] = {
+            "requests": sum(recorder.statuses[op].values()),
+            "ok": len(ok),
+            "throughput_rps": round(len(ok) / elapsed, 2),
+            "latency_ms": summarize(ok),
+            "statuses": dict(recorder.statuses[op]),
+        }
+
+    return {
+        "config": {k: v for k, v in vars(args).items() if k not in ("save_baseline", "compare", "verbose")},
+        "duration_s": round(elapsed, 2),
+        "throughput_rps": round(sum(o["ok"] for o in ops.values()) / elapsed, 2),
+        "operations": ops,
+        "loop_lag_ms": summarize(monitor.samples_ms),
+        "background_drain_s": round(drain_s, 2),
+        "admission": admission,
+    }
+
+
+# ---------------------------------------------------------------------------
+# Reporting
+# ---------------------------------------------------------------------------
+
+def print_report(result: dict):
+    print(f"{'operation':<10} {'ok':>6} {'rps':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}  statuses")
+    for name, op in result["operations"].items():
+        lat = op["latency_ms"]
+        statuses = ", ".join(f"{k}:{v}" for k, v in sorted(op["statuses"].items()))
+        print(f"{name:<10} {op['ok']:>6} {op['throughput_rps']:>8.2f} {lat['p50']:>9.1f} "
+              f"{lat['p95']:>9.1f} {lat['p99']:>9.1f} {lat['max']:>9.1f}  {statuses}")
+    lag = result["loop_lag_ms"]
+    print(f"\ntotal throughput: {result['throughput_rps']:.2f} req/s over {result['duration_s']} s")
+    print(f"event-loop lag:   p50 {lag['p50']:.1f} ms, p99 {lag['p99']:.1f} ms, max {lag['max']:.1f} ms")
+    print(f"background drain: {result['background_drain_s']:.2f} s")
+
+
+def compare(result: dict, baseline: dict, tolerance: float) -> bool:
+    """Print deltas against a baseline; False when something regressed"""
+    ok = True
+    print(f"\nvs baseline (tolerance {tolerance:.0%}):")
+    for name, op in result["operations"].items():
+        base = baseline["operations"].get(name)
+        if not base or not base["ok"]:
+            continue
+        p95, base_p95 = op["latency_ms"]["p95"], base["latency_ms"]["p95"]
+        rps, base_rps = op["throughput_rps"], base["throughput_rps"]
+        slower = base_p95 and p95 > base_p95 * (1 + tolerance)
+        fewer = base_rps and rps < base_rps * (1 - tolerance)
+        flag = "REGRESSION" if slower or fewer else "ok"
+        ok = ok and not (slower or fewer)
+        print(f"  {name:<10} p95 {base_p95:.1f} -> {p95:.1f} ms, rps {base_rps:.2f} -> {rps:.2f}  {flag}")
+    base_lag, lag = baseline["loop_lag_ms"]["p99"], result["loop_lag_ms"]["p99"]
+    print(f"  loop lag p99 {base_lag:.1f} -> {lag:.1f} ms")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, default=16, help="Virtual users")
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds of load")
+    parser.add_argument("--mix", default="create=1,list=4,chat=2,image=1", help="Weighted operation mix")
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--port", type=int, default=0, help="Loopback port (0 = any free port)")
+    parser.add_argument("--timeout", type=float, default=120.0, help="Client timeout per request (s)")
+    parser.add_argument("--drain-timeout", type=float, default=120.0,
+                        help="Max wait for background processing after the run (s)")
+    parser.add_argument("--keep-rate-limits", action="store_true", help="Keep the configured per-owner limits")
+    parser.add_argument("--verbose", action="store_true", help="Show the server's own output")
+    fake = parser.add_argument_group("fake model")
+    fake.add_argument("--prefill-ms", type=float, default=50.0)
+    fake.add_argument("--tokens-per-s", type=float, default=200.0)
+    fake.add_argument("--gpu-slots", type=int, default=1, help="Generations that run at the same time")
+    fake.add_argument("--extract-tokens", type=int, default=300)
+    fake.add_argument("--synth-tokens", type=int, default=120)
+    fake.add_argument("--chat-tokens", type=int, default=150)
+    fake.add_argument("--image-tokens", type=int, default=200)
+    parser.add_argument("--save-baseline", metavar="NAME")
+    parser.add_argument("--compare", metavar="NAME")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    args = parser.parse_args()
+
+    # The pipeline prints progress per report; keep it out of the results
+    with open(os.devnull, "w") as devnull:
+        with contextlib.redirect_stdout(sys.stdout if args.verbose else devnull):
+            result = asyncio.run(run(args))
+    print_report(result)
+
+    if args.save_baseline:
+        BASELINE_DIR.mkdir(exist_ok=True)
+        path = BASELINE_DIR / f"{args.save_baseline}.json"
+        path.write_text(json.dumps(result, indent=2))
+        print(f"\nbaseline saved to {path}")
+
+    if args.compare:
+        baseline = json.loads((BASELINE_DIR / f"{args.compare}.json").read_text())
+        if not compare(result, baseline, args.tolerance):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
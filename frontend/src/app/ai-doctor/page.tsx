@@ -74,6 +74,7 @@ Please describe your symptoms or health concerns, and I'll do my best to provide
         },
         body: JSON.stringify({
           message: input,
+          viewer: localStorage.getItem("userEmail") || undefined,
           history: messages.slice(1).map((m) => ({
             role: m.role,
             content: m.content,
@@ -2,7 +2,7 @@
 
 import { useState, useEffect } from "react";
 import { useRouter } from "next/navigation";
-import { useReports } from "@/hooks/use-reports";
+import { useDashboardSummary, useReports, useReportEvents } from "@/hooks/use-reports";
 import { PageHeader } from "@/components/dashboard/header";
 import { MetricCard } from "@/components/dashboard/metric-card";
 import { ReportCard } from "@/components/reports/report-card";
@@ -14,6 +14,8 @@ export default function HomePage() {
   const router = useRouter();
   const [viewer, setViewer] = useState("alice");
   const { data: reports, isLoading, error } = useReports(viewer);
+  const { data: summary } = useDashboardSummary(viewer);
+  useReportEvents(viewer);
 
   useEffect(() => {
     const isAuthenticated = localStorage.getItem("isAuthenticated");
@@ -64,11 +66,12 @@ export default function HomePage() {
     );
   }
 
+  const byUrgency = summary?.by_urgency ?? {};
   const metrics = {
-    total: reports?.length || 0,
-    urgent: reports?.filter(r => r.urgency === "HIGH" || r.urgency === "EMERGENCY").length || 0,
-    routine: reports?.filter(r => r.urgency === "LOW").length || 0,
-    shared: reports?.filter(r => r.visibility !== "PRIVATE").length || 0,
+    total: summary?.total || 0,
+    urgent: (byUrgency.EMERGENT || 0) + (byUrgency.URGENT || 0),
+    routine: byUrgency.ROUTINE || 0,
+    shared: (summary?.total || 0) - (summary?.by_visibility.PRIVATE || 0),
   };
 
   return (
@@ -1,5 +1,6 @@
+import { useEffect } from "react";
 import { useQuery, useMutation, useQueryClient } from "@tanstack/react-query";
-import { reportsApi, type Report, type ReportCreate } from "@/lib/api";
+import { dashboardApi, reportsApi, type Report, type ReportCreate, type ReportEvent } from "@/lib/api";
 
 export function useReports(viewer: string) {
   return useQuery({
@@ -19,6 +20,20 @@ export function useReports(viewer: string) {
   });
 }
 
+/**
+ * Server-side dashboard counts (replaces aggregating the report list).
+ */
+export function useDashboardSummary(viewer: string) {
+  return useQuery({
+    queryKey: ["dashboard", viewer],
+    queryFn: async () => {
+      const response = await dashboardApi.summary(viewer);
+      return response.data;
+    },
+    enabled: !!viewer,
+  });
+}
+
 export function useReport(id: number) {
   return useQuery({
     queryKey: ["report", id],
@@ -37,6 +52,7 @@ export function useCreateReport() {
     mutationFn: (data: ReportCreate) => reportsApi.create(data),
     onSuccess: () => {
       queryClient.invalidateQueries({ queryKey: ["reports"] });
+      queryClient.invalidateQueries({ queryKey: ["dashboard"] });
     },
   });
 }
@@ -48,6 +64,68 @@ export function useDeleteReport() {
     mutationFn: (id: number) => reportsApi.delete(id),
     onSuccess: () => {
       queryClient.invalidateQueries({ queryKey: ["reports"] });
+      queryClient.invalidateQueries({ queryKey: ["dashboard"] });
     },
   });
 }
+
+/**
+ * Subscribe to report processing events for a viewer.
+ *
+ * Stage changes patch the cached list in place; on completion only the
+ * finished report is fetched and spliced into the list, so the full list
+ * (with all texts and views) is never re-polled. A "resync" event means
+ * events were missed, and triggers one list reload.
+ */
+export function useReportEvents(viewer: string) {
+  const queryClient = useQueryClient();
+
+  useEffect(() => {
+    if (!viewer) return;
+
+    const source = new EventSource(reportsApi.eventsUrl(viewer));
+
+    const patchList = (id: number, patch: Partial<Report>) => {
+      queryClient.setQueryData<Report[]>(["reports", viewer], (reports) =>
+        reports?.map((r) => (r.id === id ? { ...r, ...patch } : r))
+      );
+    };
+
+    const onReport = async (message: MessageEvent) => {
+      const event: ReportEvent = JSON.parse(message.data);
+      if (event.stage === "queued" || event.stage === "completed" || event.stage === "failed") {
+        queryClient.invalidateQueries({ queryKey: ["dashboard", viewer] });
+      }
+      const cached = queryClient.getQueryData<Report[]>(["reports", viewer]);
+
+      if (event.stage === "completed" || event.stage === "failed") {
+        const { data } = await reportsApi.get(event.report_id);
+        queryClient.setQueryData(["report", event.report_id], data);
+        if (cached?.some((r) => r.id === event.report_id)) {
+          patchList(event.report_id, data);
+        } else {
+          queryClient.invalidateQueries({ queryKey: ["reports", viewer] });
+        }
+      } else if (cached?.some((r) => r.id === event.report_id)) {
+        patchList(event.report_id, { status: "processing" });
+      } else if (event.stage === "queued") {
+        // A report created elsewhere (another tab or family member)
+        queryClient.invalidateQueries({ queryKey: ["reports", viewer] });
+      }
+    };
+
+    const onResync = () => {
+      queryClient.invalidateQueries({ queryKey: ["reports", viewer] });
+      queryClient.invalidateQueries({ queryKey: ["dashboard", viewer] });
+    };
+
+    source.addEventListener("report", onReport);
+    source.addEventListener("resync", onResync);
+
+    return () => {
+      source.removeEventListener("report", onReport);
+      source.removeEventListener("resync", onResync);
+      source.close();
+    };
+  }, [viewer, queryClient]);
+}
@@ -45,6 +45,24 @@ api.interceptors.response.use(
 );
 
 // Types
+export type ReportStage =
+  | "queued"
+  | "redacting"
+  | "extracting"
+  | "triage"
+  | "explaining"
+  | "completed"
+  | "failed";
+
+export interface ReportEvent {
+  report_id: number;
+  owner: string;
+  stage: ReportStage;
+  status: string;
+  urgency: string | null;
+  timestamp: number;
+}
+
 export interface Report {
   id: number;
   owner: string;
@@ -58,6 +76,74 @@ export interface Report {
   family_view: string | null;
 }
 
+export interface ReportSearchHit {
+  id: number;
+  owner: string;
+  visibility: string;
+  urgency: string;
+  status: string;
+  created_at: string;
+  score: number;
+  snippet: string; // HTML-escaped, matches wrapped in <mark>
+}
+
+export interface ReportSearchResponse {
+  query: string;
+  total: number;
+  limit: number;
+  offset: number;
+  results: ReportSearchHit[];
+}
+
+export interface FindingOccurrence {
+  report_id: number;
+  owner: string;
+  created_at: string;
+  kind: 'entity' | 'flag';
+  name: string;
+  status: string | null; // certainty (entities) or status (flags)
+  anatomy: string | null;
+  severity: string | null;
+  temporal: string | null;
+  evidence: string | null;
+  urgency: string;
+  visibility: string;
+}
+
+export interface DashboardMember {
+  owner: string;
+  total: number;
+  by_urgency: Record<string, number>;
+  processing: number;
+  failed: number;
+  latest: { report_id: number; created_at: string; urgency: string; status: string } | null;
+}
+
+export interface DashboardSummary {
+  viewer: string;
+  total: number;
+  by_urgency: Record<string, number>;
+  by_visibility: Record<string, number>;
+  by_status: Record<string, number>;
+  members: DashboardMember[];
+  backlog: { processing: number; failed: number };
+}
+
+export type ReminderStatus = 'pending' | 'due' | 'done' | 'dismissed';
+
+export interface Reminder {
+  id: number;
+  owner: string;
+  title: string;
+  due_date: string | null; // UTC
+  status: ReminderStatus;
+  created_at: string;
+  report_id: number | null;
+  notes: string | null;
+  source: 'manual' | 'recommendation';
+  fired_at: string | null;
+}
+
 export interface ReportCreate {
   owner: string;
   visibility: string;
@@ -81,11 +167,13 @@ export interface ExtractedData {
     severity: string;
     temporal: string;
     evidence: string;
+    evidence_span?: [number, number] | null;
   }>;
   critical_flags: Array<{
     flag: string;
     status: string;
     evidence: string;
+    evidence_span?: [number, number] | null;
   }>;
   quality_checks: {
     json_valid: boolean;
@@ -116,8 +204,9 @@ export interface ImageAnalysisResponse {
 
 // Reports API
 export const reportsApi = {
+  // The list views never show the extraction, so skip loading it
   list: (viewer: string) =>
-    api.get<Report[]>(`/reports?viewer=${viewer}`),
+    api.get<Report[]>(`/reports?viewer=${viewer}&include_extracted=false`),
 
   get: (id: number) =>
     api.get<Report>(`/reports/${id}`),
@@ -127,6 +216,44 @@ export const reportsApi = {
 
   delete: (id: number) =>
     api.delete<{ message: string }>(`/reports/${id}`),
+
+  search: (viewer: string, q: string, offset = 0, limit = 20) =>
+    api.get<ReportSearchResponse>('/reports/search', { params: { viewer, q, offset, limit } }),
+
+  // Server-sent events: per-report stage and completion updates
+  eventsUrl: (viewer: string) =>
+    `${API_BASE_URL}/reports/events?viewer=${encodeURIComponent(viewer)}`,
+};
+
+// Findings API (normalized entities and critical flags)
+export const findingsApi = {
+  list: (viewer: string, term: string, kind: 'entity' | 'flag' = 'entity', status?: string) =>
+    api.get<FindingOccurrence[]>('/findings', { params: { viewer, term, kind, status } }),
+
+  timeline: (owner: string, viewer: string, term: string) =>
+    api.get<{ owner: string; term: string; occurrences: FindingOccurrence[] }>(
+      `/timeline/${encodeURIComponent(owner)}`, { params: { viewer, term } }),
+};
+
+// Dashboard API
+export const dashboardApi = {
+  summary: (viewer: string) =>
+    api.get<DashboardSummary>('/dashboard/summary', { params: { viewer } }),
+};
+
+// Reminders API
+export const remindersApi = {
+  list: (viewer: string, status?: ReminderStatus) =>
+    api.get<Reminder[]>('/reminders', { params: { viewer, status } }),
+
+  create: (data: { owner: string; title: string; due_date?: string; report_id?: number; notes?: string }) =>
+    api.post<Reminder>('/reminders', data),
+
+  update: (id: number, data: Partial<Pick<Reminder, 'title' | 'due_date' | 'status' | 'notes'>>) =>
+    api.patch<Reminder>(`/reminders/${id}`, data),
+
+  delete: (id: number) =>
+    api.delete<{ message: string }>(`/reminders/${id}`),
 };
 
 // Models API
@@ -34,14 +34,15 @@ else
     # Start backend in background
     nohup python -m uvicorn app.main:app --host 0.0.0.0 --port 8003 > /tmp/backend_server.log 2>&1 &
     echo "⏳ Waiting for backend to start..."
-    sleep 5
+    sleep 1
 
-    # Wait for backend to be actually ready (not just port open)
+    # The API answers /health/live within a second; /health/ready returns
+    # 200 only once the models have loaded in the background
     echo "🔄 Waiting for backend models to load (this may take 1-2 minutes)..."
     MAX_WAIT=120  # 2 minutes
     WAIT_TIME=0
     while [ $WAIT_TIME -lt $MAX_WAIT ]; do
-        if curl -s http://127.0.0.1:8003/health > /dev/null 2>&1; then
+        if curl -sf http://127.0.0.1:8003/api/v1/health/ready > /dev/null 2>&1; then
             echo "✅ Backend is ready and models are loaded!"
             break
         fi
@@ -1,9 +1,17 @@
+import os
+import re
 import sqlite3
-from typing import Optional, Dict, Any
+import zlib
+from typing import Optional, Dict, Any, List, Tuple, Union
 import json
 from datetime import datetime
 from pathlib import Path
 
+try:
+    import zstandard
+except ImportError:  # optional dependency
+    zstandard = None
+
 # Use backend database directory
 PROJECT_ROOT = Path(__file__).parent
 DB_PATH = str(PROJECT_ROOT / "backend" / "family_health.db")
@@ -12,6 +20,114 @@ DB_PATH = str(PROJECT_ROOT / "backend" / "family_health.db")
 if not Path(DB_PATH).exists():
     DB_PATH = str(PROJECT_ROOT / "family_health.db")
 
+# Storage format for reports.extracted_json: "json" (plain text, default),
+# "zlib" (compressed compact JSON, stdlib) or "zstd" (needs `zstandard`).
+# Reads always accept every format, so the setting can be changed at any time.
+EXTRACTED_FORMAT = os.environ.get("EXTRACTED_JSON_FORMAT", "json").lower()
+
+_ZLIB_MAGIC = b"\x00ZL1"
+_ZSTD_MAGIC = b"\x00ZS1"
+_format_warnings = set()
+
+
+def _warn_format_fallback(fmt: str, reason: str):
+    """Say once per format that it is stored as zlib instead"""
+    if fmt not in _format_warnings:
+        _format_warnings.add(fmt)
+        print(f"⚠️ EXTRACTED_JSON_FORMAT={fmt!r}: {reason}; storing zlib instead")
+
+
+def encode_extracted(extracted: Optional[Dict[str, Any]],
+                     fmt: Optional[str] = None) -> Optional[Union[str, bytes]]:
+    """
+    Serialize extracted data for the extracted_json column.
+
+    Returns:
+        JSON text, a compressed BLOB, or None when there is nothing to store
+    """
+    if not extracted:
+        return None
+    fmt = (fmt or EXTRACTED_FORMAT)
+    if fmt == "json":
+        return json.dumps(extracted, ensure_ascii=False)
+
+    payload = json.dumps(extracted, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    if fmt == "zstd":
+        if zstandard is not None:
+            return _ZSTD_MAGIC + zstandard.ZstdCompressor(level=9).compress(payload)
+        _warn_format_fallback(fmt, "the 'zstandard' package is not installed")
+    elif fmt != "zlib":
+        _warn_format_fallback(fmt, "unknown format")
+    return _ZLIB_MAGIC + zlib.compress(payload, 9)
+
+
+def decode_extracted(value: Optional[Union[str, bytes]]) -> Optional[Dict[str, Any]]:
+    """Deserialize an extracted_json column value in any supported format."""
+    if not value:
+        return None
+    if isinstance(value, str):
+        return json.loads(value)
+    value = bytes(value)
+    if value.startswith(_ZLIB_MAGIC):
+        return json.loads(zlib.decompress(value[len(_ZLIB_MAGIC):]))
+    if value.startswith(_ZSTD_MAGIC):
+        if zstandard is None:
+            raise RuntimeError("zstd-compressed extracted_json requires the 'zstandard' package")
+        return json.loads(zstandard.ZstdDecompressor().decompress(value[len(_ZSTD_MAGIC):]))
+    return json.loads(value.decode("utf-8"))
+
+
+def extracted_json_bytes(value: Optional[Union[str, bytes]]) -> Optional[bytes]:
+    """
+    Raw JSON text of an extracted_json column value, without parsing it.
+
+    Every format stores JSON produced by encode_extracted, so the bytes can
+    be embedded as-is into a response body.
+    """
+    if not value:
+        return None
+    if isinstance(value, str):
+        return value.encode("utf-8")
+    value = bytes(value)
+    if value.startswith(_ZLIB_MAGIC):
+        return zlib.decompress(value[len(_ZLIB_MAGIC):])
+    if value.startswith(_ZSTD_MAGIC):
+        if zstandard is None:
+            raise RuntimeError("zstd-compressed extracted_json requires the 'zstandard' package")
+        return zstandard.ZstdDecompressor().decompress(value[len(_ZSTD_MAGIC):])
+    return value
+
+
+def compact_extracted_json(fmt: Optional[str] = None, batch_size: int = 500) -> int:
+    """
+    Re-encode existing extracted_json rows into the given storage format.
+
+    Returns:
+        Number of rows rewritten
+    """
+    fmt = fmt or EXTRACTED_FORMAT
+    conn = sqlite3.connect(DB_PATH)
+    cur = conn.cursor()
+    rewritten = 0
+    last_id = 0
+    while True:
+        cur.execute("""
+        SELECT id, extracted_json FROM reports
+        WHERE id > ? AND extracted_json IS NOT NULL
+        ORDER BY id LIMIT ?
+        """, (last_id, batch_size))
+        rows = cur.fetchall()
+        if not rows:
+            break
+        updates = [(encode_extracted(decode_extracted(value), fmt), rid) for rid, value in rows]
+        cur.executemany("UPDATE reports SET extracted_json = ? WHERE id = ?", updates)
+        rewritten += len(updates)
+        last_id = rows[-1][0]
+    conn.commit()
+    conn.close()
+    return rewritten
+
+
 def init_db():
     """
     Initialize database and create tables if they don't exist.
@@ -45,9 +161,19 @@ def init_db():
             patient_view TEXT,
             family_view TEXT,
             urgency TEXT,
-            created_at TEXT NOT NULL
+            created_at TEXT NOT NULL,
+            status TEXT NOT NULL DEFAULT 'completed',
+            version INTEGER NOT NULL DEFAULT 1,
+            updated_at TEXT
         )
         """)
+        _migrate_reports(cur)
+        if _create_search_index(cur):
+            rebuild_search_index(cur)
+        if _create_finding_tables(cur):
+            rebuild_report_findings(cur)
+        if _create_summary_tables(cur):
+            rebuild_report_summary(cur)
 
         # Create reminders table
         cur.execute("""
@@ -57,9 +183,18 @@ def init_db():
             title TEXT NOT NULL,
             due_date TEXT,
             status TEXT NOT NULL,
-            created_at TEXT NOT NULL
+            created_at TEXT NOT NULL,
+            report_id INTEGER,
+            notes TEXT,
+            source TEXT NOT NULL DEFAULT 'manual',
+            fired_at TEXT
         )
         """)
+        _add_missing_columns(cur, "reminders", REMINDER_MIGRATIONS)
+        # Scheduler load and per-owner listing
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_reminders_pending ON reminders(status, due_date)")
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_reminders_owner ON reminders(owner, due_date)")
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_reminders_report ON reminders(report_id)")
 
         # Verify tables were created
         cur.execute("""
@@ -94,6 +229,595 @@ def init_db():
         }
 
 
+# Columns added after the first release: (name, definition)
+REPORT_MIGRATIONS = [
+    ("status", "TEXT NOT NULL DEFAULT 'completed'"),
+    # Bumped by every UPDATE of the row (ETags of report reads)
+    ("version", "INTEGER NOT NULL DEFAULT 1"),
+    ("updated_at", "TEXT"),
+]
+
+
+REMINDER_MIGRATIONS = [
+    ("report_id", "INTEGER"),
+    ("notes", "TEXT"),
+    # "manual" or "recommendation" (derived from a report's follow-up advice)
+    ("source", "TEXT NOT NULL DEFAULT 'manual'"),
+    ("fired_at", "TEXT"),
+]
+
+
+def _add_missing_columns(cur, table: str, migrations):
+    """Add any columns missing from an older database file"""
+    cur.execute(f"PRAGMA table_info({table})")
+    existing = {row[1] for row in cur.fetchall()}
+    for name, definition in migrations:
+        if name not in existing:
+            cur.execute(f"ALTER TABLE {table} ADD COLUMN {name} {definition}")
+
+
+def _migrate_reports(cur):
+    """Add any reports columns missing from an older database file"""
+    _add_missing_columns(cur, "reports", REPORT_MIGRATIONS)
+
+
+# Full-text search over reports (FTS5). Rows are (re)indexed by the
+# pipeline's write step, since findings/impression live inside the possibly
+# compressed extracted_json; deletes are synced by a trigger.
+SEARCH_COLUMNS = ("report_text", "findings", "impression", "patient_view", "family_view")
+# bm25 column weights, in SEARCH_COLUMNS order
+SEARCH_WEIGHTS = (1.0, 2.0, 3.0, 0.5, 0.5)
+# Snippet highlight delimiters (control characters, never in report text)
+SNIPPET_START, SNIPPET_END = "\x02", "\x03"
+
+
+def _create_search_index(cur) -> bool:
+    """
+    Create the FTS5 table and its delete trigger if missing
+
+    Returns:
+        True if the table was just created (and needs a backfill)
+    """
+    cur.execute("SELECT 1 FROM sqlite_master WHERE type='table' AND name='reports_fts'")
+    if cur.fetchone():
+        return False
+    try:
+        cur.execute(f"""
+        CREATE VIRTUAL TABLE reports_fts USING fts5(
+            {", ".join(SEARCH_COLUMNS)},
+            tokenize = 'porter unicode61 remove_diacritics 2'
+        )
+        """)
+    except sqlite3.OperationalError as e:
+        print(f"⚠️ Full-text search unavailable (SQLite without FTS5?): {e}")
+        return False
+    cur.execute("""
+    CREATE TRIGGER IF NOT EXISTS reports_fts_delete AFTER DELETE ON reports BEGIN
+        DELETE FROM reports_fts WHERE rowid = old.id;
+    END
+    """)
+    return True
+
+
+def _search_text(value: Any) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, str):
+        return value
+    if isinstance(value, list):
+        return "\n".join(_search_text(v) for v in value)
+    return json.dumps(value, ensure_ascii=False)
+
+
+def index_report_search(cur, report_id: int):
+    """
+    (Re)index one report for full-text search
+
+    Call with the cursor of the write that changed the report, before its
+    commit, so the index is updated in the same transaction.
+    """
+    cur.execute("""
+    SELECT report_text, extracted_json, patient_view, family_view FROM reports WHERE id = ?
+    """, (report_id,))
+    row = cur.fetchone()
+    try:
+        cur.execute("DELETE FROM reports_fts WHERE rowid = ?", (report_id,))
+        if row is None:
+            return
+        text, extracted_json, pview, fview = row
+        extracted = decode_extracted(extracted_json) or {}
+        cur.execute("""
+        INSERT INTO reports_fts(rowid, report_text, findings, impression, patient_view, family_view)
+        VALUES (?, ?, ?, ?, ?, ?)
+        """, (report_id, text or "", _search_text(extracted.get("findings")),
+              _search_text(extracted.get("impression")), pview or "", fview or ""))
+    except sqlite3.OperationalError as e:
+        # No FTS5 in this SQLite build: search is disabled, writes still succeed
+        print(f"⚠️ Could not index report {report_id} for search: {e}")
+
+
+def rebuild_search_index(cur=None) -> int:
+    """
+    Reindex every completed report
+
+    Returns:
+        Number of reports indexed
+    """
+    conn = None
+    if cur is None:
+        conn = sqlite3.connect(DB_PATH)
+        cur = conn.cursor()
+    cur.execute("DELETE FROM reports_fts")
+    cur.execute("SELECT id FROM reports WHERE status = 'completed' ORDER BY id")
+    report_ids = [row[0] for row in cur.fetchall()]
+    for report_id in report_ids:
+        index_report_search(cur, report_id)
+    if conn is not None:
+        conn.commit()
+        conn.close()
+    return len(report_ids)
+
+
+def search_match_expression(query: str, match_all: bool = True) -> Optional[str]:
+    """
+    FTS5 MATCH expression for free text
+
+    Words are quoted (so user input can't use FTS5 syntax) and combined
+    with AND (or OR); the last word also matches as a prefix.
+
+    Returns:
+        The expression, or None if the query has no words
+    """
+    words = re.findall(r"\w+", query, re.UNICODE)
+    if not words:
+        return None
+    terms = [f'"{word}"' for word in words]
+    terms[-1] += "*"
+    return (" AND " if match_all else " OR ").join(terms)
+
+
+def search_reports(viewer: str, query: str, limit: int = 20, offset: int = 0,
+                   match_all: bool = True) -> Tuple[int, List[Dict[str, Any]]]:
+    """
+    Ranked full-text search over the reports a viewer may see
+
+    Same visibility rules as the report list: admin sees everything, others
+    their own reports plus shared ones.
+
+    Returns:
+        (total number of matches, one page of hits best first); snippets
+        mark matches with SNIPPET_START / SNIPPET_END
+    """
+    expression = search_match_expression(query, match_all)
+    if expression is None:
+        return 0, []
+
+    where, params = "reports_fts MATCH ?", [expression]
+    if viewer != "admin":
+        where += " AND (r.owner = ? OR r.visibility IN ('SHARED_SUMMARY', 'CAREGIVER'))"
+        params.append(viewer)
+
+    conn = sqlite3.connect(DB_PATH)
+    cur = conn.cursor()
+    cur.execute(f"""
+    SELECT COUNT(*) FROM reports_fts JOIN reports r ON r.id = reports_fts.rowid WHERE {where}
+    """, params)
+    total = cur.fetchone()[0]
+    weights = ", ".join(str(w) for w in SEARCH_WEIGHTS)
+    cur.execute(f"""
+    SELECT r.id, r.owner, r.visibility, r.urgency, r.created_at, r.status,
+           bm25(reports_fts, {weights}) AS rank,
+           snippet(reports_fts, -1, ?, ?, '…', 16)
+    FROM reports_fts JOIN reports r ON r.id = reports_fts.rowid
+    WHERE {where}
+    ORDER BY rank
+    LIMIT ? OFFSET ?
+    """, [SNIPPET_START, SNIPPET_END] + params + [limit, offset])
+    rows = cur.fetchall()
+    conn.close()
+
+    hits = [
+        {
+            "id": rid, "owner": owner, "visibility": vis, "urgency": urg or "UNKNOWN",
+            "created_at": ts, "status": status, "score": -rank, "snippet": snippet,
+        }
+        for rid, owner, vis, urg, ts, status, rank, snippet in rows
+    ]
+    return total, hits
+
+
+# Entities and critical flags of each report's extraction, normalized into
+# indexed child tables for longitudinal queries. owner and created_at are
+# copied from the report (neither ever changes) so per-member timelines are
+# answered from the index alone. Written by the pipeline's write step with
+# the report row; deletes are synced by a trigger.
+FINDING_TABLES_SQL = [
+    """
+    CREATE TABLE IF NOT EXISTS report_entities (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        report_id INTEGER NOT NULL,
+        owner TEXT NOT NULL,
+        created_at TEXT NOT NULL,
+        entity TEXT NOT NULL,
+        anatomy TEXT,
+        certainty TEXT,
+        severity TEXT,
+        temporal TEXT,
+        evidence TEXT
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_entities_report ON report_entities(report_id)",
+    "CREATE INDEX IF NOT EXISTS idx_entities_entity ON report_entities(entity, certainty)",
+    "CREATE INDEX IF NOT EXISTS idx_entities_owner ON report_entities(owner, entity, created_at)",
+    "CREATE INDEX IF NOT EXISTS idx_entities_anatomy ON report_entities(anatomy, entity)",
+    """
+    CREATE TABLE IF NOT EXISTS report_flags (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        report_id INTEGER NOT NULL,
+        owner TEXT NOT NULL,
+        created_at TEXT NOT NULL,
+        flag TEXT NOT NULL,
+        status TEXT,
+        evidence TEXT
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_flags_report ON report_flags(report_id)",
+    "CREATE INDEX IF NOT EXISTS idx_flags_flag ON report_flags(flag, status)",
+    "CREATE INDEX IF NOT EXISTS idx_flags_owner ON report_flags(owner, flag, created_at)",
+    """
+    CREATE TRIGGER IF NOT EXISTS report_findings_delete AFTER DELETE ON reports BEGIN
+        DELETE FROM report_entities WHERE report_id = old.id;
+        DELETE FROM report_flags WHERE report_id = old.id;
+    END
+    """,
+]
+
+
+def normalize_term(value: Any) -> Optional[str]:
+    """Canonical form of an entity, flag or anatomy name ("Right  Upper Lobe" -> "right upper lobe")"""
+    if not isinstance(value, str):
+        return None
+    value = " ".join(value.replace("_", " ").split()).lower()
+    return value or None
+
+
+def _create_finding_tables(cur) -> bool:
+    """
+    Create the entity/flag tables if missing
+
+    Returns:
+        True if they were just created (and need a backfill)
+    """
+    cur.execute("SELECT 1 FROM sqlite_master WHERE type='table' AND name='report_entities'")
+    created = cur.fetchone() is None
+    for statement in FINDING_TABLES_SQL:
+        cur.execute(statement)
+    return created
+
+
+def index_report_findings(cur, report_id: int):
+    """
+    Rewrite the entity/flag rows of one report from its extraction
+
+    Call with the cursor of the write that changed the report, before its
+    commit.
+    """
+    cur.execute("DELETE FROM report_entities WHERE report_id = ?", (report_id,))
+    cur.execute("DELETE FROM report_flags WHERE report_id = ?", (report_id,))
+    cur.execute("SELECT owner, created_at, extracted_json FROM reports WHERE id = ?", (report_id,))
+    row = cur.fetchone()
+    if row is None:
+        return
+    owner, created_at, extracted_json = row
+    try:
+        extracted = decode_extracted(extracted_json) or {}
+    except Exception as e:
+        print(f"⚠️ Could not index findings of report {report_id}: {e}")
+        return
+
+    entities = [
+        (report_id, owner, created_at, normalize_term(e.get("entity")), normalize_term(e.get("anatomy")),
+         normalize_term(e.get("certainty")), normalize_term(e.get("severity")),
+         normalize_term(e.get("temporal")), e.get("evidence") or None)
+        for e in extracted.get("entities") or [] if isinstance(e, dict)
+    ]
+    flags = [
+        (report_id, owner, created_at, normalize_term(f.get("flag")),
+         normalize_term(f.get("status")), f.get("evidence") or None)
+        for f in extracted.get("critical_flags") or [] if isinstance(f, dict)
+    ]
+    cur.executemany("""
+    INSERT INTO report_entities(report_id, owner, created_at, entity, anatomy, certainty, severity, temporal, evidence)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """, [e for e in entities if e[3]])
+    cur.executemany("""
+    INSERT INTO report_flags(report_id, owner, created_at, flag, status, evidence)
+    VALUES (?, ?, ?, ?, ?, ?)
+    """, [f for f in flags if f[3]])
+
+
+def rebuild_report_findings(cur=None) -> int:
+    """
+    Backfill the entity/flag tables from every stored extraction
+
+    Returns:
+        Number of reports indexed
+    """
+    conn = None
+    if cur is None:
+        conn = sqlite3.connect(DB_PATH)
+        cur = conn.cursor()
+    cur.execute("SELECT id FROM reports WHERE extracted_json IS NOT NULL ORDER BY id")
+    report_ids = [row[0] for row in cur.fetchall()]
+    for report_id in report_ids:
+        index_report_findings(cur, report_id)
+    if conn is not None:
+        conn.commit()
+        conn.close()
+    return len(report_ids)
+
+
+def reindex_report(cur, report_id: int):
+    """Refresh everything derived from a report row (search index, entities, flags)"""
+    index_report_search(cur, report_id)
+    index_report_findings(cur, report_id)
+
+
+def _term_filter(column: str, term: str, prefix: bool) -> Tuple[str, List[str]]:
+    """Exact or (index-friendly) prefix match on a normalized column"""
+    if prefix:
+        return f"{column} >= ? AND {column} < ?", [term, term + "\uffff"]
+    return f"{column} = ?", [term]
+
+
+_VISIBLE = "(r.owner = ? OR r.visibility IN ('SHARED_SUMMARY', 'CAREGIVER'))"
+
+
+def find_findings(viewer: str, kind: str, term: str, status: Optional[str] = None,
+                  anatomy: Optional[str] = None, owner: Optional[str] = None,
+                  prefix: bool = False, limit: int = 50, offset: int = 0,
+                  newest_first: bool = True) -> List[Dict[str, Any]]:
+    """
+    Occurrences of an entity or critical flag across the reports a viewer may see
+
+    Args:
+        viewer: Requesting user (admin sees all, others own + shared reports)
+        kind: "entity" or "flag"
+        term: Entity or flag name (normalized before matching)
+        status: Certainty (entities) or status (flags), e.g. "present", "suspected"
+        anatomy: Anatomy filter (entities only)
+        owner: Restrict to one family member (their timeline)
+        prefix: Match names starting with the term
+        newest_first: Order by report date, newest (True) or oldest first
+
+    Returns:
+        One dict per occurrence, joined with the report's urgency and visibility
+    """
+    term = normalize_term(term)
+    if not term:
+        return []
+    if kind == "flag":
+        table, name_col, status_col = "report_flags", "flag", "status"
+        extra_cols = "NULL, NULL, NULL"
+    else:
+        table, name_col, status_col = "report_entities", "entity", "certainty"
+        extra_cols = "f.anatomy, f.severity, f.temporal"
+
+    where, params = _term_filter(f"f.{name_col}", term, prefix)
+    conditions, params = [where], list(params)
+    if status:
+        conditions.append(f"f.{status_col} = ?")
+        params.append(normalize_term(status))
+    if anatomy and kind != "flag":
+        conditions.append("f.anatomy = ?")
+        params.append(normalize_term(anatomy))
+    if owner:
+        conditions.append("f.owner = ?")
+        params.append(owner)
+    if viewer != "admin":
+        conditions.append(_VISIBLE)
+        params.append(viewer)
+
+    conn = sqlite3.connect(DB_PATH)
+    cur = conn.cursor()
+    cur.execute(f"""
+    SELECT f.report_id, f.owner, f.created_at, f.{name_col}, f.{status_col}, {extra_cols}, f.evidence,
+           r.urgency, r.visibility
+    FROM {table} f JOIN reports r ON r.id = f.report_id
+    WHERE {" AND ".join(conditions)}
+    ORDER BY f.created_at {"DESC" if newest_first else "ASC"}, f.report_id
+    LIMIT ? OFFSET ?
+    """, params + [limit, offset])
+    rows = cur.fetchall()
+    conn.close()
+
+    return [
+        {
+            "report_id": rid, "owner": rowner, "created_at": ts, "kind": kind, "name": name,
+            "status": st, "anatomy": anat, "severity": sev, "temporal": temp, "evidence": ev,
+            "urgency": urg or "UNKNOWN", "visibility": vis,
+        }
+        for rid, rowner, ts, name, st, anat, sev, temp, ev, urg, vis in rows
+    ]
+
+
+# Dashboard counters, maintained by triggers on every INSERT, UPDATE and
+# DELETE of reports so the summary is read from a handful of rows however
+# long the history: report_counts holds the number of reports per (owner,
+# urgency, visibility, status), report_latest the newest report per (owner,
+# visibility), which lets the summary respect visibility rules.
+SUMMARY_TABLES_SQL = [
+    """
+    CREATE TABLE IF NOT EXISTS report_counts (
+        owner TEXT NOT NULL,
+        urgency TEXT NOT NULL,
+        visibility TEXT NOT NULL,
+        status TEXT NOT NULL,
+        n INTEGER NOT NULL,
+        PRIMARY KEY (owner, urgency, visibility, status)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS report_latest (
+        owner TEXT NOT NULL,
+        visibility TEXT NOT NULL,
+        report_id INTEGER NOT NULL,
+        created_at TEXT NOT NULL,
+        urgency TEXT NOT NULL,
+        status TEXT NOT NULL,
+        PRIMARY KEY (owner, visibility)
+    )
+    """,
+    # Finds the next newest report when the latest one is deleted or moved
+    "CREATE INDEX IF NOT EXISTS idx_reports_owner_visibility ON reports(owner, visibility, id)",
+    """
+    CREATE TRIGGER IF NOT EXISTS report_summary_insert AFTER INSERT ON reports BEGIN
+        INSERT INTO report_counts(owner, urgency, visibility, status, n)
+        VALUES (new.owner, COALESCE(new.urgency, 'UNKNOWN'), new.visibility, new.status, 1)
+        ON CONFLICT(owner, urgency, visibility, status) DO UPDATE SET n = n + 1;
+        INSERT INTO report_latest(owner, visibility, report_id, created_at, urgency, status)
+        VALUES (new.owner, new.visibility, new.id, new.created_at, COALESCE(new.urgency, 'UNKNOWN'), new.status)
+        ON CONFLICT(owner, visibility) DO UPDATE SET
+            report_id = excluded.report_id, created_at = excluded.created_at,
+            urgency = excluded.urgency, status = excluded.status
+        WHERE excluded.report_id >= report_latest.report_id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS report_summary_update
+    AFTER UPDATE OF owner, urgency, visibility, status ON reports BEGIN
+        UPDATE report_counts SET n = n - 1
+        WHERE owner = old.owner AND urgency = COALESCE(old.urgency, 'UNKNOWN')
+          AND visibility = old.visibility AND status = old.status;
+        DELETE FROM report_counts
+        WHERE owner = old.owner AND urgency = COALESCE(old.urgency, 'UNKNOWN')
+          AND visibility = old.visibility AND status = old.status AND n <= 0;
+        INSERT INTO report_counts(owner, urgency, visibility, status, n)
+        VALUES (new.owner, COALESCE(new.urgency, 'UNKNOWN'), new.visibility, new.status, 1)
+        ON CONFLICT(owner, urgency, visibility, status) DO UPDATE SET n = n + 1;
+        DELETE FROM report_latest
+        WHERE owner = old.owner AND visibility = old.visibility AND report_id = old.id;
+        INSERT INTO report_latest(owner, visibility, report_id, created_at, urgency, status)
+        SELECT owner, visibility, id, created_at, COALESCE(urgency, 'UNKNOWN'), status FROM reports
+        WHERE owner = old.owner AND visibility = old.visibility
+        ORDER BY id DESC LIMIT 1
+        ON CONFLICT(owner, visibility) DO NOTHING;
+        INSERT INTO report_latest(owner, visibility, report_id, created_at, urgency, status)
+        VALUES (new.owner, new.visibility, new.id, new.created_at, COALESCE(new.urgency, 'UNKNOWN'), new.status)
+        ON CONFLICT(owner, visibility) DO UPDATE SET
+            report_id = excluded.report_id, created_at = excluded.created_at,
+            urgency = excluded.urgency, status = excluded.status
+        WHERE excluded.report_id >= report_latest.report_id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS report_summary_delete AFTER DELETE ON reports BEGIN
+        UPDATE report_counts SET n = n - 1
+        WHERE owner = old.owner AND urgency = COALESCE(old.urgency, 'UNKNOWN')
+          AND visibility = old.visibility AND status = old.status;
+        DELETE FROM report_counts
+        WHERE owner = old.owner AND urgency = COALESCE(old.urgency, 'UNKNOWN')
+          AND visibility = old.visibility AND status = old.status AND n <= 0;
+        DELETE FROM report_latest
+        WHERE owner = old.owner AND visibility = old.visibility AND report_id = old.id;
+        INSERT INTO report_latest(owner, visibility, report_id, created_at, urgency, status)
+        SELECT owner, visibility, id, created_at, COALESCE(urgency, 'UNKNOWN'), status FROM reports
+        WHERE owner = old.owner AND visibility = old.visibility
+        ORDER BY id DESC LIMIT 1
+        ON CONFLICT(owner, visibility) DO NOTHING;
+    END
+    """,
+]
+
+
+def _create_summary_tables(cur) -> bool:
+    """
+    Create the dashboard counter tables and their triggers if missing
+
+    Returns:
+        True if they were just created (and need a backfill)
+    """
+    cur.execute("SELECT 1 FROM sqlite_master WHERE type='table' AND name='report_counts'")
+    created = cur.fetchone() is None
+    for statement in SUMMARY_TABLES_SQL:
+        cur.execute(statement)
+    return created
+
+
+def rebuild_report_summary(cur=None):
+    """Recompute the dashboard counters from the reports table"""
+    conn = None
+    if cur is None:
+        conn = sqlite3.connect(DB_PATH)
+        cur = conn.cursor()
+    cur.execute("DELETE FROM report_counts")
+    cur.execute("DELETE FROM report_latest")
+    cur.execute("""
+    INSERT INTO report_counts(owner, urgency, visibility, status, n)
+    SELECT owner, COALESCE(urgency, 'UNKNOWN'), visibility, status, COUNT(*)
+    FROM reports GROUP BY 1, 2, 3, 4
+    """)
+    cur.execute("""
+    INSERT INTO report_latest(owner, visibility, report_id, created_at, urgency, status)
+    SELECT r.owner, r.visibility, r.id, r.created_at, COALESCE(r.urgency, 'UNKNOWN'), r.status
+    FROM reports r JOIN (SELECT MAX(id) AS id FROM reports GROUP BY owner, visibility) m ON r.id = m.id
+    """)
+    if conn is not None:
+        conn.commit()
+        conn.close()
+
+
+def dashboard_summary(viewer: str) -> Dict[str, Any]:
+    """
+    Report counts, latest report per member and processing backlog, read
+    from the trigger-maintained counters (cost independent of history size)
+
+    Same visibility rules as the report list: admin sees everything, others
+    their own reports plus shared ones.
+    """
+    where, params = "", ()
+    if viewer != "admin":
+        where, params = "WHERE owner = ? OR visibility IN ('SHARED_SUMMARY', 'CAREGIVER')", (viewer,)
+
+    conn = sqlite3.connect(DB_PATH)
+    cur = conn.cursor()
+    cur.execute(f"SELECT owner, urgency, visibility, status, n FROM report_counts {where}", params)
+    counts = cur.fetchall()
+    cur.execute(f"SELECT owner, report_id, created_at, urgency, status FROM report_latest {where}", params)
+    latest_rows = cur.fetchall()
+    conn.close()
+
+    def bump(d: Dict[str, int], key: str, n: int):
+        d[key] = d.get(key, 0) + n
+
+    summary = {"viewer": viewer, "total": 0, "by_urgency": {}, "by_visibility": {}, "by_status": {}}
+    members: Dict[str, Dict[str, Any]] = {}
+    for owner, urgency, visibility, status, n in counts:
+        member = members.setdefault(owner, {"owner": owner, "total": 0, "by_urgency": {},
+                                            "processing": 0, "failed": 0, "latest": None})
+        summary["total"] += n
+        member["total"] += n
+        bump(summary["by_urgency"], urgency, n)
+        bump(summary["by_visibility"], visibility, n)
+        bump(summary["by_status"], status, n)
+        bump(member["by_urgency"], urgency, n)
+        if status in ("processing", "failed"):
+            member[status] += n
+
+    for owner, report_id, created_at, urgency, status in latest_rows:
+        member = members.get(owner)
+        if member is not None and (member["latest"] is None or report_id > member["latest"]["report_id"]):
+            member["latest"] = {"report_id": report_id, "created_at": created_at,
+                                "urgency": urgency, "status": status}
+
+    summary["members"] = [members[owner] for owner in sorted(members)]
+    summary["backlog"] = {
+        "processing": summary["by_status"].get("processing", 0),
+        "failed": summary["by_status"].get("failed", 0),
+    }
+    return summary
+
+
 def check_db_health():
     """
     Check database health status.
@@ -157,12 +881,13 @@ def insert_report(owner: str, visibility: str, report_text: str,
         owner,
         visibility,
         report_text,
-        json.dumps(extracted, ensure_ascii=False) if extracted else None,
+        encode_extracted(extracted),
         patient_view,
         family_view,
         urgency,
         datetime.utcnow().isoformat()
     ))
+    reindex_report(cur, cur.lastrowid)
     conn.commit()
     conn.close()
 
@@ -187,22 +912,229 @@ def list_reports_for_user(viewer: str):
                 visible.append((rid, owner, vis, urg, ts))
     return visible
 
-def get_report(report_id: int):
+def get_report(report_id: int, include_extracted: bool = True):
     conn = sqlite3.connect(DB_PATH)
     cur = conn.cursor()
-    cur.execute("""
-    SELECT id, owner, visibility, report_text, extracted_json, patient_view, family_view, urgency, created_at
+    extracted_col = "extracted_json" if include_extracted else "NULL"
+    cur.execute(f"""
+    SELECT id, owner, visibility, report_text, {extracted_col}, patient_view, family_view, urgency, created_at,
+           status, version, updated_at
     FROM reports WHERE id=?
     """, (report_id,))
     row = cur.fetchone()
     conn.close()
     if not row:
         return None
-    rid, owner, vis, text, extracted_json, pview, fview, urg, ts = row
+    rid, owner, vis, text, extracted_json, pview, fview, urg, ts, status, version, updated = row
     return {
         "id": rid, "owner": owner, "visibility": vis,
         "report_text": text,
-        "extracted": json.loads(extracted_json) if extracted_json else None,
+        "extracted": decode_extracted(extracted_json),
         "patient_view": pview, "family_view": fview,
-        "urgency": urg, "created_at": ts
+        "urgency": urg, "created_at": ts, "status": status,
+        "version": version, "updated_at": updated or ts
     }
+
+
+def get_report_version(report_id: int):
+    """(version, last modified timestamp) of a report, or None if it does not exist"""
+    conn = sqlite3.connect(DB_PATH)
+    cur = conn.cursor()
+    cur.execute("SELECT version, COALESCE(updated_at, created_at) FROM reports WHERE id=?", (report_id,))
+    row = cur.fetchone()
+    conn.close()
+    return row
+
+
+# Reminders. status: "pending" (scheduled), "due" (fired by the scheduler),
+# "done" or "dismissed". due_date is an ISO timestamp (UTC) or date.
+REMINDER_COLUMNS = ("id", "owner", "title", "due_date", "status", "created_at",
+                    "report_id", "notes", "source", "fired_at")
+REMINDER_FIELDS = ("title", "due_date", "status", "notes")
+
+
+def _reminder_dict(row) -> Dict[str, Any]:
+    return dict(zip(REMINDER_COLUMNS, row))
+
+
+def insert_reminder(owner: str, title: str, due_date: Optional[str], report_id: Optional[int] = None,
+                    notes: Optional[str] = None, source: str = "manual", cur=None) -> Dict[str, Any]:
+    """
+    Create a pending reminder
+
+    Args:
+        cur: Cursor of an open transaction to join (committed by the caller)
+
+    Returns:
+        The stored reminder
+    """
+    conn = None
+    if cur is None:
+        conn = sqlite3.connect(DB_PATH)
+        cur = conn.cursor()
+    cur.execute("""
+    INSERT INTO reminders(owner, title, due_date, status, created_at, report_id, notes, source)
+    VALUES (?, ?, ?, 'pending', ?, ?, ?, ?)
+    """, (owner, title, due_date, datetime.utcnow().isoformat(), report_id, notes, source))
+    reminder_id = cur.lastrowid
+    cur.execute(f"SELECT {', '.join(REMINDER_COLUMNS)} FROM reminders WHERE id = ?", (reminder_id,))
+    reminder = _reminder_dict(cur.fetchone())
+    if conn is not None:
+        conn.commit()
+        conn.close()
+    return reminder
+
+
+def get_reminder(reminder_id: int) -> Optional[Dict[str, Any]]:
+    conn = sqlite3.connect(DB_PATH)
+    cur = conn.cursor()
+    cur.execute(f"SELECT {', '.join(REMINDER_COLUMNS)} FROM reminders WHERE id = ?", (reminder_id,))
+    row = cur.fetchone()
+    conn.close()
+    return _reminder_dict(row) if row else None
+
+
+def list_reminders(viewer: str, status: Optional[str] = None, report_id: Optional[int] = None,
+                   limit: int = 50, offset: int = 0) -> List[Dict[str, Any]]:
+    """A viewer's reminders (admin: everyone's), soonest due first, undated last"""
+    conditions, params = [], []
+    if viewer != "admin":
+        conditions.append("owner = ?")
+        params.append(viewer)
+    if status:
+        conditions.append("status = ?")
+        params.append(status)
+    if report_id is not None:
+        conditions.append("report_id = ?")
+        params.append(report_id)
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+    conn = sqlite3.connect(DB_PATH)
+    cur = conn.cursor()
+    cur.execute(f"""
+    SELECT {', '.join(REMINDER_COLUMNS)} FROM reminders {where}
+    ORDER BY due_date IS NULL, due_date, id
+    LIMIT ? OFFSET ?
+    """, params + [limit, offset])
+    rows = cur.fetchall()
+    conn.close()
+    return [_reminder_dict(row) for row in rows]
+
+
+def update_reminder(reminder_id: int, **fields) -> Optional[Dict[str, Any]]:
+    """
+    Update title, due_date, status and/or notes; setting a due_date or
+    status "pending" re-arms a fired reminder
+
+    Returns:
+        The updated reminder, or None if it does not exist
+    """
+    # title and status are NOT NULL: None means "leave unchanged" for them
+    fields = {k: v for k, v in fields.items()
+              if k in REMINDER_FIELDS and not (v is None and k in ("title", "status"))}
+    if "due_date" in fields and "status" not in fields:
+        fields["status"] = "pending"
+    conn = sqlite3.connect(DB_PATH)
+    try:
+        cur = conn.cursor()
+        if fields:
+            assignments = ", ".join(f"{name} = ?" for name in fields)
+            if fields.get("status") == "pending":
+                assignments += ", fired_at = NULL"
+            cur.execute(f"UPDATE reminders SET {assignments} WHERE id = ?", list(fields.values()) + [reminder_id])
+        cur.execute(f"SELECT {', '.join(REMINDER_COLUMNS)} FROM reminders WHERE id = ?", (reminder_id,))
+        row = cur.fetchone()
+        conn.commit()
+    finally:
+        conn.close()
+    return _reminder_dict(row) if row else None
+
+
+def delete_reminder(reminder_id: int) -> bool:
+    conn = sqlite3.connect(DB_PATH)
+    cur = conn.cursor()
+    cur.execute("DELETE FROM reminders WHERE id = ?", (reminder_id,))
+    deleted = cur.rowcount > 0
+    conn.commit()
+    conn.close()
+    return deleted
+
+
+def pending_reminder_dues() -> List[Tuple[int, str]]:
+    """(id, due_date) of every dated pending reminder (idx_reminders_pending)"""
+    conn = sqlite3.connect(DB_PATH)
+    cur = conn.cursor()
+    cur.execute("""
+    SELECT id, due_date FROM reminders
+    WHERE status = 'pending' AND due_date IS NOT NULL
+    ORDER BY due_date
+    """)
+    rows = cur.fetchall()
+    conn.close()
+    return rows
+
+
+def fire_reminders(reminder_ids: List[int]) -> List[Dict[str, Any]]:
+    """
+    Mark pending reminders as due
+
+    Returns:
+        The reminders that were still pending (and are now due)
+    """
+    if not reminder_ids:
+        return []
+    now = datetime.utcnow().isoformat()
+    placeholders = ", ".join("?" for _ in reminder_ids)
+    conn = sqlite3.connect(DB_PATH)
+    cur = conn.cursor()
+    cur.execute(f"""
+    SELECT {', '.join(REMINDER_COLUMNS)} FROM reminders WHERE id IN ({placeholders}) AND status = 'pending'
+    """, reminder_ids)
+    fired = [_reminder_dict(row) for row in cur.fetchall()]
+    cur.executemany("UPDATE reminders SET status = 'due', fired_at = ? WHERE id = ?",
+                    [(now, r["id"]) for r in fired])
+    conn.commit()
+    conn.close()
+    for reminder in fired:
+        reminder["status"], reminder["fired_at"] = "due", now
+    return fired
+
+
+def replace_report_followup(cur, report_id: int, owner: str, title: Optional[str],
+                            due_date: Optional[str]) -> Tuple[List[int], Optional[Dict[str, Any]]]:
+    """
+    Replace the pending recommendation reminder of a report (reprocessing
+    must not stack duplicates); user-created reminders are left alone
+
+    Args:
+        cur: Cursor of the report's write (committed by the caller)
+        title: Reminder title, or None to only drop the old one
+
+    Returns:
+        (ids of removed reminders, the new reminder or None)
+    """
+    cur.execute("""
+    SELECT id FROM reminders WHERE report_id = ? AND source = 'recommendation' AND status = 'pending'
+    """, (report_id,))
+    removed = [row[0] for row in cur.fetchall()]
+    cur.executemany("DELETE FROM reminders WHERE id = ?", [(rid,) for rid in removed])
+    reminder = None
+    if title:
+        reminder = insert_reminder(owner, title, due_date, report_id=report_id, source="recommendation", cur=cur)
+    return removed, reminder
+
+
+def detach_report_reminders(cur, report_id: int) -> List[int]:
+    """
+    Reminders of a report being deleted: its pending recommendation
+    reminders are dropped, any others stay but lose the link
+
+    Args:
+        cur: Cursor of the delete (committed by the caller)
+
+    Returns:
+        Ids of the dropped reminders (to unschedule)
+    """
+    removed, _ = replace_report_followup(cur, report_id, "", None, None)
+    cur.execute("UPDATE reminders SET report_id = NULL WHERE report_id = ?", (report_id,))
+    return removed
@@ -1,5 +1,7 @@
 import html
-from typing import List, Tuple
+from collections import OrderedDict, deque
+from hashlib import sha1
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 def find_spans(text: str, needle: str) -> List[Tuple[int, int]]:
     """Find all occurrences of needle in text (exact substring match)."""
@@ -46,3 +48,211 @@ def render_highlight(text: str, spans: List[Tuple[int, int]]) -> str:
     out.append(html.escape(text[last:]))
     # Use <pre> for preserving formatting
     return "<pre style='white-space: pre-wrap; word-wrap: break-word;'>" + "".join(out) + "</pre>"
+
+
+def render_snippet(snippet: str, start: str, end: str) -> str:
+    """
+    Render a search snippet whose matches are delimited by start/end
+    markers: escapes HTML, then turns the markers into <mark>.
+    """
+    return html.escape(snippet).replace(start, "<mark>").replace(end, "</mark>")
+
+
+class EvidenceMatcher:
+    """
+    Aho-Corasick multi-pattern matcher.
+
+    Finds every occurrence of every needle in a single pass over the text,
+    instead of one text.find loop per needle.
+    """
+
+    def __init__(self, needles: Iterable[str]):
+        self.needles = sorted({n for n in needles if n})
+        # Trie as parallel arrays: goto transitions, failure links, the
+        # length of the longest needle ending at each node (0 = none), the
+        # needle ending exactly at a node, and the next such node on the
+        # failure chain (dictionary suffix link)
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[int] = [0]
+        self._term: List[int] = [0]
+        self._dict: List[int] = [0]
+        for needle in self.needles:
+            self._add(needle)
+        self._build()
+
+    def _add(self, needle: str):
+        node = 0
+        for ch in needle:
+            nxt = self._goto[node].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(0)
+                self._term.append(0)
+                self._dict.append(0)
+            node = nxt
+        self._out[node] = len(needle)
+        self._term[node] = len(needle)
+
+    def _build(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, nxt in self._goto[node].items():
+                queue.append(nxt)
+                f = self._fail[node]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                target = self._goto[f].get(ch, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                # Longest match ending here is this node's own, else its suffix's
+                self._out[nxt] = max(self._out[nxt], self._out[self._fail[nxt]])
+                suffix = self._fail[nxt]
+                self._dict[nxt] = suffix if self._term[suffix] else self._dict[suffix]
+
+    def iter_matches(self, text: str):
+        """Yield (start, end) of the longest needle ending at each position, in end order"""
+        if not self.needles:
+            return
+        goto, fail, out = self._goto, self._fail, self._out
+        node = 0
+        for i, ch in enumerate(text):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            if out[node]:
+                yield i + 1 - out[node], i + 1
+
+    def first_occurrences(self, text: str) -> Dict[str, Tuple[int, int]]:
+        """
+        Return the first (start, end) of every needle found in text.
+
+        Needles that do not occur are absent from the result. The scan stops
+        as soon as every needle has been seen.
+        """
+        found: Dict[str, Tuple[int, int]] = {}
+        if not self.needles:
+            return found
+        goto, fail, term, dlink = self._goto, self._fail, self._term, self._dict
+        remaining = len(self.needles)
+        node = 0
+        for i, ch in enumerate(text):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            hit = node if term[node] else dlink[node]
+            while hit:
+                start = i + 1 - term[hit]
+                needle = text[start:i + 1]
+                if needle not in found:
+                    found[needle] = (start, i + 1)
+                    remaining -= 1
+                hit = dlink[hit]
+            if not remaining:
+                break
+        return found
+
+    def find_merged(self, text: str) -> List[Tuple[int, int]]:
+        """
+        Return merged, start-sorted spans of all needle occurrences.
+
+        Matches arrive in end order, so overlapping spans can be folded on a
+        stack without the sort that merge_spans does.
+        """
+        merged: List[Tuple[int, int]] = []
+        for s, e in self.iter_matches(text):
+            while merged and s <= merged[-1][1]:
+                s = min(s, merged.pop()[0])
+            merged.append((s, e))
+        return merged
+
+
+def evidence_needles(extracted: Optional[Dict[str, Any]]) -> List[str]:
+    """Collect evidence strings from extracted entities and critical flags."""
+    if not extracted:
+        return []
+    needles = []
+    for key in ("entities", "critical_flags"):
+        for item in extracted.get(key) or []:
+            ev = item.get("evidence") if isinstance(item, dict) else None
+            if ev:
+                needles.append(ev)
+    return needles
+
+
+def stored_evidence_spans(text: str, extracted: Optional[Dict[str, Any]]) -> Optional[List[Tuple[int, int]]]:
+    """
+    Merged spans from offsets precomputed at extraction time ("evidence_span").
+
+    Returns None when any evidence lacks a usable offset (e.g. rows extracted
+    before offsets were stored), so callers can fall back to matching.
+    """
+    if not extracted:
+        return []
+    spans = []
+    for key in ("entities", "critical_flags"):
+        for item in extracted.get(key) or []:
+            if not isinstance(item, dict) or not item.get("evidence"):
+                continue
+            span = item.get("evidence_span")
+            if not span or len(span) != 2:
+                return None
+            s, e = span
+            if text[s:e] != item["evidence"]:
+                return None
+            spans.append((s, e))
+    return merge_spans(spans)
+
+
+def evidence_spans(text: str, extracted: Optional[Dict[str, Any]]) -> List[Tuple[int, int]]:
+    """
+    Find the evidence of an extraction in one pass, merged for render_highlight.
+
+    Same rule as the offsets stored at extraction time: the first occurrence
+    of each evidence string, so a report renders the same either way.
+    """
+    return merge_spans(list(EvidenceMatcher(evidence_needles(extracted)).first_occurrences(text).values()))
+
+
+_SPAN_CACHE_SIZE = 256
+_span_cache: "OrderedDict[int, Tuple[str, List[Tuple[int, int]]]]" = OrderedDict()
+
+
+def cached_evidence_spans(report_id: int, text: str,
+                          extracted: Optional[Dict[str, Any]]) -> List[Tuple[int, int]]:
+    """
+    Per-report cached evidence_spans.
+
+    The cache entry is keyed by report id and checked against a fingerprint
+    of the text and needles, so reprocessed reports are never served stale.
+    """
+    stored = stored_evidence_spans(text, extracted)
+    if stored is not None:
+        return stored
+
+    needles = evidence_needles(extracted)
+    digest = sha1()
+    digest.update(text.encode("utf-8"))
+    for n in needles:
+        digest.update(b"\0" + n.encode("utf-8"))
+    fingerprint = digest.hexdigest()
+
+    hit = _span_cache.get(report_id)
+    if hit and hit[0] == fingerprint:
+        _span_cache.move_to_end(report_id)
+        return hit[1]
+
+    spans = merge_spans(list(EvidenceMatcher(needles).first_occurrences(text).values()))
+    _span_cache[report_id] = (fingerprint, spans)
+    _span_cache.move_to_end(report_id)
+    while len(_span_cache) > _SPAN_CACHE_SIZE:
+        _span_cache.popitem(last=False)
+    return spans
+
+
+def invalidate_evidence_spans(report_id: int):
+    """Drop the cached spans of a report (after update or delete)."""
+    _span_cache.pop(report_id, None)
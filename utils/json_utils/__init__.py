@@ -1,3 +1,3 @@
-from .json_utils import extract_json_block, loads_json
+from .json_utils import extract_json_block, extract_json_prefix, loads_json, repair_json
 
-__all__ = ["extract_json_block", "loads_json"]
+__all__ = ["extract_json_block", "extract_json_prefix", "loads_json", "repair_json"]
@@ -1,6 +1,6 @@
 import json
 import re
-from typing import Any, Optional
+from typing import Any, List, Optional, Tuple
 
 def extract_json_block(text: str) -> Optional[str]:
     """
@@ -21,3 +21,98 @@ def extract_json_block(text: str) -> Optional[str]:
 
 def loads_json(text: str) -> Any:
     return json.loads(text)
+
+def extract_json_prefix(text: str) -> Optional[str]:
+    """
+    Return everything from the first '{' on, for outputs that were cut off
+    before the closing brace (extract_json_block finds nothing there).
+    """
+    start = text.find("{")
+    if start == -1:
+        return None
+    return text[start:]
+
+def _close(out: List[str], stack: List[str], in_string: bool) -> str:
+    tail = '"' if in_string else ""
+    body = "".join(out) + tail
+    body = re.sub(r"[\s,:]+$", "", body)
+    return body + "".join(reversed(stack))
+
+def repair_json(text: str) -> str:
+    """
+    Cheap deterministic fixes for common LLM JSON damage:
+    trailing commas, unterminated strings and unbalanced braces/brackets
+    (e.g. generation stopped mid-object).
+
+    If closing the document as-is does not parse, it is cut back to the last
+    complete element and closed there. Returns the best candidate; callers
+    still parse (and validate) it.
+    """
+    out: List[str] = []
+    stack: List[str] = []
+    # (output length, stack) at the last point where the document could end cleanly
+    safe_points: List[Tuple[int, Tuple[str, ...]]] = []
+    in_string = False
+    escape = False
+
+    for ch in text:
+        if in_string:
+            out.append(ch)
+            if escape:
+                escape = False
+            elif ch == "\\":
+                escape = True
+            elif ch == '"':
+                in_string = False
+            continue
+
+        if ch == '"':
+            in_string = True
+        elif ch in "{[":
+            stack.append("}" if ch == "{" else "]")
+            out.append(ch)
+            safe_points.append((len(out), tuple(stack)))
+            continue
+        elif ch in "}]":
+            # drop trailing comma before a closer
+            while out and out[-1].isspace():
+                out.pop()
+            if out and out[-1] == ",":
+                out.pop()
+            if stack and stack[-1] == ch:
+                stack.pop()
+            elif ch in stack:
+                # close the inner containers the model forgot
+                while stack and stack[-1] != ch:
+                    out.append(stack.pop())
+                stack.pop()
+            else:
+                # stray closer
+                continue
+            out.append(ch)
+            if not stack:
+                break
+            safe_points.append((len(out), tuple(stack)))
+            continue
+        elif ch == ",":
+            safe_points.append((len(out), tuple(stack)))
+        out.append(ch)
+
+    if not stack and not in_string:
+        return "".join(out)
+
+    candidate = _close(out, stack, in_string)
+    try:
+        json.loads(candidate)
+        return candidate
+    except json.JSONDecodeError:
+        pass
+
+    for length, safe_stack in reversed(safe_points[-8:]):
+        candidate = _close(out[:length], list(safe_stack), False)
+        try:
+            json.loads(candidate)
+            return candidate
+        except json.JSONDecodeError:
+            continue
+    return candidate